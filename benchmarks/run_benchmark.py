@@ -0,0 +1,299 @@
+"""End-to-end crawl benchmark against local synthetic sites.
+
+Runs the simple crawler and/or the Scrapy spider against each
+generated site and records pages/sec, p50/p99 page latency, peak RSS
+(of the crawler process and of its largest child: PDF and extraction
+workers, the browser) and output bytes. Each crawl runs in its own subprocess so RSS and
+imports do not leak between runs. Results are written as JSON to
+compare runs over time.
+
+    python benchmarks/run_benchmark.py --sites doxygen sphinx --sizes 1000 10000
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic_site import SITE_KINDS, SyntheticSite, start_server
+
+CRAWLERS = ('simple', 'scrapy')
+RESULT_PREFIX = 'BENCH_RESULT '
+
+
+def peak_rss_mb(children: bool = False) -> float | None:
+    """Peak resident set size in MB of this process, or with `children`
+    of the largest child process already waited for (None if unknown).
+    """
+    try:
+        import resource
+    except ImportError:
+        if children:
+            return None
+        try:
+            import psutil
+            return psutil.Process().memory_info().peak_wset / (1024 * 1024)
+        except (ImportError, AttributeError):
+            return None
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def percentile(values: list[float], pct: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    k = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[k]
+
+
+def dir_bytes(path: Path, pattern: str = '*') -> int:
+    return sum(f.stat().st_size for f in path.rglob(pattern) if f.is_file())
+
+
+# --- Drivers (run inside the benchmark subprocess) ------------------------
+
+def drive_simple(url: str, out_dir: str, max_pages: int, concurrency: int, depth: int) -> dict:
+    sys.path.insert(0, str(ROOT / "simple_crawler"))
+    from crawler import DoxygenCrawler
+
+    latencies = []
+
+    class TimedCrawler(DoxygenCrawler):
+        def _crawl_page(self, url, collect_links=False):
+            if url in self._page_cache:
+                return super()._crawl_page(url, collect_links)
+            start = time.perf_counter()
+            try:
+                return super()._crawl_page(url, collect_links)
+            finally:
+                latencies.append(time.perf_counter() - start)
+
+    crawler = TimedCrawler(
+        url, max_pages, 0, out_dir,
+        log_func=lambda msg: None,
+        concurrency=concurrency, max_depth=depth,
+        stream_output=True,
+    )
+    start = time.perf_counter()
+    pages = crawler.crawl()
+    crawler.save_json()
+    crawler.save_txt()
+    elapsed = time.perf_counter() - start
+
+    return {
+        'pages': sum(1 for page in pages if page['status'] == 'success'),
+        'elapsed': elapsed,
+        'latencies': latencies,
+    }
+
+
+def drive_scrapy(url: str, out_dir: str, max_pages: int, concurrency: int, depth: int, render: bool) -> dict:
+    from urllib.parse import urlparse
+
+    scrapy_dir = ROOT / "scrapy_crawler"
+    sys.path.insert(0, str(scrapy_dir))
+    os.chdir(scrapy_dir)
+    os.environ.setdefault('SCRAPY_SETTINGS_MODULE', 'site_crawler.settings')
+
+    from scrapy import signals
+    from scrapy.crawler import CrawlerProcess
+    from scrapy.utils.project import get_project_settings
+
+    settings = get_project_settings()
+    settings.setdict({
+        'LOG_LEVEL': 'WARNING',
+        'CONCURRENT_REQUESTS': concurrency,
+        'CONCURRENT_REQUESTS_PER_DOMAIN': concurrency,
+        # Local fixture: no politeness delay and no wall-clock cutoff
+        'DOWNLOAD_DELAY': 0,
+        'CLOSESPIDER_TIMEOUT': 0,
+        'TELNETCONSOLE_ENABLED': False,
+    }, priority='cmdline')
+
+    latencies = []
+
+    def on_response(response, request, spider):
+        latency = request.meta.get('download_latency')
+        if latency is not None:
+            latencies.append(latency)
+
+    process = CrawlerProcess(settings)
+    crawler = process.create_crawler('site')
+    crawler.signals.connect(on_response, signal=signals.response_received)
+
+    start = time.perf_counter()
+    process.crawl(
+        crawler,
+        seed=url,
+        allowed_domains=urlparse(url).hostname,
+        out_dir=out_dir,
+        max_pages=max_pages,
+        max_depth=depth,
+        render=int(render),
+    )
+    process.start()
+    elapsed = time.perf_counter() - start
+
+    return {
+        'pages': crawler.stats.get_value('item_scraped_count', 0),
+        'elapsed': elapsed,
+        'latencies': latencies,
+    }
+
+
+def run_driver(args) -> None:
+    if args.driver == 'simple':
+        result = drive_simple(args.url, args.out, args.max_pages, args.concurrency, args.depth)
+    else:
+        result = drive_scrapy(args.url, args.out, args.max_pages, args.concurrency, args.depth, args.render)
+    # Worker pools and the browser are shut down and reaped by now
+    result['peak_rss_mb'] = peak_rss_mb()
+    result['peak_child_rss_mb'] = peak_rss_mb(children=True)
+    print(RESULT_PREFIX + json.dumps(result), flush=True)
+
+
+# --- Runner ---------------------------------------------------------------
+
+def run_one(crawler: str, kind: str, size: int, args) -> dict:
+    site = SyntheticSite(kind, size)
+    server, url = start_server(site)
+    out_dir = Path(tempfile.mkdtemp(prefix=f"bench_{crawler}_{kind}_"))
+
+    cmd = [
+        sys.executable, str(Path(__file__).resolve()),
+        '--driver', crawler,
+        '--url', url,
+        '--out', str(out_dir),
+        '--max-pages', str(size),
+        '--concurrency', str(args.concurrency),
+        '--depth', str(args.depth),
+    ]
+    if args.render:
+        cmd.append('--render')
+
+    record = {'crawler': crawler, 'site': kind, 'size': size}
+    try:
+        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=args.timeout)
+        lines = [line for line in proc.stdout.splitlines() if line.startswith(RESULT_PREFIX)]
+        if proc.returncode != 0 or not lines:
+            tail = (proc.stderr or proc.stdout).strip().splitlines()[-5:]
+            record['error'] = '\n'.join(tail) or f"exit code {proc.returncode}"
+            return record
+
+        result = json.loads(lines[-1][len(RESULT_PREFIX):])
+        latencies = result.pop('latencies')
+        record.update({
+            'pages': result['pages'],
+            'elapsed_sec': round(result['elapsed'], 3),
+            'pages_per_sec': round(result['pages'] / result['elapsed'], 2) if result['elapsed'] else None,
+            'latency_p50_ms': _ms(percentile(latencies, 50)),
+            'latency_p99_ms': _ms(percentile(latencies, 99)),
+            'peak_rss_mb': round(result['peak_rss_mb'], 1) if result['peak_rss_mb'] else None,
+            'peak_child_rss_mb': round(result['peak_child_rss_mb'], 1) if result['peak_child_rss_mb'] else None,
+            'output_bytes': dir_bytes(out_dir),
+            'jsonl_bytes': dir_bytes(out_dir, '*.jsonl'),
+        })
+    except subprocess.TimeoutExpired:
+        record['error'] = f"timeout after {args.timeout}s"
+    finally:
+        server.shutdown()
+        server.server_close()
+        if not args.keep_output:
+            shutil.rmtree(out_dir, ignore_errors=True)
+        else:
+            record['output_dir'] = str(out_dir)
+    return record
+
+
+def _ms(seconds: float | None) -> float | None:
+    return round(seconds * 1000, 2) if seconds is not None else None
+
+
+def _git_commit() -> str | None:
+    try:
+        proc = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True)
+        return proc.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def print_table(runs: list[dict]) -> None:
+    header = f"{'crawler':<8} {'site':<8} {'size':>6} {'pages':>6} {'p/s':>8} {'p50ms':>8} {'p99ms':>8} {'RSS MB':>8} {'child MB':>8} {'out KB':>9}"
+    print(header)
+    print('-' * len(header))
+    for run in runs:
+        if 'error' in run:
+            print(f"{run['crawler']:<8} {run['site']:<8} {run['size']:>6}  오류: {run['error'].splitlines()[-1]}")
+            continue
+        print(f"{run['crawler']:<8} {run['site']:<8} {run['size']:>6} {run['pages']:>6} "
+              f"{run['pages_per_sec'] or 0:>8.1f} {run['latency_p50_ms'] or 0:>8.1f} "
+              f"{run['latency_p99_ms'] or 0:>8.1f} {run['peak_rss_mb'] or 0:>8.1f} "
+              f"{run['peak_child_rss_mb'] or 0:>8.1f} {run['output_bytes'] / 1024:>9.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="크롤러 벤치마크 (로컬 합성 사이트)")
+    parser.add_argument('--crawlers', nargs='+', choices=CRAWLERS, default=list(CRAWLERS))
+    parser.add_argument('--sites', nargs='+', choices=SITE_KINDS, default=list(SITE_KINDS))
+    parser.add_argument('--sizes', nargs='+', type=int, default=[1000],
+                        help="사이트 페이지 수 (예: 1000 10000 50000)")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--depth', type=int, default=5)
+    parser.add_argument('--render', action='store_true', help="Scrapy에서 Playwright 렌더링 사용")
+    parser.add_argument('--timeout', type=int, default=3600, help="실행당 제한 시간 (초)")
+    parser.add_argument('--results-dir', default=str(ROOT / "benchmarks" / "results"))
+    parser.add_argument('--keep-output', action='store_true', help="크롤링 출력 폴더 유지")
+
+    # Internal: run a single crawl in this process
+    parser.add_argument('--driver', choices=CRAWLERS, help=argparse.SUPPRESS)
+    parser.add_argument('--url', help=argparse.SUPPRESS)
+    parser.add_argument('--out', help=argparse.SUPPRESS)
+    parser.add_argument('--max-pages', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.driver:
+        run_driver(args)
+        return
+
+    runs = []
+    for size in args.sizes:
+        for kind in args.sites:
+            for crawler in args.crawlers:
+                print(f"▶ {crawler} / {kind} / {size}페이지 ...", flush=True)
+                runs.append(run_one(crawler, kind, size, args))
+
+    report = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'settings': {'concurrency': args.concurrency, 'depth': args.depth, 'render': args.render},
+        'runs': runs,
+    }
+
+    results_dir = Path(args.results_dir)
+    results_dir.mkdir(parents=True, exist_ok=True)
+    path = results_dir / f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+
+    print()
+    print_table(runs)
+    print(f"\n결과 저장: {path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,348 @@
+"""Synthetic documentation sites served from a local HTTP server.
+
+Pages are generated on request from their path, so a 50k-page site
+costs no disk space and every run sees the same content.
+
+Site kinds (each mounted under its own prefix):
+  /doxygen/  index, large annotated/classes/files indexes, class and
+             member-list pages, file pages, PDF manuals
+  /sphinx/   toctree chapters, pages with a sidebar, large genindex
+  /spa/      Next.js-style pages (server-rendered markup inside
+             <div id="__next"> plus a __NEXT_DATA__ script)
+"""
+
+import io
+import json
+import math
+import random
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SITE_KINDS = ('doxygen', 'sphinx', 'spa')
+
+WORDS = (
+    "buffer stream context handle device memory queue event surface image "
+    "sensor camera frame packet socket thread mutex timer callback config "
+    "driver module interface layer register channel pipeline allocate release "
+    "initialize query update create destroy validate transfer submit wait "
+    "signal status error result value parameter attribute property format "
+    "width height offset length count index pointer struct enum typedef"
+).split()
+
+# Every Nth doxygen class page links a PDF manual
+PDF_EVERY = 200
+
+
+def _rng(path: str) -> random.Random:
+    return random.Random(zlib.crc32(path.encode('utf-8')))
+
+
+def _sentence(rng: random.Random, n: int) -> str:
+    return ' '.join(rng.choice(WORDS) for _ in range(n)).capitalize() + '.'
+
+
+def _paragraphs(rng: random.Random, count: int) -> str:
+    return ''.join(f"<p>{_sentence(rng, rng.randint(12, 30))}</p>\n" for _ in range(count))
+
+
+def _page(title: str, body: str, head: str = '') -> bytes:
+    return (f"<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>{title}</title>{head}</head>\n"
+            f"<body>\n{body}\n</body></html>\n").encode('utf-8')
+
+
+def make_pdf(pages: list[str]) -> bytes:
+    """Build a minimal PDF with one line of text per page."""
+    objs = [b"<< /Type /Catalog /Pages 2 0 R >>"]
+    kids = ' '.join(f"{4 + 2 * i} 0 R" for i in range(len(pages)))
+    objs.append(f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>".encode())
+    objs.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    for i, text in enumerate(pages):
+        objs.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                    f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>".encode())
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+        objs.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for num, obj in enumerate(objs, 1):
+        offsets.append(out.tell())
+        out.write(f"{num} 0 obj\n".encode() + obj + b"\nendobj\n")
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objs) + 1}\n0000000000 65535 f \n".encode())
+    for offset in offsets:
+        out.write(f"{offset:010d} 00000 n \n".encode())
+    out.write(f"trailer\n<< /Size {len(objs) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF".encode())
+    return out.getvalue()
+
+
+class SyntheticSite:
+    """Generates the pages of one site kind with about `pages` URLs."""
+
+    def __init__(self, kind: str, pages: int):
+        if kind not in SITE_KINDS:
+            raise ValueError(f"kind must be one of {SITE_KINDS}")
+        self.kind = kind
+        self.pages = pages
+
+        if kind == 'doxygen':
+            # class + members page per class, one file page per 10 classes
+            self.classes = max(1, int((pages - 5) / 2.1))
+            self.files = self.classes // 10 + 1
+            self.pdfs = max(1, self.classes // PDF_EVERY)
+        elif kind == 'sphinx':
+            self.chapters = max(1, int(math.sqrt(pages)))
+            self.per_chapter = max(1, (pages - 3) // self.chapters - 1)
+        else:
+            self.routes = max(1, pages - 1)
+
+        self._pdf_cache = {}
+
+    @property
+    def start_url_path(self) -> str:
+        return f"/{self.kind}/index.html"
+
+    def render(self, path: str) -> tuple[int, str, bytes]:
+        """Return (status, content type, body) for a request path."""
+        prefix = f"/{self.kind}/"
+        if not path.startswith(prefix):
+            return 404, 'text/plain', b'not found'
+        name = path[len(prefix):] or 'index.html'
+
+        handler = getattr(self, f"_{self.kind}")
+        result = handler(name)
+        if result is None:
+            return 404, 'text/plain', b'not found'
+        if isinstance(result, tuple):
+            return 200, result[0], result[1]
+        return 200, 'text/html; charset=utf-8', result
+
+    # --- Doxygen -------------------------------------------------------
+
+    def _doxygen_nav(self) -> str:
+        return ('<div id="top"><div id="titlearea">Synthetic SDK API Reference</div>'
+                '<div id="navrow1"><ul><li><a href="index.html">Main Page</a></li>'
+                '<li><a href="modules.html">Modules</a></li><li><a href="annotated.html">Data Structures</a></li>'
+                '<li><a href="files.html">Files</a></li><li><a href="pages.html">Related Pages</a></li></ul></div></div>')
+
+    def _doxygen_index_page(self, title: str, rows: str) -> bytes:
+        body = (f"{self._doxygen_nav()}<div class=\"header\"><div class=\"headertitle\"><div class=\"title\">{title}"
+                f"</div></div></div><div class=\"contents\"><table class=\"directory\">{rows}</table></div>")
+        return _page(title, body)
+
+    def _doxygen(self, name: str):
+        rng = _rng(name)
+
+        if name == 'index.html':
+            body = (f"{self._doxygen_nav()}<div class=\"contents\"><h1>Synthetic SDK</h1>"
+                    f"{_paragraphs(rng, 4)}<ul><li><a href=\"annotated.html\">Class list</a></li>"
+                    f"<li><a href=\"files.html\">File list</a></li></ul></div>")
+            return _page('Synthetic SDK: Main Page', body)
+
+        if name in ('annotated.html', 'classes.html'):
+            rows = ''.join(f"<tr><td class=\"entry\"><a class=\"el\" href=\"class_{i}.html\">Class{i}</a></td>"
+                           f"<td class=\"desc\">{_sentence(_rng(str(i)), 8)}</td></tr>\n"
+                           for i in range(self.classes))
+            return self._doxygen_index_page('Data Structures', rows)
+
+        if name == 'files.html':
+            rows = ''.join(f"<tr><td class=\"entry\"><a class=\"el\" href=\"file_{j}.html\">file_{j}.h</a></td></tr>\n"
+                           for j in range(self.files))
+            return self._doxygen_index_page('File List', rows)
+
+        if name == 'modules.html':
+            return self._doxygen_index_page('Modules', '')
+
+        if name == 'pages.html':
+            rows = ''.join(f"<tr><td class=\"entry\"><a href=\"manual_{k}.pdf\">Manual {k}</a></td></tr>\n"
+                           for k in range(self.pdfs))
+            return self._doxygen_index_page('Related Pages', rows)
+
+        stem, _, ext = name.partition('.')
+        if ext == 'pdf' and stem.startswith('manual_'):
+            k = stem[len('manual_'):]
+            if not k.isdigit() or int(k) >= self.pdfs:
+                return None
+            if k not in self._pdf_cache:
+                self._pdf_cache[k] = make_pdf([_sentence(_rng(f"{name}{p}"), 10) for p in range(20)])
+            return 'application/pdf', self._pdf_cache[k]
+
+        if ext != 'html':
+            return None
+
+        if stem.startswith('class_'):
+            key, members = stem[len('class_'):], False
+            if key.endswith('-members'):
+                key, members = key[:-len('-members')], True
+            if not key.isdigit() or int(key) >= self.classes:
+                return None
+            i = int(key)
+            if members:
+                rows = ''.join(f"<tr><td class=\"entry\"><a class=\"el\" href=\"class_{i}.html#m{m}\">"
+                               f"member{m}</a></td><td class=\"entry\">Class{i}</td></tr>\n" for m in range(40))
+                body = (f"{self._doxygen_nav()}<div class=\"contents\"><h1>Class{i} Member List</h1>"
+                        f"<p>This is the complete list of members for Class{i}.</p><table>{rows}</table></div>")
+                return _page("Synthetic SDK: Member List", body)
+
+            related = ''.join(f"<li><a class=\"el\" href=\"class_{rng.randrange(self.classes)}.html\">related</a></li>"
+                              for _ in range(5))
+            pdf = (f"<p><a href=\"manual_{i // PDF_EVERY}.pdf\">Manual</a></p>"
+                   if i % PDF_EVERY == 0 and i // PDF_EVERY < self.pdfs else '')
+            code = ''.join(f"<div class=\"fragment\"><pre>int class{i}_fn{c}(void *ctx, int flags);</pre></div>"
+                           for c in range(3))
+            body = (f"{self._doxygen_nav()}<div class=\"header\"><div class=\"title\">Class{i} Struct Reference</div></div>"
+                    f"<div class=\"contents\"><h2>Detailed Description</h2>{_paragraphs(rng, 6)}"
+                    f"<h2>Member Functions</h2>{code}<h3>Parameters</h3>{_paragraphs(rng, 2)}"
+                    f"<p><a href=\"class_{i}-members.html\">List of all members</a> | "
+                    f"<a href=\"file_{i // 10}.html\">file_{i // 10}.h</a></p><ul>{related}</ul>{pdf}</div>")
+            return _page(f"Synthetic SDK: Class{i} Struct Reference", body)
+
+        if stem.startswith('file_'):
+            key = stem[len('file_'):]
+            if not key.isdigit() or int(key) >= self.files:
+                return None
+            j = int(key)
+            links = ''.join(f"<li><a class=\"el\" href=\"class_{i}.html\">Class{i}</a></li>"
+                            for i in range(j * 10, min(self.classes, j * 10 + 10)))
+            body = (f"{self._doxygen_nav()}<div class=\"contents\"><h1>file_{j}.h File Reference</h1>"
+                    f"{_paragraphs(rng, 2)}<ul>{links}</ul></div>")
+            return _page(f"Synthetic SDK: file_{j}.h File Reference", body)
+
+        return None
+
+    # --- Sphinx --------------------------------------------------------
+
+    def _sphinx_sidebar(self, depth: int) -> str:
+        up = '../' * depth
+        items = ''.join(f"<li class=\"toctree-l1\"><a class=\"reference internal\" href=\"{up}chapter_{c}/index.html\">"
+                        f"Chapter {c}</a></li>" for c in range(min(self.chapters, 30)))
+        return (f"<div class=\"sphinxsidebar\" role=\"navigation\"><h3><a href=\"{up}index.html\">Table of Contents</a></h3>"
+                f"<ul>{items}</ul><a href=\"{up}genindex.html\">Index</a></div>")
+
+    def _sphinx_page(self, title: str, content: str, depth: int) -> bytes:
+        body = (f"<div class=\"document\"><div class=\"body\" role=\"main\"><section>{content}</section></div></div>"
+                f"{self._sphinx_sidebar(depth)}<footer>Built with Sphinx</footer>")
+        return _page(f"{title} — Synthetic Docs", body)
+
+    def _sphinx(self, name: str):
+        rng = _rng(name)
+
+        if name == 'index.html':
+            toc = ''.join(f"<li class=\"toctree-l1\"><a href=\"chapter_{c}/index.html\">Chapter {c}</a></li>"
+                          for c in range(self.chapters))
+            return self._sphinx_page('Welcome', f"<h1>Synthetic Docs</h1>{_paragraphs(rng, 3)}"
+                                                f"<div class=\"toctree-wrapper\"><ul>{toc}</ul></div>", 0)
+
+        if name == 'genindex.html':
+            entries = ''.join(f"<li><a href=\"chapter_{c}/page_{p}.html#term-{p}\">term {c}.{p}</a></li>\n"
+                              for c in range(self.chapters) for p in range(self.per_chapter))
+            return self._sphinx_page('Index', f"<h1>Index</h1><ul class=\"genindex\">{entries}</ul>", 0)
+
+        if name == 'search.html':
+            return self._sphinx_page('Search', '<h1>Search</h1><form></form>', 0)
+
+        chapter, _, page = name.partition('/')
+        if not chapter.startswith('chapter_') or not chapter[len('chapter_'):].isdigit():
+            return None
+        c = int(chapter[len('chapter_'):])
+        if c >= self.chapters:
+            return None
+
+        if page == 'index.html':
+            toc = ''.join(f"<li class=\"toctree-l2\"><a href=\"page_{p}.html\">Topic {c}.{p}</a></li>"
+                          for p in range(self.per_chapter))
+            return self._sphinx_page(f"Chapter {c}", f"<h1>Chapter {c}</h1>{_paragraphs(rng, 2)}<ul>{toc}</ul>", 1)
+
+        if page.startswith('page_') and page.endswith('.html'):
+            key = page[len('page_'):-len('.html')]
+            if not key.isdigit() or int(key) >= self.per_chapter:
+                return None
+            p = int(key)
+            nav = ''
+            if p > 0:
+                nav += f"<a href=\"page_{p - 1}.html\">Previous</a> "
+            if p + 1 < self.per_chapter:
+                nav += f"<a href=\"page_{p + 1}.html\">Next</a>"
+            content = (f"<h1>Topic {c}.{p}</h1>{_paragraphs(rng, 5)}<h2>Example</h2>"
+                       f"<div class=\"highlight\"><pre>run_topic({c}, {p})</pre></div>"
+                       f"<h2>Details</h2>{_paragraphs(rng, 3)}<div class=\"related\">{nav}</div>")
+            return self._sphinx_page(f"Topic {c}.{p}", content, 1)
+
+        return None
+
+    # --- SPA -----------------------------------------------------------
+
+    def _spa(self, name: str):
+        rng = _rng(name)
+
+        if name == 'index.html':
+            r, title = None, 'Home'
+        elif name.startswith('docs/') and name.endswith('.html') and name[5:-5].isdigit():
+            r = int(name[5:-5])
+            if r >= self.routes:
+                return None
+            title = f"Guide {r}"
+        else:
+            return None
+
+        # Home lists every route; guides link their neighbours
+        if r is None:
+            targets = range(self.routes)
+        else:
+            targets = [t % self.routes for t in (r + 1, r + 2, rng.randrange(self.routes))]
+        links = ''.join(f"<li><a href=\"/spa/docs/{t}.html\">Guide {t}</a></li>" for t in targets)
+
+        text = _paragraphs(rng, 5)
+        data = json.dumps({'props': {'pageProps': {'title': title, 'route': r}}, 'page': '/docs/[id]'})
+        body = (f"<div id=\"__next\"><nav><a href=\"/spa/index.html\">Home</a></nav>"
+                f"<main><article><h1>{title}</h1>{text}</article><aside><ul>{links}</ul></aside></main></div>"
+                f"<script id=\"__NEXT_DATA__\" type=\"application/json\">{data}</script>"
+                f"<script src=\"/spa/_next/static/chunks/main.js\" defer></script>")
+        return _page(title, body)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; without this, Nagle
+    # plus delayed ACK adds ~40ms to every keep-alive response.
+    disable_nagle_algorithm = True
+    site = None  # set per server subclass
+
+    def do_GET(self):
+        path = self.path.split('?', 1)[0].split('#', 1)[0]
+        status, content_type, body = self.site.render(path)
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(site: SyntheticSite, host: str = '127.0.0.1', port: int = 0) -> tuple[ThreadingHTTPServer, str]:
+    """Serve `site` in a daemon thread. Returns (server, start URL)."""
+    handler = type('SiteHandler', (_Handler,), {'site': site})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}{site.start_url_path}"
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="합성 문서 사이트 서버")
+    parser.add_argument('--kind', choices=SITE_KINDS, default='doxygen')
+    parser.add_argument('--pages', type=int, default=1000)
+    parser.add_argument('--port', type=int, default=8000)
+    args = parser.parse_args()
+
+    server, url = start_server(SyntheticSite(args.kind, args.pages), port=args.port)
+    print(f"서빙 중: {url} (Ctrl+C로 종료)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
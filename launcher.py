@@ -9,6 +9,8 @@ import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox, filedialog
 from pathlib import Path
 
+from simple_crawler.config.constants import DEFAULT_MAX_DEPTH
+
 
 class CrawlerLauncher:
     """GUI launcher for selecting and running crawlers."""
@@ -73,6 +75,10 @@ class CrawlerLauncher:
         ttk.Entry(common_frame, textvariable=self.output_dir_var, width=30).grid(row=0, column=3, sticky=(tk.W, tk.E), padx=5)
         ttk.Button(common_frame, text="찾아보기", command=self._browse_output_dir).grid(row=0, column=4, padx=5)
         
+        self.drop_duplicates_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(common_frame, text="근접 중복 페이지 제외 (멤버 목록·버전별 사본 등)",
+                       variable=self.drop_duplicates_var).grid(row=1, column=0, columnspan=4, sticky=tk.W, padx=5, pady=(5, 0))
+        
         self.simple_frame = ttk.LabelFrame(main_frame, text="간단 크롤러 설정", padding="10")
         self.simple_frame.grid(row=4, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=10)
         
@@ -80,6 +86,31 @@ class CrawlerLauncher:
         self.delay_var = tk.StringVar(value="1.0")
         ttk.Entry(self.simple_frame, textvariable=self.delay_var, width=10).grid(row=0, column=1, sticky=tk.W, padx=5)
         
+        ttk.Label(self.simple_frame, text="동시 요청 수:").grid(row=0, column=2, sticky=tk.W, padx=20)
+        self.concurrency_var = tk.StringVar(value="4")
+        ttk.Entry(self.simple_frame, textvariable=self.concurrency_var, width=10).grid(row=0, column=3, sticky=tk.W, padx=5)
+        
+        ttk.Label(self.simple_frame, text="최대 깊이:").grid(row=0, column=4, sticky=tk.W, padx=20)
+        self.simple_depth_var = tk.StringVar(value=str(DEFAULT_MAX_DEPTH))
+        ttk.Entry(self.simple_frame, textvariable=self.simple_depth_var, width=10).grid(row=0, column=5, sticky=tk.W, padx=5)
+        
+        ttk.Label(self.simple_frame, text="호스트별 초당 요청:").grid(row=3, column=0, sticky=tk.W, padx=5, pady=(5, 0))
+        self.rate_var = tk.StringVar(value="")
+        ttk.Entry(self.simple_frame, textvariable=self.rate_var, width=10).grid(row=3, column=1, sticky=tk.W, padx=5, pady=(5, 0))
+        ttk.Label(self.simple_frame, text="(비우면 1/요청 간격, 0이면 제한 없음 - 모든 워커 합산)",
+                  foreground="gray").grid(row=3, column=2, columnspan=4, sticky=tk.W, padx=5, pady=(5, 0))
+        
+        ttk.Label(self.simple_frame, text="포함 패턴:").grid(row=1, column=0, sticky=tk.W, padx=5, pady=(5, 0))
+        self.include_var = tk.StringVar()
+        ttk.Entry(self.simple_frame, textvariable=self.include_var, width=30).grid(row=1, column=1, columnspan=2, sticky=(tk.W, tk.E), padx=5, pady=(5, 0))
+        
+        ttk.Label(self.simple_frame, text="제외 패턴:").grid(row=1, column=3, sticky=tk.W, padx=20, pady=(5, 0))
+        self.exclude_var = tk.StringVar()
+        ttk.Entry(self.simple_frame, textvariable=self.exclude_var, width=30).grid(row=1, column=4, columnspan=2, sticky=(tk.W, tk.E), padx=5, pady=(5, 0))
+        
+        ttk.Label(self.simple_frame, text="(쉼표로 구분, glob 또는 're:정규식' 예: */v1.0/*, re:_source\\.html$)",
+                  foreground="gray").grid(row=2, column=0, columnspan=6, sticky=tk.W, padx=5)
+        
         self.advanced_frame = ttk.LabelFrame(main_frame, text="고급 크롤러 설정", padding="10")
         self.advanced_frame.grid(row=4, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=10)
         
@@ -97,10 +128,13 @@ class CrawlerLauncher:
         self.start_button = ttk.Button(button_frame, text="크롤링 시작", command=self._start_crawl)
         self.start_button.grid(row=0, column=0, padx=5)
         
+        self.resume_button = ttk.Button(button_frame, text="이어서 크롤링", command=lambda: self._start_crawl(resume=True))
+        self.resume_button.grid(row=0, column=1, padx=5)
+        
         self.stop_button = ttk.Button(button_frame, text="중지", command=self._stop_crawl, state=tk.DISABLED)
-        self.stop_button.grid(row=0, column=1, padx=5)
+        self.stop_button.grid(row=0, column=2, padx=5)
         
-        ttk.Button(button_frame, text="결과 폴더 열기", command=self._open_output_folder).grid(row=0, column=2, padx=5)
+        ttk.Button(button_frame, text="결과 폴더 열기", command=self._open_output_folder).grid(row=0, column=3, padx=5)
         
         ttk.Label(main_frame, text="진행 상황:").grid(row=6, column=0, sticky=tk.W, pady=5)
         self.progress_var = tk.StringVar(value="대기 중...")
@@ -127,11 +161,13 @@ class CrawlerLauncher:
         if crawler_type == "simple":
             self.simple_frame.grid()
             self.advanced_frame.grid_remove()
+            self.resume_button.grid()
             
             self.desc_label.config(text=" 간단 → NVIDIA, OpenCV, ROS 등 Doxygen/Sphinx 문서")
         else:
             self.simple_frame.grid_remove()
             self.advanced_frame.grid()
+            self.resume_button.grid_remove()
             
             self.desc_label.config(text="고급 → Vert.x, React Docs 등 SPA 사이트")
     
@@ -176,7 +212,7 @@ class CrawlerLauncher:
             except Exception as e:
                 return False, f"Scrapy 확인 중 오류: {str(e)}"
     
-    def _start_crawl(self):
+    def _start_crawl(self, resume=False):
         """Start crawling process."""
         url = self.url_var.get().strip()
         if not url:
@@ -198,6 +234,7 @@ class CrawlerLauncher:
         
         self.is_crawling = True
         self.start_button.config(state=tk.DISABLED)
+        self.resume_button.config(state=tk.DISABLED)
         self.stop_button.config(state=tk.NORMAL)
         self.progress_bar.start()
         self.log_text.delete(1.0, tk.END)
@@ -205,7 +242,7 @@ class CrawlerLauncher:
         if crawler_type == "simple":
             thread = threading.Thread(
                 target=self._run_simple_crawler,
-                args=(url, max_pages),
+                args=(url, max_pages, resume),
                 daemon=True
             )
             thread.start()
@@ -217,10 +254,16 @@ class CrawlerLauncher:
             )
             thread.start()
     
-    def _run_simple_crawler(self, url, max_pages):
+    def _run_simple_crawler(self, url, max_pages, resume=False):
         """Run simple crawler."""
         try:
             delay = float(self.delay_var.get())
+            concurrency = int(self.concurrency_var.get())
+            rate = float(self.rate_var.get()) if self.rate_var.get().strip() else None
+            depth = int(self.simple_depth_var.get())
+            include = [p.strip() for p in self.include_var.get().split(',') if p.strip()]
+            exclude = [p.strip() for p in self.exclude_var.get().split(',') if p.strip()]
+            duplicates = "drop" if self.drop_duplicates_var.get() else "keep"
             output_dir = self.output_dir_var.get()
             
             self._log("="*60)
@@ -228,6 +271,18 @@ class CrawlerLauncher:
             self._log("="*60)
             self._log(f"URL: {url}")
             self._log(f"최대 페이지: {max_pages}")
+            self._log(f"동시 요청: {concurrency}")
+            if rate:
+                self._log(f"호스트별 초당 요청: {rate}")
+            self._log(f"깊이: {depth}")
+            if include:
+                self._log(f"포함 패턴: {', '.join(include)}")
+            if exclude:
+                self._log(f"제외 패턴: {', '.join(exclude)}")
+            if duplicates == "drop":
+                self._log("근접 중복 페이지 제외")
+            if resume:
+                self._log("체크포인트에서 이어서 크롤링")
             self._log(f"출력: {output_dir}")
             self._log("")
             
@@ -236,7 +291,11 @@ class CrawlerLauncher:
             
             crawler = DoxygenCrawler(
                 url, max_pages, delay, output_dir,
-                self._log, lambda: self.is_crawling
+                self._log, lambda: self.is_crawling,
+                concurrency=concurrency, rate_limit=rate, max_depth=depth, resume=resume,
+                stream_output=True,
+                include_patterns=include, exclude_patterns=exclude,
+                duplicates=duplicates
             )
             results = crawler.crawl()
             
@@ -258,7 +317,7 @@ class CrawlerLauncher:
                 self.progress_var.set(f"완료! {len(results)}개 페이지")
                 messagebox.showinfo("완료", f"크롤링 완료!\n\n{len(results)}개 페이지 수집\n\n출력:\n- TXT: {output_dir}/simple_crawler/\n- JSON: {output_dir}/simple_json/pages*.jsonl")
             else:
-                self._log("\n중지됨")
+                self._log("\n중지됨 ('이어서 크롤링'으로 재개할 수 있습니다)")
                 self.progress_var.set("중지됨")
         
         except Exception as e:
@@ -271,6 +330,7 @@ class CrawlerLauncher:
         finally:
             self.is_crawling = False
             self.start_button.config(state=tk.NORMAL)
+            self.resume_button.config(state=tk.NORMAL)
             self.stop_button.config(state=tk.DISABLED)
             self.progress_bar.stop()
     
@@ -280,6 +340,7 @@ class CrawlerLauncher:
             output_dir = self.output_dir_var.get()
             depth = int(self.depth_var.get())
             render = 1 if self.render_var.get() else 0
+            duplicates = "drop" if self.drop_duplicates_var.get() else "keep"
             
             output_dir = os.path.abspath(output_dir)
             
@@ -295,6 +356,8 @@ class CrawlerLauncher:
             self._log(f"최대 페이지: {max_pages}")
             self._log(f"깊이: {depth}")
             self._log(f"렌더링: {'사용' if render else '사용 안 함'}")
+            if duplicates == "drop":
+                self._log("근접 중복 페이지 제외")
             self._log(f"출력: {output_dir}")
             self._log("")
             self._log("⚠️  Scrapy 실행 중... (별도 창에서 진행됩니다)")
@@ -309,7 +372,8 @@ class CrawlerLauncher:
                 "-a", f"out_dir={output_dir}",
                 "-a", f"max_pages={max_pages}",
                 "-a", f"max_depth={depth}",
-                "-a", f"render={render}"
+                "-a", f"render={render}",
+                "-a", f"duplicates={duplicates}"
             ]
 
             self.process = subprocess.Popen(
@@ -445,6 +509,7 @@ class CrawlerLauncher:
         finally:
             self.is_crawling = False
             self.start_button.config(state=tk.NORMAL)
+            self.resume_button.config(state=tk.NORMAL)
             self.stop_button.config(state=tk.DISABLED)
             self.progress_bar.stop()
     
@@ -8,6 +8,8 @@ import argparse
 from pathlib import Path
 from urllib.parse import urlparse
 
+from simple_crawler.config.constants import DEFAULT_MAX_DEPTH
+
 
 class CrawlerCLI:
     """CLI launcher for selecting and running crawlers."""
@@ -28,13 +30,23 @@ class CrawlerCLI:
             return 1
         
         output_dir = os.path.abspath(args.output_dir)
+        if args.depth is None:
+            args.depth = DEFAULT_MAX_DEPTH if args.crawler_type == "simple" else 4
         
         if args.crawler_type == "simple":
             return self._run_simple_crawler(
                 args.url, 
                 args.max_pages, 
                 args.delay, 
-                output_dir
+                output_dir,
+                args.concurrency,
+                args.rate,
+                args.depth,
+                args.resume,
+                args.include,
+                args.exclude,
+                args.duplicates,
+                args.visited
             )
         else:
             return self._run_advanced_crawler(
@@ -42,7 +54,12 @@ class CrawlerCLI:
                 args.max_pages,
                 output_dir,
                 args.depth,
-                args.render
+                args.render,
+                args.duplicates,
+                args.block,
+                args.browsers,
+                args.browser_extract,
+                args.visited
             )
     
     def _check_prerequisites(self, crawler_type):
@@ -66,7 +83,8 @@ class CrawlerCLI:
             except Exception as e:
                 return False, f"Scrapy 확인 중 오류: {str(e)}"
     
-    def _run_simple_crawler(self, url, max_pages, delay, output_dir):
+    def _run_simple_crawler(self, url, max_pages, delay, output_dir, concurrency, rate, depth, resume,
+                            include, exclude, duplicates, visited):
         """Run simple crawler."""
         try:
             print("="*60)
@@ -74,7 +92,19 @@ class CrawlerCLI:
             print("="*60)
             print(f"URL: {url}")
             print(f"최대 페이지: {max_pages}")
+            print(f"동시 요청: {concurrency}")
+            print(f"깊이: {depth}")
             print(f"출력: {output_dir}")
+            if include:
+                print(f"포함 패턴: {', '.join(include)}")
+            if exclude:
+                print(f"제외 패턴: {', '.join(exclude)}")
+            if duplicates != "keep":
+                print(f"근접 중복 처리: {duplicates}")
+            if visited != "exact":
+                print(f"방문 URL 집합: {visited}")
+            if resume:
+                print("체크포인트에서 이어서 크롤링")
             print("")
             
             sys.path.insert(0, str(Path(__file__).parent / "simple_crawler"))
@@ -88,7 +118,12 @@ class CrawlerCLI:
             
             crawler = DoxygenCrawler(
                 url, max_pages, delay, output_dir,
-                log_func, should_continue
+                log_func, should_continue,
+                concurrency=concurrency, rate_limit=rate,
+                max_depth=depth, resume=resume,
+                stream_output=True,
+                include_patterns=include, exclude_patterns=exclude,
+                duplicates=duplicates, visited=visited
             )
             results = crawler.crawl()
             
@@ -118,7 +153,8 @@ class CrawlerCLI:
             traceback.print_exc()
             return 1
     
-    def _run_advanced_crawler(self, url, max_pages, output_dir, depth, render):
+    def _run_advanced_crawler(self, url, max_pages, output_dir, depth, render, duplicates, block, browsers,
+                              browser_extract, visited):
         """Run advanced Scrapy crawler."""
         try:
             parsed = urlparse(url)
@@ -132,6 +168,16 @@ class CrawlerCLI:
             print(f"최대 페이지: {max_pages}")
             print(f"깊이: {depth}")
             print(f"렌더링: {'사용' if render else '사용 안 함'}")
+            if render:
+                print(f"리소스 차단: {block}")
+            if browsers > 1:
+                print(f"브라우저 수: {browsers}")
+            if browser_extract:
+                print("본문 추출: 브라우저 안에서")
+            if duplicates != "keep":
+                print(f"근접 중복 처리: {duplicates}")
+            if visited != "exact":
+                print(f"방문 URL 집합: {visited}")
             print(f"출력: {output_dir}")
             print("")
             
@@ -144,7 +190,12 @@ class CrawlerCLI:
                 "-a", f"out_dir={output_dir}",
                 "-a", f"max_pages={max_pages}",
                 "-a", f"max_depth={depth}",
-                "-a", f"render={1 if render else 0}"
+                "-a", f"render={1 if render else 0}",
+                "-a", f"duplicates={duplicates}",
+                "-a", f"block={block}",
+                "-a", f"browser_extract={1 if browser_extract else 0}",
+                "-s", f"PLAYWRIGHT_BROWSER_SHARDS={browsers}",
+                "-s", f"VISITED_MODE={visited}"
             ]
             
             self.process = subprocess.Popen(
@@ -283,6 +334,9 @@ def main():
   # 고급 크롤러 사용
   python launcher_CLI.py -t advanced -u "https://vertx.io/docs/" -m 50 --no-render
 
+  # 하위 경로 제외
+  python launcher_CLI.py -t simple -u "https://example.com/docs/index.html" --exclude "*/v1.0/*" --exclude "re:_source\\.html$"
+
   # 출력 폴더 지정
   python launcher_CLI.py -t simple -u "https://example.com" -o ./my_output
         """
@@ -320,14 +374,63 @@ def main():
         "-d", "--delay",
         type=float,
         default=1.0,
-        help="요청 간격 (초, 간단 크롤러만 해당, 기본값: 1.0)"
+        help="요청 간격 (초, 간단 크롤러만 해당, 기본값: 1.0) - --rate를 주지 않으면 호스트별 초당 1/간격 요청"
     )
     
     parser.add_argument(
-        "--depth",
+        "-c", "--concurrency",
         type=int,
         default=4,
-        help="최대 깊이 (고급 크롤러만 해당, 기본값: 4)"
+        help="동시 요청 수 (간단 크롤러만 해당, 기본값: 4)"
+    )
+    
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=None,
+        help="모든 워커를 합친 호스트별 초당 요청 수 (간단 크롤러만 해당, 기본값: 1/요청 간격, 0 = 제한 없음)"
+    )
+    
+    parser.add_argument(
+        "--include",
+        action="append",
+        metavar="PATTERN",
+        help="이 패턴에 맞는 URL만 크롤링 (glob 또는 're:정규식', 여러 번 지정 가능, 간단 크롤러만 해당)"
+    )
+    
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        metavar="PATTERN",
+        help="이 패턴에 맞는 URL 제외 (glob 또는 're:정규식', 여러 번 지정 가능, 간단 크롤러만 해당)"
+    )
+    
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="이전 실행의 체크포인트에서 이어서 크롤링 (간단 크롤러만 해당)"
+    )
+    
+    parser.add_argument(
+        "--duplicates",
+        choices=["keep", "nofollow", "drop"],
+        default="keep",
+        help="근접 중복 페이지 처리: keep (표시만), nofollow (링크 미추적), drop (저장·링크 모두 제외) (기본값: keep)"
+    )
+    
+    parser.add_argument(
+        "--visited",
+        choices=["exact", "bloom"],
+        default="exact",
+        help="방문 URL 집합: exact (64비트 지문, URL당 약 12-23바이트), "
+             "bloom (Bloom 필터, URL당 약 2바이트, 0.1%% 확률로 새 URL을 건너뜀) (기본값: exact)"
+    )
+    
+    parser.add_argument(
+        "--depth",
+        type=int,
+        default=None,
+        help=f"최대 링크 깊이 (기본값: 간단 크롤러 {DEFAULT_MAX_DEPTH}, 고급 크롤러 4)"
     )
     
     parser.add_argument(
@@ -338,6 +441,27 @@ def main():
         help="Playwright 렌더링 비활성화 (고급 크롤러만 해당)"
     )
     
+    parser.add_argument(
+        "--block",
+        choices=["none", "media", "lean", "strict"],
+        default="lean",
+        help="렌더링 시 차단할 리소스: none, media (이미지·미디어·폰트), lean (media + 트래커), "
+             "strict (lean + 외부 도메인) (기본값: lean, 고급 크롤러만 해당)"
+    )
+    
+    parser.add_argument(
+        "--browsers",
+        type=int,
+        default=1,
+        help="렌더링에 쓸 브라우저 프로세스 수, URL 해시로 분산 (기본값: 1, 고급 크롤러만 해당)"
+    )
+    
+    parser.add_argument(
+        "--browser-extract",
+        action="store_true",
+        help="렌더링한 페이지의 본문·링크·이미지를 브라우저 안에서 추출 (고급 크롤러만 해당)"
+    )
+    
     parser.add_argument(
         "-v", "--version",
         action="version",
@@ -18,7 +18,7 @@ if errorlevel 1 (
 
 REM Install basic packages (for simple crawler)
 echo Installing basic packages...
-pip install requests beautifulsoup4 pypdf --quiet 2>nul
+pip install requests beautifulsoup4 pypdf lxml --quiet 2>nul
 
 echo.
 echo Starting launcher...
@@ -0,0 +1,163 @@
+"""Pre-warmed, recycled Playwright browser contexts with auth reuse.
+
+SiteSpider builds a ContextPool of PLAYWRIGHT_CONTEXT_POOL_SIZE slots
+and registers them in PLAYWRIGHT_CONTEXTS, so scrapy-playwright
+launches them at startup instead of on the first rendered request.
+
+ContextPoolMiddleware assigns each rendered request to the least busy
+slot right before download. After PLAYWRIGHT_CONTEXT_RECYCLE_PAGES
+pages a slot moves on to a fresh context (new generation name); the
+old one is closed once its in-flight pages are done, which keeps
+browser memory bounded on long crawls. A page counts as done when the
+spider has finished with it (ContextPool.done from the callback or
+errback), not when the response is downloaded: closing a retired
+context earlier would close the page under the callback.
+
+With an auth profile, every context starts from
+AUTH_PROFILES_DIR/<profile>.json (Playwright storage_state), and the
+refreshed cookies / localStorage are written back when a context is
+retired and at spider close, so the next run skips the login flow.
+"""
+
+import os
+from collections import Counter
+
+from scrapy import signals
+from scrapy.exceptions import NotConfigured
+
+
+def storage_state_path(profiles_dir: str, profile: str) -> str:
+    return os.path.join(profiles_dir, f"{profile}.json")
+
+
+class ContextPool:
+    def __init__(self, base_name: str, size: int = 2, recycle_after: int = 200, storage_state: str | None = None):
+        self.base_name = base_name
+        self.size = max(1, size)
+        self.recycle_after = recycle_after
+        self.storage_state = storage_state
+
+        self._generation = [0] * self.size
+        self._assigned = [0] * self.size  # pages assigned to the current generation
+        self.inflight = Counter()         # context name -> pages being downloaded
+        self.retiring = set()
+        self.contexts = {}                # context name -> BrowserContexts (one per browser shard)
+
+    def name(self, slot: int) -> str:
+        return f"{self.base_name}#{slot}.{self._generation[slot]}"
+
+    def context_kwargs(self) -> dict:
+        # Read the state file every time, so a recycled context picks up the
+        # cookies saved by its predecessor
+        if self.storage_state and os.path.exists(self.storage_state):
+            return {"storage_state": self.storage_state}
+        return {}
+
+    def startup_contexts(self) -> dict:
+        return {self.name(slot): self.context_kwargs() for slot in range(self.size)}
+
+    def acquire(self) -> str:
+        slot = min(range(self.size), key=lambda i: self.inflight[self.name(i)])
+        name = self.name(slot)
+        self.inflight[name] += 1
+        self._assigned[slot] += 1
+        if self.recycle_after and self._assigned[slot] >= self.recycle_after:
+            self.retiring.add(name)
+            self._generation[slot] += 1
+            self._assigned[slot] = 0
+        return name
+
+    def release(self, name: str) -> set:
+        """Mark one page of `name` as done; returns the contexts to retire, if any."""
+        self.inflight[name] -= 1
+        if self.inflight[name] > 0 or name not in self.retiring:
+            return set()
+        del self.inflight[name]
+        self.retiring.discard(name)
+        return self.contexts.pop(name, set())
+
+    async def done(self, meta, spider) -> None:
+        """Release the request's context; closes it if it is retiring and now idle.
+
+        Call once the callback or errback is done with the page.
+        """
+        name = meta.pop("_pool_context", None)
+        if name is None:
+            return
+        contexts = self.release(name)
+        for context in contexts:
+            if await self.save_state(context, spider):
+                break
+        for context in contexts:
+            try:
+                await context.close()
+            except Exception as e:
+                spider.logger.debug("Context close failed (%s): %r", name, e)
+        if contexts:
+            spider.crawler.stats.inc_value("playwright_pool/recycled")
+
+    async def save_state(self, context, spider) -> bool:
+        if not self.storage_state:
+            return False
+        tmp = self.storage_state + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self.storage_state) or ".", exist_ok=True)
+            await context.storage_state(path=tmp)
+            os.replace(tmp, self.storage_state)
+            spider.crawler.stats.inc_value("playwright_pool/state_saved")
+            return True
+        except Exception as e:
+            spider.logger.warning("Could not save storage_state to %s: %r", self.storage_state, e)
+            return False
+
+
+class ContextPoolMiddleware:
+    """Downloader middleware; must sit after RetryMiddleware (priority > 550).
+
+    Only assigns contexts; the spider releases them (ContextPool.done).
+    """
+
+    def __init__(self, crawler):
+        self.crawler = crawler
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getint("PLAYWRIGHT_CONTEXT_POOL_SIZE", 2):
+            raise NotConfigured
+        mw = cls(crawler)
+        crawler.signals.connect(mw.spider_closed, signal=signals.spider_closed)
+        return mw
+
+    def _pool(self, spider) -> ContextPool | None:
+        return getattr(spider, "context_pool", None)
+
+    async def process_request(self, request, spider):
+        pool = self._pool(spider)
+        if pool is None:
+            return None
+        # A retry copies the meta of a response the callback never saw
+        await pool.done(request.meta, spider)
+        if not request.meta.get("playwright"):
+            return None
+        name = pool.acquire()
+        request.meta["playwright_context"] = name
+        request.meta["playwright_context_kwargs"] = pool.context_kwargs()
+        request.meta["_pool_context"] = name
+        request.meta.setdefault("playwright_page_init_callback", self._page_init)
+        return None
+
+    async def _page_init(self, page, request):
+        pool = self._pool(self.crawler.spider)
+        if pool is not None:
+            pool.contexts.setdefault(request.meta["playwright_context"], set()).add(page.context)
+
+    async def spider_closed(self, spider, reason):
+        pool = self._pool(spider)
+        if pool is None or not pool.contexts:
+            return
+        # Any live context has the latest cookies; one save is enough. Newest
+        # first, since an older one may belong to a restarted browser
+        for contexts in reversed(list(pool.contexts.values())):
+            for context in contexts:
+                if await pool.save_state(context, spider):
+                    return
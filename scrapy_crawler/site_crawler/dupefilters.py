@@ -0,0 +1,80 @@
+"""Dupefilter keyed on the spider's canonical URL.
+
+RFPDupeFilter already ignores the fragment and query order, but not
+tracking parameters, so a redirect to "?utm_source=..." or a seed with
+"gclid" is fetched again although SiteSpider treats it as the same page
+(normalize_url) and throws the response away. CanonicalDupeFilter
+fingerprints the normalize_url() form instead, so those requests are
+dropped in the scheduler, before any download or browser work.
+
+Request fingerprints are kept in a compact visited set (VISITED_MODE
+"exact" or "bloom", see utils/visited.py) instead of a set of 20-byte
+digests; with JOBDIR it is saved as JOBDIR/requests.visited.
+
+Stats:
+  dupefilter/filtered            all dropped requests (Scrapy's own counter)
+  dupefilter/canonical_filtered  dropped requests whose URL differed from its canonical form
+  visited/dupefilter/...         tracked fingerprints and bytes per fingerprint
+The spider adds dupefilter/wasted_fetch and dupefilter/wasted_render
+for responses that still turned out to be duplicates after download.
+"""
+
+import os
+
+from scrapy.dupefilters import RFPDupeFilter
+from scrapy.utils.job import job_dir
+
+from site_crawler.utils.urlnorm import normalize_url
+from site_crawler.utils.visited import open_visited
+
+
+def open_crawl_visited(settings, filename: str):
+    """Visited set configured by VISITED_* settings, persisted in JOBDIR if set."""
+    directory = job_dir(settings)
+    return open_visited(
+        settings.get("VISITED_MODE", "exact"),
+        path=os.path.join(directory, filename) if directory else None,
+        capacity=settings.getint("VISITED_CAPACITY", 100_000),
+        fp_rate=settings.getfloat("VISITED_FP_RATE", 0.001),
+    )
+
+
+def record_visited_stats(stats, name: str, visited) -> None:
+    stats.set_value(f"visited/{name}/urls", len(visited))
+    stats.set_value(f"visited/{name}/bytes", visited.memory_bytes())
+    stats.set_value(f"visited/{name}/bytes_per_url", round(visited.bytes_per_url(), 1))
+
+
+class CanonicalDupeFilter(RFPDupeFilter):
+    stats = None
+
+    def __init__(self, path=None, debug=False, *, fingerprinter=None, visited=None):
+        # The parent's set and requests.seen file stay unused
+        super().__init__(None, debug, fingerprinter=fingerprinter)
+        self.visited = visited if visited is not None else open_visited()
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        dupefilter = cls(
+            debug=settings.getbool("DUPEFILTER_DEBUG"),
+            fingerprinter=crawler.request_fingerprinter,
+            visited=open_crawl_visited(settings, "requests.visited"),
+        )
+        dupefilter.stats = crawler.stats
+        return dupefilter
+
+    def request_seen(self, request) -> bool:
+        canon = normalize_url(request.url, request.url) or request.url
+        canonical = request if canon == request.url else request.replace(url=canon)
+        if self.visited.add(self.fingerprinter.fingerprint(canonical)):
+            return False
+        if canonical is not request and self.stats is not None:
+            self.stats.inc_value("dupefilter/canonical_filtered")
+        return True
+
+    def close(self, reason) -> None:
+        self.visited.save()
+        if self.stats is not None:
+            record_visited_stats(self.stats, "dupefilter", self.visited)
+        super().close(reason)
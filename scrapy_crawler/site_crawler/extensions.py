@@ -0,0 +1,144 @@
+"""Per-request-class latency / cost stats for SiteSpider.
+
+Requests are grouped by how they were fetched:
+  http      plain HTTP
+  render    Playwright (render=1)
+  rerender  forced Playwright re-request after _needs_render()
+  fallback  HTTP retry after a Playwright failure (errback_close_page)
+
+For each class the extension records download latency (the render
+time for Playwright classes), response bytes, page extraction CPU
+time (extract_page, wherever it ran) and pipeline write time, and dumps percentiles into the Scrapy
+stats and out_dir/scrapy_metrics.json at close.
+"""
+
+import json
+import os
+import time
+from array import array
+from collections import defaultdict
+
+from scrapy import signals
+from scrapy.exceptions import NotConfigured
+
+REQUEST_CLASSES = ("http", "render", "rerender", "fallback")
+
+# Custom signals sent by the spider / pipeline: (request_class, seconds)
+extract_timed = object()
+pipeline_timed = object()
+
+
+def request_class(meta) -> str:
+    if meta.get("_pw_fallback_tried"):
+        return "fallback"
+    if meta.get("playwright"):
+        return "rerender" if meta.get("_forced_render") else "render"
+    return "http"
+
+
+def _percentile(ordered, pct: float) -> float:
+    k = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[k]
+
+
+class RequestClassStats:
+    def __init__(self, crawler):
+        self.crawler = crawler
+        self.stats = crawler.stats
+        self._samples = defaultdict(lambda: array("d"))  # (metric, class) -> seconds
+        self._bytes = defaultdict(int)
+        self._started = time.monotonic()
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool("REQUEST_CLASS_STATS_ENABLED", True):
+            raise NotConfigured
+        ext = cls(crawler)
+        crawler.signals.connect(ext.request_scheduled, signal=signals.request_scheduled)
+        crawler.signals.connect(ext.request_dropped, signal=signals.request_dropped)
+        crawler.signals.connect(ext.response_received, signal=signals.response_received)
+        crawler.signals.connect(ext.extract_timed, signal=extract_timed)
+        crawler.signals.connect(ext.pipeline_timed, signal=pipeline_timed)
+        crawler.signals.connect(ext.spider_closed, signal=signals.spider_closed)
+        return ext
+
+    def request_scheduled(self, request, spider):
+        self.stats.inc_value(f"reqclass/{request_class(request.meta)}/scheduled")
+
+    def request_dropped(self, request, spider):
+        # e.g. duplicates removed by the dupefilter
+        self.stats.inc_value(f"reqclass/{request_class(request.meta)}/dropped")
+
+    def response_received(self, response, request, spider):
+        cls = request_class(request.meta)
+        self.stats.inc_value(f"reqclass/{cls}/responses")
+        latency = request.meta.get("download_latency")
+        if latency is not None:
+            self._samples["latency", cls].append(latency)
+        self._bytes[cls] += len(response.body)
+
+    def extract_timed(self, request_class, seconds):
+        self._samples["extract_cpu", request_class].append(seconds)
+
+    def pipeline_timed(self, request_class, seconds):
+        self._samples["pipeline_write", request_class].append(seconds)
+
+    def summary(self) -> dict:
+        result = {"elapsed_sec": round(time.monotonic() - self._started, 3), "classes": {}}
+        for cls in REQUEST_CLASSES:
+            data = {}
+            for metric in ("latency", "extract_cpu", "pipeline_write"):
+                values = self._samples.get((metric, cls))
+                if not values:
+                    continue
+                ordered = sorted(values)
+                data[metric] = {
+                    "count": len(ordered),
+                    "total_sec": round(sum(ordered), 3),
+                    "p50_ms": round(_percentile(ordered, 50) * 1000, 2),
+                    "p95_ms": round(_percentile(ordered, 95) * 1000, 2),
+                    "p99_ms": round(_percentile(ordered, 99) * 1000, 2),
+                    "max_ms": round(ordered[-1] * 1000, 2),
+                }
+            if self._bytes.get(cls):
+                data["bytes"] = self._bytes[cls]
+            for counter in ("scheduled", "dropped", "responses"):
+                value = self.stats.get_value(f"reqclass/{cls}/{counter}")
+                if value:
+                    data[counter] = value
+            if data:
+                result["classes"][cls] = data
+        return result
+
+    def spider_closed(self, spider, reason):
+        summary = self.summary()
+
+        for cls, data in summary["classes"].items():
+            for metric in ("latency", "extract_cpu", "pipeline_write"):
+                if metric in data:
+                    for key in ("p50_ms", "p95_ms", "p99_ms", "max_ms", "total_sec"):
+                        self.stats.set_value(f"reqclass/{cls}/{metric}_{key}", data[metric][key])
+            if "bytes" in data:
+                self.stats.set_value(f"reqclass/{cls}/bytes", data["bytes"])
+
+        out_dir = getattr(spider, "out_dir", None)
+        if out_dir:
+            try:
+                os.makedirs(out_dir, exist_ok=True)
+                with open(os.path.join(out_dir, "scrapy_metrics.json"), "w", encoding="utf-8") as f:
+                    json.dump(summary, f, ensure_ascii=False, indent=2)
+            except OSError as e:
+                spider.logger.warning("Could not write scrapy_metrics.json: %s", e)
+
+        for cls, data in summary["classes"].items():
+            latency = data.get("latency", {})
+            extract = data.get("extract_cpu", {})
+            spider.logger.info(
+                "[%s] 응답 %s개, 지연 p50 %sms / p99 %sms, 추출 CPU p50 %sms, %.1fKB",
+                cls,
+                data.get("responses", 0),
+                latency.get("p50_ms", "-"),
+                latency.get("p99_ms", "-"),
+                extract.get("p50_ms", "-"),
+                data.get("bytes", 0) / 1024,
+            )
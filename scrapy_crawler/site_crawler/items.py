@@ -20,5 +20,9 @@ class PageItem(scrapy.Item):
     depth = scrapy.Field()
     auth_profile = scrapy.Field()
 
+    # 근접 중복이면 원본 페이지 URL
+    duplicate_of = scrapy.Field()
+
     # 내부용
     page_key = scrapy.Field()  # hash key
+    request_class = scrapy.Field()  # http / render / rerender / fallback
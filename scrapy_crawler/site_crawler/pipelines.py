@@ -1,12 +1,15 @@
 import hashlib
 import json
 import os
+import time
 from datetime import datetime, timezone
 from urllib.parse import urlsplit
 
 import scrapy
 from scrapy.pipelines.images import ImagesPipeline
 
+from site_crawler.extensions import pipeline_timed
+
 
 def sha256(s: str) -> str:
     return hashlib.sha256(s.encode("utf-8", errors="ignore")).hexdigest()
@@ -149,6 +152,8 @@ class JsonlPipeline:
             pass
 
     def process_item(self, item, spider):
+        start = time.perf_counter()
+
         # Save JSONL
         rec = dict(item)
         rec.setdefault("fetched_at", now_iso())
@@ -171,6 +176,12 @@ class JsonlPipeline:
         # Save TXT file
         self.page_counter += 1
         self._save_txt_file(item, self.page_counter)
+
+        spider.crawler.signals.send_catch_log(
+            signal=pipeline_timed,
+            request_class=item.get("request_class") or "http",
+            seconds=time.perf_counter() - start,
+        )
         
         return item
     
@@ -196,6 +207,8 @@ class JsonlPipeline:
             f.write(f"크롤링 시간: {timestamp}\n")
             f.write(f"렌더링: {'예' if item.get('rendered') else '아니오'}\n")
             f.write(f"깊이: {item.get('depth', 0)}\n")
+            if item.get('duplicate_of'):
+                f.write(f"근접 중복: {item.get('duplicate_of')}\n")
             f.write("="*80 + "\n\n")
             
             # Main text
@@ -0,0 +1,75 @@
+"""Resource blocking for Playwright-rendered requests.
+
+settings.PLAYWRIGHT_ABORT_REQUEST points at abort_request(); the
+spider picks the profile with configure() (spider argument
+block=...). Profiles:
+
+  none    load everything
+  media   abort images, media and fonts
+  lean    media + known analytics / ad / tracker hosts   (default)
+  strict  lean + every request to a host outside allowed_domains
+          (can break sites that load their app code from a CDN)
+
+Aborted images are never downloaded, but their URLs stay in the DOM
+(<img src>, computed background-image), so image extraction in the
+spider still sees them.
+"""
+
+from collections import Counter
+from urllib.parse import urlsplit
+
+BLOCK_PROFILES = ("none", "media", "lean", "strict")
+
+MEDIA_TYPES = frozenset({"image", "media", "font"})
+
+TRACKER_DOMAINS = (
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "googlesyndication.com",
+    "adservice.google.com", "facebook.net", "hotjar.com", "segment.io", "segment.com",
+    "mixpanel.com", "amplitude.com", "optimizely.com", "nr-data.net", "clarity.ms",
+    "scorecardresearch.com", "quantserve.com", "hs-analytics.net", "hs-scripts.com",
+    "intercom.io", "fullstory.com", "criteo.com", "taboola.com", "outbrain.com",
+)
+
+# One spider per process, so the active profile is module state
+_profile = "lean"
+_allowed_domains = ()
+
+# Aborted requests by reason/resource type (copied into stats at close)
+aborted = Counter()
+
+
+def configure(profile: str, allowed_domains) -> None:
+    global _profile, _allowed_domains
+    if profile not in BLOCK_PROFILES:
+        raise ValueError(f"block must be one of {BLOCK_PROFILES}")
+    _profile = profile
+    _allowed_domains = tuple(d.split(":")[0].lower() for d in allowed_domains)
+
+
+def _host_matches(host: str, domains) -> bool:
+    return any(host == d or host.endswith("." + d) for d in domains)
+
+
+def should_abort(url: str, resource_type: str, profile: str, allowed_domains=()) -> str | None:
+    """Return the reason to abort a browser request, or None to load it."""
+    if profile == "none" or resource_type == "document":
+        return None
+    if resource_type in MEDIA_TYPES:
+        return resource_type
+
+    if profile in ("lean", "strict"):
+        host = (urlsplit(url).hostname or "").lower()
+        if _host_matches(host, TRACKER_DOMAINS):
+            return "tracker"
+        if profile == "strict" and allowed_domains and host and not _host_matches(host, allowed_domains):
+            return "third_party"
+    return None
+
+
+def abort_request(request) -> bool:
+    """PLAYWRIGHT_ABORT_REQUEST predicate (playwright Request -> bool)."""
+    reason = should_abort(request.url, request.resource_type, _profile, _allowed_domains)
+    if reason:
+        aborted[reason] += 1
+        return True
+    return False
@@ -0,0 +1,193 @@
+"""Spread rendered requests over several browser processes.
+
+ShardedPlaywrightDownloadHandler runs PLAYWRIGHT_BROWSER_SHARDS
+scrapy-playwright handlers, each with its own Playwright driver and
+browser, and sends every rendered request to one of them by a stable
+hash of its URL (PLAYWRIGHT_SHARD_BY = "url") or host ("host", keeps
+a site's cookies in one browser). Plain HTTP requests go to the first
+shard's HTTP handler. One instance serves both http and https, so
+there are exactly N browsers.
+
+Crashed browsers are relaunched by scrapy-playwright itself
+(PLAYWRIGHT_RESTART_DISCONNECTED_BROWSER) and its in-flight requests
+retried on TargetClosedError. On top of that, a shard whose browser
+process tree grows past PLAYWRIGHT_SHARD_MAX_RSS_MB (needs psutil and
+scrapy-playwright 0.0.48 or later) is drained: new requests for it wait, in-flight ones finish, then the
+browser is closed and relaunched on the next request.
+"""
+
+import asyncio
+import logging
+import zlib
+from contextlib import suppress
+from importlib import import_module
+from urllib.parse import urlsplit
+
+from scrapy import version_info as scrapy_version_info
+from scrapy.utils.defer import deferred_from_coro, maybe_deferred_to_future
+from scrapy_playwright.handler import ScrapyPlaywrightDownloadHandler
+
+logger = logging.getLogger(__name__)
+
+_SCRAPY_ASYNC_API = scrapy_version_info >= (2, 14, 0)
+
+SHARD_KEYS = ("url", "host")
+
+
+def shard_index(url: str, shards: int, by: str = "url") -> int:
+    key = urlsplit(url).netloc.lower() if by == "host" else url
+    return zlib.crc32(key.encode("utf-8")) % shards
+
+
+class _Shard:
+    def __init__(self, index: int, handler: ScrapyPlaywrightDownloadHandler):
+        self.index = index
+        self.handler = handler
+        self.inflight = 0
+        self.rendered = 0
+        self.ready = asyncio.Event()
+        self.ready.set()
+        self.idle = asyncio.Event()
+        self.idle.set()
+
+
+class ShardedPlaywrightDownloadHandler:
+    # Loaded at startup so the shards see engine_started and launch in time
+    lazy = False
+
+    _instances = {}  # id(crawler) -> handler, shared by the http and https schemes
+
+    def __init__(self, crawler):
+        settings = crawler.settings
+        self.crawler = crawler
+        self.stats = crawler.stats
+        count = max(1, settings.getint("PLAYWRIGHT_BROWSER_SHARDS", 1))
+        self.shard_by = settings.get("PLAYWRIGHT_SHARD_BY", "url")
+        if self.shard_by not in SHARD_KEYS:
+            raise ValueError(f"PLAYWRIGHT_SHARD_BY must be one of {SHARD_KEYS}")
+        self.max_rss = settings.getint("PLAYWRIGHT_SHARD_MAX_RSS_MB", 0) * 1024 * 1024
+        self.check_every = max(1, settings.getint("PLAYWRIGHT_SHARD_CHECK_PAGES", 25))
+        self.shards = [_Shard(i, ScrapyPlaywrightDownloadHandler(crawler)) for i in range(count)]
+        self._closed = False
+        self._rss_unreadable = False
+
+        self.psutil = None
+        if self.max_rss:
+            try:
+                self.psutil = import_module("psutil")
+            except ImportError:
+                logger.warning("psutil is not installed; PLAYWRIGHT_SHARD_MAX_RSS_MB is ignored")
+            if not settings.getbool("PLAYWRIGHT_RESTART_DISCONNECTED_BROWSER", True):
+                logger.warning("PLAYWRIGHT_RESTART_DISCONNECTED_BROWSER is off; memory restarts disabled")
+                self.psutil = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        key = id(crawler)
+        if key not in cls._instances:
+            cls._instances[key] = cls(crawler)
+        return cls._instances[key]
+
+    def _pick(self, request) -> _Shard:
+        index = request.meta.get("playwright_shard")
+        if index is None:
+            index = shard_index(request.url, len(self.shards), self.shard_by)
+        return self.shards[index % len(self.shards)]
+
+    async def _download(self, request, spider=None):
+        if not request.meta.get("playwright"):
+            return await self._call(self.shards[0], request, spider)
+
+        shard = self._pick(request)
+        await shard.ready.wait()
+        shard.inflight += 1
+        shard.idle.clear()
+        self.stats.inc_value(f"playwright_shards/{shard.index}/requests")
+        try:
+            return await self._call(shard, request, spider)
+        finally:
+            shard.inflight -= 1
+            shard.rendered += 1
+            if not shard.inflight:
+                shard.idle.set()
+            if self.psutil and shard.ready.is_set() and shard.rendered % self.check_every == 0:
+                self._maybe_restart(shard)
+
+    async def _call(self, shard: _Shard, request, spider):
+        if _SCRAPY_ASYNC_API:
+            return await shard.handler.download_request(request)
+        return await maybe_deferred_to_future(shard.handler.download_request(request, spider))
+
+    def _browser_rss(self, shard: _Shard) -> int:
+        # Driver process and its descendants (browser, renderers, GPU...)
+        try:
+            manager = shard.handler.browser_provider.playwright_context_manager
+            root = self.psutil.Process(manager._connection._transport._proc.pid)
+        except Exception:
+            # Handler internals as of scrapy-playwright 0.0.48 (see requirements.txt)
+            if not self._rss_unreadable:
+                self._rss_unreadable = True
+                logger.warning("Cannot find the browser process of shard %d; "
+                               "PLAYWRIGHT_SHARD_MAX_RSS_MB has no effect", shard.index, exc_info=True)
+            return 0
+        total = 0
+        for proc in [root] + root.children(recursive=True):
+            with suppress(Exception):
+                total += proc.memory_info().rss
+        return total
+
+    def _maybe_restart(self, shard: _Shard) -> None:
+        rss = self._browser_rss(shard)
+        if rss <= self.max_rss:
+            return
+        logger.info("Browser shard %d uses %d MiB, restarting after in-flight pages",
+                    shard.index, rss // (1024 * 1024))
+        shard.ready.clear()
+        asyncio.ensure_future(self._restart(shard))
+
+    async def _restart(self, shard: _Shard) -> None:
+        handler = shard.handler
+        try:
+            await shard.idle.wait()
+            browser = getattr(handler, "browser", None)
+            if browser is not None:
+                # The handler's "disconnected" callback closes the contexts and
+                # drops the browser, so the next request launches a new one
+                with suppress(Exception):
+                    await handler._maybe_future_from_coro(browser.close())
+                for _ in range(50):
+                    if getattr(handler, "browser", None) is not browser:
+                        break
+                    await asyncio.sleep(0.1)
+            self.stats.inc_value("playwright_shards/restarts/memory")
+        finally:
+            shard.ready.set()
+
+    if _SCRAPY_ASYNC_API:
+
+        async def download_request(self, request):
+            return await self._download(request)
+
+        async def close(self) -> None:
+            if self._closed:
+                return
+            self._closed = True
+            self._instances.pop(id(self.crawler), None)
+            for shard in self.shards:
+                await shard.handler.close()
+
+    else:
+
+        def download_request(self, request, spider):
+            return deferred_from_coro(self._download(request, spider))
+
+        def close(self):
+            if self._closed:
+                return None
+            self._closed = True
+            self._instances.pop(id(self.crawler), None)
+            return deferred_from_coro(self._close_shards())
+
+        async def _close_shards(self) -> None:
+            for shard in self.shards:
+                await maybe_deferred_to_future(shard.handler.close())
@@ -24,8 +24,16 @@ DEFAULT_REQUEST_HEADERS = {
     "Accept-Language": "en,ko;q=0.9",
 }
 
-# DupeFilter(요청 단위) 기본
-DUPEFILTER_CLASS = "scrapy.dupefilters.RFPDupeFilter"
+# DupeFilter: spider와 같은 정규화 URL(추적 파라미터 제거, 쿼리 정렬, fragment 제거) 기준으로
+# 스케줄 단계에서 중복 요청을 버림 (다운로드·렌더링 전)
+DUPEFILTER_CLASS = "site_crawler.dupefilters.CanonicalDupeFilter"
+
+# 방문·요청 URL 집합 (spider와 dupefilter 공통): exact = 64비트 지문 (URL당 12-23바이트),
+# bloom = Bloom 필터 (URL당 약 2바이트, VISITED_FP_RATE 확률로 새 URL을 건너뜀)
+# JOBDIR을 지정하면 JOBDIR/*.visited에 저장했다가 이어서 크롤링할 때 불러옴
+VISITED_MODE = "exact"
+VISITED_FP_RATE = 0.001
+VISITED_CAPACITY = 100_000  # bloom: 예상 URL 수 (넘으면 필터를 추가로 늘림)
 
 # 파이프라인: 이미지 다운로드 + JSONL 저장
 ITEM_PIPELINES = {
@@ -36,12 +44,37 @@ ITEM_PIPELINES = {
 # Media(이미지) 설정: 파이프라인에서 out_dir 하위로 저장 경로를 동적으로 잡습니다.
 IMAGES_STORE = os.path.abspath(os.getenv("CRAWL_OUT_DIR", "./dump"))
 
-# scrapy-playwright
+# 요청 종류별(http/render/rerender/fallback) 지연·추출·저장 시간 통계
+# 종료 시 Scrapy stats와 out_dir/scrapy_metrics.json에 기록
+EXTENSIONS = {
+    "site_crawler.extensions.RequestClassStats": 500,
+}
+REQUEST_CLASS_STATS_ENABLED = True
+
+# 본문 추출(readability)을 별도 프로세스에서 실행 (0이면 reactor 스레드에서 직접)
+# 페이지당 EXTRACT_TIMEOUT초를 넘기면 간이 추출로 대체
+EXTRACT_WORKERS = 2
+EXTRACT_TIMEOUT = 10.0
+
+# render=0에서 SPA 판별: 본문 앞부분만 검사, 같은 호스트·경로 패턴을 N개 본 뒤부터 바로 렌더링 요청
+RENDER_MARKER_SCAN_BYTES = 65536
+RENDER_CACHE_MIN_SAMPLES = 3
+
+# scrapy-playwright (브라우저 여러 개로 분산하는 래퍼, http/https가 같은 브라우저들을 공유)
 DOWNLOAD_HANDLERS = {
-    "http": "scrapy_playwright.handler.ScrapyPlaywrightDownloadHandler",
-    "https": "scrapy_playwright.handler.ScrapyPlaywrightDownloadHandler",
+    "http": "site_crawler.playwright_shards.ShardedPlaywrightDownloadHandler",
+    "https": "site_crawler.playwright_shards.ShardedPlaywrightDownloadHandler",
 }
 
+# 렌더링용 브라우저 프로세스 수 (코어 수에 맞춰 늘리면 SPA 처리량이 비례해 증가)
+PLAYWRIGHT_BROWSER_SHARDS = 1
+PLAYWRIGHT_SHARD_BY = "url"  # url: URL 해시로 고르게 분산, host: 호스트별 고정 (쿠키 공유)
+# 브라우저 프로세스 메모리가 이 값(MB)을 넘으면 진행 중인 페이지를 마친 뒤 재시작 (psutil 필요, 0이면 끔)
+PLAYWRIGHT_SHARD_MAX_RSS_MB = 0
+PLAYWRIGHT_SHARD_CHECK_PAGES = 25
+# 브라우저가 죽으면 다시 띄우고 진행 중이던 요청은 재시도
+PLAYWRIGHT_RESTART_DISCONNECTED_BROWSER = True
+
 TWISTED_REACTOR = "twisted.internet.asyncioreactor.AsyncioSelectorReactor"
 
 PLAYWRIGHT_BROWSER_TYPE = "chromium"
@@ -50,6 +83,23 @@ PLAYWRIGHT_DEFAULT_NAVIGATION_TIMEOUT = 30_000
 # 브라우저 동시성 제한 (중요)
 PLAYWRIGHT_MAX_PAGES_PER_CONTEXT = 4
 
+# 브라우저 컨텍스트 풀 (시작 시 미리 생성, N페이지마다 새 컨텍스트로 교체해 메모리 제한)
+# 동시 렌더링 페이지 수 = 풀 크기 × PLAYWRIGHT_MAX_PAGES_PER_CONTEXT
+PLAYWRIGHT_CONTEXT_POOL_SIZE = 2  # 0이면 풀 사용 안 함
+PLAYWRIGHT_CONTEXT_RECYCLE_PAGES = 200
+
+# 인증 프로파일: -a profile=corp 이면 AUTH_PROFILES_DIR/corp.json (Playwright storage_state)을
+# 불러오고, 갱신된 쿠키를 다시 저장
+AUTH_PROFILES_DIR = os.path.abspath(os.getenv("AUTH_PROFILES_DIR", "./auth_profiles"))
+
+DOWNLOADER_MIDDLEWARES = {
+    # RetryMiddleware(550) 뒤에 두어야 재시도마다 컨텍스트가 다시 배정됨
+    "site_crawler.contextpool.ContextPoolMiddleware": 950,
+}
+
+# 렌더링 시 불필요한 리소스 차단 (프로파일은 spider 인자 block=none|media|lean|strict)
+PLAYWRIGHT_ABORT_REQUEST = "site_crawler.playwright_blocking.abort_request"
+
 # 필요 시 프록시/헤더 등은 context kwargs로 설정 가능
 
 LOG_LEVEL = "INFO"
@@ -1,14 +1,27 @@
 import hashlib
+import os
+import time
 from datetime import datetime, timezone
 
+from urllib.parse import urlsplit
+
 import scrapy
-from scrapy.linkextractors import LinkExtractor
-from scrapy.spiders import CrawlSpider, Rule
+from scrapy import signals
+from scrapy.utils.job import job_dir
 
 from site_crawler.items import PageItem
 from site_crawler.utils.urlnorm import normalize_url
-from site_crawler.utils.text import extract_main_text
-from site_crawler.utils.cssbg import extract_urls_from_css_text, unique
+from site_crawler.utils.text import clean_text
+from site_crawler.utils.extract import PageExtractor
+from site_crawler.utils.simhash import NearDuplicateIndex, DUPLICATE_POLICIES
+from site_crawler.utils.rendercache import RenderDecisionCache, has_spa_markers
+from site_crawler.utils.inpage import extraction_page_method, extraction_result
+from site_crawler.utils.budget import CrawlBudget
+from site_crawler.extensions import extract_timed, request_class
+from site_crawler import playwright_blocking
+from site_crawler.contextpool import ContextPool, storage_state_path
+from site_crawler.dupefilters import open_crawl_visited, record_visited_stats
+from site_crawler.utils.visited import open_visited, describe_memory
 
 
 def sha1(s: str) -> str:
@@ -19,7 +32,7 @@ def now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
-class SiteSpider(CrawlSpider):
+class SiteSpider(scrapy.Spider):
     name = "site"
 
     custom_settings = {
@@ -28,8 +41,6 @@ class SiteSpider(CrawlSpider):
         # playwright 페이지 동시성은 settings.py의 PLAYWRIGHT_MAX_PAGES_PER_CONTEXT로 제어
     }
 
-    rules = ()
-
     def __init__(
         self,
         seed: str,
@@ -40,6 +51,9 @@ class SiteSpider(CrawlSpider):
         profile: str | None = None,
         include_css_bg: int = 1,
         render: int = 1,
+        duplicates: str = "keep",
+        block: str = "lean",
+        browser_extract: int = 0,
         *args,
         **kwargs,
     ):
@@ -52,19 +66,116 @@ class SiteSpider(CrawlSpider):
         self.profile = profile
         self.include_css_bg = bool(int(include_css_bg))
         self.render_default = bool(int(render))
+        # 렌더링한 페이지는 브라우저 안에서 본문·링크·이미지를 추출하고 결과만 받음
+        self.browser_extract = bool(int(browser_extract))
+
+        # 렌더링 시 이미지·폰트·트래커 등 차단 (이미지 URL은 DOM에서 그대로 수집)
+        playwright_blocking.configure(block, self.allowed_domains)
+        self.block = block
+
+        # Compact fingerprint sets; replaced per VISITED_MODE in from_crawler
+        self.seen = open_visited()  # canonical url visited
+        self.scheduled = open_visited()  # canonical urls already requested (each is requested once)
+        # max_pages: every page request holds a reservation until saved or discarded
+        self.budget = CrawlBudget(self.max_pages)
+
+        # 근접 중복: keep (표시만), nofollow (링크 미추적), drop (저장·링크 모두 제외)
+        if duplicates not in DUPLICATE_POLICIES:
+            raise ValueError(f"duplicates must be one of {DUPLICATE_POLICIES}")
+        self.duplicates = duplicates
+        self.dedup = NearDuplicateIndex()
+        self.duplicate_count = 0
+
+        # render=0일 때 호스트·경로 패턴별로 렌더링 필요 여부를 학습
+        self.render_cache = RenderDecisionCache()
+        self.render_scan_bytes = 65536
+        self.context_pool = None  # set in from_crawler
+        self.page_extractor = PageExtractor(workers=0)
+
+    @classmethod
+    def from_crawler(cls, crawler, *args, **kwargs):
+        spider = super().from_crawler(crawler, *args, **kwargs)
+        settings = crawler.settings
+        spider.render_cache = RenderDecisionCache(settings.getint("RENDER_CACHE_MIN_SAMPLES", 3))
+        spider.render_scan_bytes = settings.getint("RENDER_MARKER_SCAN_BYTES", 65536)
+        crawler.signals.connect(spider._request_dropped, signal=signals.request_dropped)
+        spider.seen = open_crawl_visited(settings, "seen.visited")
+        spider.scheduled = open_crawl_visited(settings, "scheduled.visited")
+        directory = job_dir(settings)
+        if directory:
+            # Saved with the visited sets; see utils/budget.py
+            spider.budget = CrawlBudget(spider.max_pages, path=os.path.join(directory, "budget.json"))
+        spider.page_extractor = PageExtractor(
+            workers=settings.getint("EXTRACT_WORKERS", 2),
+            timeout=settings.getfloat("EXTRACT_TIMEOUT", 10.0),
+        )
 
-        self.seen = set()  # canonical url visited
-        self.page_count = 0
+        # 브라우저 컨텍스트 풀: 인증 프로파일(storage_state) 재사용, N페이지마다 교체
+        pool_size = settings.getint("PLAYWRIGHT_CONTEXT_POOL_SIZE", 2)
+        if pool_size:
+            state = None
+            if spider.profile:
+                state = storage_state_path(settings.get("AUTH_PROFILES_DIR", "./auth_profiles"), spider.profile)
+            spider.context_pool = ContextPool(
+                spider._pw_context_name(),
+                size=pool_size,
+                recycle_after=settings.getint("PLAYWRIGHT_CONTEXT_RECYCLE_PAGES", 200),
+                storage_state=state,
+            )
+            if spider.render_default and not settings.frozen:
+                # Launch the contexts together with the browser instead of on the first page
+                settings.set("PLAYWRIGHT_CONTEXTS", spider.context_pool.startup_contexts(), priority="spider")
+        return spider
 
-        le = LinkExtractor(allow_domains=self.allowed_domains)
-        self.rules = (
-            Rule(le, callback="parse_page", follow=True),
-        )
-        self._compile_rules()
+    async def start(self):
+        # Scrapy 2.13+ entry point; older versions call start_requests()
+        for request in self.start_requests():
+            yield request
 
     def start_requests(self):
-        for url in self.start_urls:
-            yield self._make_request(url=url, depth=0)
+        yield from self._follow(self.start_urls, depth=0)
+        # A resumed crawl may have backlogged URLs and no request left to release a slot
+        while (entry := self.budget.take()) is not None:
+            yield self._budgeted_request(*entry)
+
+    def _follow(self, urls, depth: int):
+        """The one place new URLs are requested: depth limit, one request per URL, page budget."""
+        if depth > self.max_depth:
+            return
+        for url in urls:
+            if not self.scheduled.add(url):
+                continue
+            if self.budget.reserve():
+                yield self._budgeted_request(url, depth)
+            else:
+                self.budget.defer(url, depth)
+
+    def _budgeted_request(self, url: str, depth: int):
+        request = self._make_request(url=url, depth=depth)
+        request.meta["_budget"] = True
+        return request
+
+    def _settle(self, meta) -> None:
+        """Give back the reservation of a request that ended without a saved page."""
+        if not meta.pop("_budget", False):
+            return
+        self.budget.release()
+        while True:
+            entry = self.budget.take()
+            if entry is None:
+                return
+            self.crawler.engine.crawl(self._budgeted_request(*entry))
+
+    def _request_dropped(self, request, spider):
+        # Filtered by the dupefilter before download
+        self._settle(request.meta)
+
+    def _in_scope(self, url: str) -> bool:
+        if not self.allowed_domains:
+            return True
+        host = (urlsplit(url).hostname or "").lower()
+        return any(host == d or host.endswith("." + d)
+                   for d in (dom.split(":")[0].lower() for dom in self.allowed_domains))
 
     def _make_request(self, url: str, depth: int, *, force_render: bool = False):
         meta = {"depth": depth}
@@ -74,13 +185,34 @@ class SiteSpider(CrawlSpider):
             meta["auth_profile"] = self.profile
 
         # playwright 조건부
-        if self.render_default or force_render:
+        render = self.render_default or force_render
+        if not render and self.render_cache.decide(url):
+            # Same host/path pattern has needed rendering before: skip the HTTP pass
+            render = True
+            meta["_predicted_render"] = True
+            self.crawler.stats.inc_value("render_cache/predicted_render")
+
+        if render:
             meta["playwright"] = True
-            meta["playwright_include_page"] = True
-            # context options: storage_state is loaded by a custom context factory pattern
+            if self.browser_extract:
+                # Everything is collected by the page method; no page object needed
+                meta["playwright_page_methods"] = [
+                    extraction_page_method(self.include_css_bg, self.render_scan_bytes)
+                ]
+                meta["playwright_include_page"] = False
+            else:
+                # The page object is only needed for in-page evaluation; without it
+                # scrapy-playwright closes the page itself
+                meta["playwright_include_page"] = self.include_css_bg
+            # Replaced by a pooled context (with storage_state) in ContextPoolMiddleware
             meta["playwright_context"] = self._pw_context_name()
+            if force_render and not self.render_default:
+                # SPA re-request; counted separately by RequestClassStats
+                meta["_forced_render"] = True
 
-        return scrapy.Request(url, callback=self.parse_page, meta=meta, dont_filter=False,
+        # A re-render revisits a URL already fetched over HTTP, so it must
+        # bypass the dupefilter
+        return scrapy.Request(url, callback=self.parse_page, meta=meta, dont_filter=force_render,
                               errback=self.errback_close_page)
 
     async def errback_close_page(self, failure):
@@ -97,14 +229,13 @@ class SiteSpider(CrawlSpider):
         except Exception:
             self.logger.error("Request failed (logging error): %r", failure)
 
-        # 2) playwright 페이지가 열려있으면 닫기
+        # 2) playwright 페이지가 열려있으면 닫고 컨텍스트 반납
         if request is not None:
             page = request.meta.get("playwright_page")
             if page is not None:
-                try:
-                    await page.close()
-                except Exception:
-                    pass
+                self.crawler.stats.inc_value("playwright_page/opened")
+                await self._close_page(page)
+            await self._release_context(request.meta)
 
         # 3) Playwright가 죽는(TargetClosedError 등) 케이스면 1회만 non-render로 폴백 재시도
         if request is not None and request.meta.get("playwright") and not request.meta.get("_pw_fallback_tried"):
@@ -116,7 +247,25 @@ class SiteSpider(CrawlSpider):
             meta.pop("playwright_page", None)
 
             self.logger.warning("Retrying without Playwright: %s", request.url)
+            # The retry keeps the page's budget reservation (meta["_budget"])
             yield request.replace(meta=meta, dont_filter=True)
+        elif request is not None:
+            self._settle(request.meta)
+
+    async def _close_page(self, page) -> None:
+        if page.is_closed():
+            return
+        try:
+            await page.close()
+        except Exception as e:
+            # Counted as leaked at close
+            self.logger.warning("Could not close Playwright page: %r", e)
+            return
+        self.crawler.stats.inc_value("playwright_page/closed")
+
+    async def _release_context(self, meta) -> None:
+        if self.context_pool is not None:
+            await self.context_pool.done(meta, self)
 
     def _pw_context_name(self) -> str:
         # context name key; handler will reuse per context
@@ -125,16 +274,9 @@ class SiteSpider(CrawlSpider):
         prof = self.profile or "default"
         return f"{dom}:{prof}"
 
-    def _needs_render(self, response: scrapy.http.Response, text: str) -> bool:
-        # Heuristics: short text or SPA markers
-        # if len(text.strip()) < 200:
-        #     return True
-        body = response.text.lower()
-        if "__next_data__" in body or "id=\"__next\"" in body:
-            return True
-        if "data-reactroot" in body or "id=\"root\"" in body:
-            return True
-        return False
+    def _needs_render(self, response: scrapy.http.Response) -> bool:
+        # Heuristics: SPA markers in a bounded prefix (and short tail) of the raw body
+        return has_spa_markers(response.body, self.render_scan_bytes)
 
     def _is_text_response(self, response: scrapy.http.Response) -> bool:
         if not isinstance(response, scrapy.http.TextResponse):
@@ -175,10 +317,32 @@ class SiteSpider(CrawlSpider):
         return await page.evaluate(js)
 
     async def parse_page(self, response: scrapy.http.Response):
-        # page limit
-        if self.page_count >= self.max_pages:
+        # Page lifecycle guard: whatever path _parse_page leaves by (limits,
+        # duplicates, non-text, exceptions), the Playwright page gets closed
+        # and its pooled context released
+        # Budget guard: a response that ends without a saved page (or a handed-on
+        # re-render) gives its reservation back
+        page = response.meta.get("playwright_page")
+        if page is None:
+            try:
+                async for result in self._parse_page(response):
+                    yield result
+            finally:
+                self._settle(response.meta)
+                await self._release_context(response.meta)
             return
 
+        self.crawler.stats.inc_value("playwright_page/opened")
+        try:
+            async for result in self._parse_page(response, page):
+                yield result
+        finally:
+            self._settle(response.meta)
+            await self._close_page(page)
+            # Only now may a retiring context be closed
+            await self._release_context(response.meta)
+
+    async def _parse_page(self, response: scrapy.http.Response, page=None):
         url = response.url
         depth = int(response.meta.get("depth", 0))
         if depth > self.max_depth:
@@ -187,69 +351,69 @@ class SiteSpider(CrawlSpider):
         # canonical/normalize
         canon = normalize_url(url, url) or url
         if canon in self.seen:
+            # Fetched although already visited (e.g. a redirect onto a visited page)
+            self.crawler.stats.inc_value("dupefilter/wasted_fetch")
+            if response.meta.get("playwright"):
+                self.crawler.stats.inc_value("dupefilter/wasted_render")
             return
-        self.seen.add(canon)
 
         # text 형태 데이터만 취급
         if not self._is_text_response(response):
             return
 
-        # Extract main text (readability)
-        title, text = extract_main_text(response.text, url=url)
-
         rendered = bool(response.meta.get("playwright"))
-
-        # If not rendered but looks like SPA, re-request with playwright
-        if (not rendered) and self._needs_render(response, text):
-            yield self._make_request(url=url, depth=depth, force_render=True)
+        # In-browser extraction result (browser_extract=1); None falls back to the HTML
+        extracted = extraction_result(response.meta) if rendered else None
+
+        # Markers are a property of the page, so rendered responses teach the cache too
+        needs_render = extracted["spa"] if extracted else self._needs_render(response)
+        self.render_cache.record(url, needs_render)
+
+        # If not rendered but looks like SPA, re-request with playwright (before extracting).
+        # Not for the HTTP fallback of a failed render, or it would loop.
+        if (not rendered) and needs_render and not response.meta.get("_pw_fallback_tried"):
+            request = self._make_request(url=url, depth=depth, force_render=True)
+            # Same page, so the re-render takes over the reservation
+            request.meta["_budget"] = response.meta.pop("_budget", False)
+            yield request
             return
 
-        # Images from <img>
-        images = []
-        for img in response.css("img"):
-            src = img.attrib.get("src") or ""
-            if not src and img.attrib.get("srcset"):
-                # pick last candidate (often largest)
-                srcset = img.attrib.get("srcset")
-                parts = [p.strip().split(" ")[0] for p in srcset.split(",") if p.strip()]
-                if parts:
-                    src = parts[-1]
-            if not src:
-                continue
-            abs_src = normalize_url(response.url, src, strip_tracking=False)
-            if not abs_src:
-                continue
-            images.append({"type": "img", "src": abs_src, "alt": img.attrib.get("alt")})
-
-        # CSS background-image (static extraction)
-        if self.include_css_bg:
-            css_urls = []
-            # inline style attrs
-            for sel in response.css("*[style]"):
-                st = sel.attrib.get("style")
-                if st:
-                    css_urls.extend(extract_urls_from_css_text(st))
-            # <style> blocks
-            for st in response.css("style::text").getall():
-                css_urls.extend(extract_urls_from_css_text(st))
-            css_urls = unique(css_urls)
-            for u in css_urls:
-                abs_u = normalize_url(response.url, u, strip_tracking=False)
-                if abs_u:
-                    images.append({"type": "css_bg", "src": abs_u, "alt": None})
+        self.seen.add(canon)
+
+        # Extract main text (readability), links and images
+        req_class = request_class(response.meta)
+        if extracted:
+            cpu_start = time.thread_time()
+            title, text = (extracted.get("title") or "").strip(), clean_text(extracted.get("text") or "")
+            links = [normalize_url(url, href) for href in extracted.get("links") or []]
+            # <img>, inline and computed background images, collected in the page
+            images = []
+            for im in extracted.get("images") or []:
+                abs_src = normalize_url(url, im.get("src") or "", strip_tracking=False)
+                if abs_src:
+                    images.append({"type": im.get("type"), "src": abs_src, "alt": im.get("alt")})
+            cpu = time.thread_time() - cpu_start
+            self.crawler.stats.inc_value("browser_extract/pages")
+        else:
+            # One lxml parse in a worker process; no readability if it times out
+            result = await self.page_extractor.extract(response.text, url=url, include_css_bg=self.include_css_bg)
+            title, text, links, images, cpu = (result["title"], result["text"], result["links"],
+                                               result["images"], result["cpu"])
+            if result.get("fallback"):
+                self.crawler.stats.inc_value("extract/fallback")
+        self.crawler.signals.send_catch_log(signal=extract_timed, request_class=req_class, seconds=cpu)
 
         # CSS background-image (computed via Playwright) - only if rendered and include_css_bg
-        if rendered and self.include_css_bg and response.meta.get("playwright_page") is not None:
-            page = response.meta["playwright_page"]
+        if rendered and self.include_css_bg and page is not None:
             try:
                 bg_urls = await self._extract_css_bg_via_playwright(page)
-                for u in bg_urls:
-                    abs_u = normalize_url(response.url, u, strip_tracking=False)
-                    if abs_u:
-                        images.append({"type": "css_bg", "src": abs_u, "alt": None})
             finally:
-                # Important: close page to avoid leaks
-                await page.close()
+                # Done with the browser for this page; free it before link extraction
+                await self._close_page(page)
+            for u in bg_urls:
+                abs_u = normalize_url(response.url, u, strip_tracking=False)
+                if abs_u:
+                    images.append({"type": "css_bg", "src": abs_u, "alt": None})
 
         # Dedup images by src
         seen_img = set()
@@ -263,18 +427,27 @@ class SiteSpider(CrawlSpider):
 
         # Out links (internal)
         out_links = []
-        for href in response.css("a::attr(href)").getall():
-            nu = normalize_url(response.url, href)
+        for nu in links:
             if not nu:
                 continue
-            # same-domain filter (simple)
-            if self.allowed_domains and not any(d in nu for d in self.allowed_domains):
+            if not self._in_scope(nu):
                 continue
             out_links.append(nu)
 
         out_links = list(dict.fromkeys(out_links))
 
-        self.page_count += 1
+        # Near-duplicate check on the extracted text
+        _, duplicate_of = self.dedup.check(canon, text or "")
+        if duplicate_of:
+            self.duplicate_count += 1
+            self.crawler.stats.inc_value("neardup/duplicates")
+            self.logger.info("Near-duplicate: %s ~ %s", canon, duplicate_of)
+            if self.duplicates == "drop":
+                return
+
+        # Reserved when the request was scheduled, so always within max_pages
+        if response.meta.pop("_budget", False):
+            self.budget.commit()
         page_key = sha1(canon)[:16]
 
         item = PageItem(
@@ -290,13 +463,55 @@ class SiteSpider(CrawlSpider):
             depth=depth,
             auth_profile=response.meta.get("auth_profile"),
             page_key=page_key,
+            request_class=req_class,
+            duplicate_of=duplicate_of,
         )
 
         yield item
 
-        # Follow links manually with depth control (CrawlSpider rules also follow, but this allows our depth limit)
-        next_depth = depth + 1
-        if next_depth <= self.max_depth:
-            for u in out_links:
-                if u not in self.seen:
-                    yield self._make_request(url=u, depth=next_depth)
+        if duplicate_of and self.duplicates == "nofollow":
+            return
+        for request in self._follow(out_links, depth + 1):
+            yield request
+
+    def closed(self, reason):
+        extractor = self.page_extractor
+        extractor.shutdown()
+        if extractor.timeouts or extractor.errors:
+            self.crawler.stats.set_value("extract/timeouts", extractor.timeouts)
+            self.crawler.stats.set_value("extract/errors", extractor.errors)
+            self.crawler.stats.set_value("extract/killed", extractor.killed)
+            self.logger.info("본문 추출 시간 초과 %d개, 오류 %d개 (간이 추출로 대체)",
+                             extractor.timeouts, extractor.errors)
+        stats = self.crawler.stats
+        budget = self.budget
+        stats.set_value("budget/committed", budget.committed)
+        stats.set_value("budget/released", budget.released)
+        if reason == "finished" or not budget.path:
+            # A stopped JOBDIR crawl keeps its backlog for the resume
+            budget.drop_backlog()
+        budget.save()
+        if budget.dropped:
+            stats.set_value("budget/unscheduled", budget.dropped)
+            self.logger.info("페이지 예산(%d) 소진으로 요청하지 않은 URL: %d개", budget.limit, budget.dropped)
+        for name, visited in (("seen", self.seen), ("scheduled", self.scheduled)):
+            visited.save()
+            record_visited_stats(stats, name, visited)
+        self.logger.info("방문 URL 집합: %s, 요청 URL 집합: %s",
+                         describe_memory(self.seen), describe_memory(self.scheduled))
+        leaked = (stats.get_value("playwright_page/opened", 0)
+                  - stats.get_value("playwright_page/closed", 0))
+        if leaked > 0:
+            stats.set_value("playwright_page/leaked", leaked)
+            self.logger.warning("닫히지 않은 Playwright 페이지: %d개", leaked)
+        for reason_key, count in playwright_blocking.aborted.items():
+            self.crawler.stats.set_value(f"playwright_blocking/{reason_key}", count)
+        if playwright_blocking.aborted:
+            self.logger.info("차단한 브라우저 요청: %d개 (%s, %s)", sum(playwright_blocking.aborted.values()),
+                             self.block, dict(playwright_blocking.aborted))
+        wasted = stats.get_value("dupefilter/wasted_fetch", 0)
+        if wasted:
+            self.logger.info("이미 방문한 페이지를 다시 받은 요청: %d개 (렌더링 %d개)",
+                             wasted, stats.get_value("dupefilter/wasted_render", 0))
+        if self.duplicate_count:
+            self.logger.info("근접 중복 페이지: %d개 (%s)", self.duplicate_count, self.duplicates)
@@ -0,0 +1,96 @@
+"""Page budget for max_pages, enforced before requests are scheduled.
+
+Every page request holds a reservation from the moment it is
+scheduled until its page is saved (commit) or turns out not to count
+(release: error, non-text, duplicate, dropped by the dupefilter).
+Committed pages plus reservations never exceed the limit, so no page
+past max_pages is ever downloaded or rendered. URLs found while the
+budget is fully reserved wait in a backlog and are scheduled when a
+reservation is released; once the limit is committed the backlog is
+dropped.
+
+With `path` (JOBDIR/budget.json) the counts and the backlog are loaded
+from that file if it exists and written back by save(), alongside the
+visited sets: a resumed crawl keeps the reservations of the requests
+persisted in the scheduler queue, and the backlogged URLs, which the
+"scheduled" set already holds and would never admit again.
+"""
+
+import json
+import os
+from collections import deque
+
+
+class CrawlBudget:
+    def __init__(self, limit: int, path: str | None = None):
+        self.limit = limit
+        self.path = path
+        self.committed = 0
+        self.inflight = 0
+        self.released = 0
+        self.backlog = deque()  # (url, depth) waiting for a free reservation
+        self.dropped = 0        # backlog URLs never scheduled
+        if path and os.path.exists(path):
+            self._load(path)
+
+    @property
+    def exhausted(self) -> bool:
+        return self.committed >= self.limit
+
+    def reserve(self) -> bool:
+        if self.committed + self.inflight >= self.limit:
+            return False
+        self.inflight += 1
+        return True
+
+    def commit(self) -> None:
+        self.inflight -= 1
+        self.committed += 1
+        if self.exhausted:
+            self.drop_backlog()
+
+    def release(self) -> None:
+        self.inflight -= 1
+        self.released += 1
+
+    def defer(self, url: str, depth: int) -> None:
+        if self.exhausted:
+            self.dropped += 1
+        else:
+            self.backlog.append((url, depth))
+
+    def take(self):
+        """Reserve for and return the next backlog (url, depth), or None."""
+        if not self.backlog or not self.reserve():
+            return None
+        return self.backlog.popleft()
+
+    def drop_backlog(self) -> None:
+        self.dropped += len(self.backlog)
+        self.backlog.clear()
+
+    def save(self, path: str | None = None) -> None:
+        path = path or self.path
+        if not path:
+            return
+        state = {
+            "committed": self.committed,
+            "inflight": self.inflight,
+            "released": self.released,
+            "dropped": self.dropped,
+            "backlog": list(self.backlog),
+        }
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp, path)
+
+    def _load(self, path: str) -> None:
+        # The limit comes from the current run; max_pages may have been raised
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        self.committed = state["committed"]
+        self.inflight = state["inflight"]
+        self.released = state["released"]
+        self.dropped = state["dropped"]
+        self.backlog = deque((url, depth) for url, depth in state["backlog"])
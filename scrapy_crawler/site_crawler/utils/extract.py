@@ -0,0 +1,141 @@
+"""Per-page extraction from a single parse.
+
+extract_page() parses the HTML once with lxml; links and images are
+read from that tree, then the same tree goes to readability for the
+main text. PageExtractor runs it in a process pool so the reactor
+thread only ships the HTML out and gets plain lists back.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+
+from site_crawler.utils.cssbg import extract_urls_from_css_text, unique
+from site_crawler.utils.text import parse_html, extract_main_text, cheap_extract
+from site_crawler.utils.urlnorm import normalize_url
+
+
+def collect_links(root, base_url: str) -> list[str]:
+    links = (normalize_url(base_url, a.get("href")) for a in root.iter("a") if a.get("href"))
+    return list(dict.fromkeys(u for u in links if u))
+
+
+def collect_images(root, base_url: str, include_css_bg: bool = True) -> list[dict]:
+    images = []
+    for img in root.iter("img"):
+        src = img.get("src") or ""
+        if not src and img.get("srcset"):
+            # pick last candidate (often largest)
+            parts = [p.strip().split(" ")[0] for p in img.get("srcset").split(",") if p.strip()]
+            if parts:
+                src = parts[-1]
+        abs_src = normalize_url(base_url, src, strip_tracking=False)
+        if abs_src:
+            images.append({"type": "img", "src": abs_src, "alt": img.get("alt")})
+
+    if include_css_bg:
+        css_urls = []
+        # inline style attrs, then <style> blocks
+        for el in root.iterfind(".//*[@style]"):
+            css_urls.extend(extract_urls_from_css_text(el.get("style")))
+        for style in root.iter("style"):
+            css_urls.extend(extract_urls_from_css_text(style.text or ""))
+        for u in unique(css_urls):
+            abs_u = normalize_url(base_url, u, strip_tracking=False)
+            if abs_u:
+                images.append({"type": "css_bg", "src": abs_u, "alt": None})
+    return images
+
+
+def extract_page(html: str, url: str, include_css_bg: bool = True, readability: bool = True) -> dict:
+    """Title, text, links and images of a page; readability=False uses cheap_extract."""
+    start = time.thread_time()
+    root = parse_html(html)
+    if root is None:
+        return {"title": "", "text": "", "links": [], "images": [], "cpu": time.thread_time() - start}
+
+    # Links and images first: readability drops hidden elements from the tree
+    links = collect_links(root, url)
+    images = collect_images(root, url, include_css_bg)
+    title, text = extract_main_text(root, url=url) if readability else cheap_extract(root)
+    return {"title": title, "text": text, "links": links, "images": images,
+            "cpu": time.thread_time() - start}
+
+
+class PageExtractor:
+    """Runs extract_page in a process pool, off the reactor thread.
+
+    A page that takes longer than `timeout` seconds (queueing included)
+    or fails is extracted without readability instead ("fallback" set
+    in the result). Timed-out jobs keep their worker busy, so once
+    every worker is stuck the pool is replaced and its processes are
+    killed. Workers are spawned rather than forked from the reactor's
+    threads. workers=0 extracts inline.
+    """
+
+    def __init__(self, workers: int = 2, timeout: float = 10.0):
+        self.workers = workers
+        self.timeout = timeout
+        self.timeouts = 0
+        self.errors = 0
+        self.killed = 0  # worker processes killed while stuck
+        self._stuck = []
+        self._pool = self._new_pool() if workers > 0 else None
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=get_context("spawn"))
+
+    async def extract(self, html: str, *, url: str, include_css_bg: bool = True) -> dict:
+        if self._pool is None:
+            return extract_page(html, url, include_css_bg)
+
+        pool = self._pool
+        future = None
+        try:
+            future = pool.submit(extract_page, html, url, include_css_bg)
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            if not future.cancel():
+                self._note_stuck(future)
+        except asyncio.CancelledError:
+            # Queued in a pool that was replaced meanwhile
+            if future is None or not future.cancelled():
+                raise
+            self.errors += 1
+        except BrokenProcessPool:
+            self.errors += 1
+            if pool is self._pool:
+                self._replace_pool()
+        except Exception:
+            self.errors += 1
+        result = extract_page(html, url, include_css_bg, readability=False)
+        result["fallback"] = True
+        return result
+
+    def _note_stuck(self, future) -> None:
+        self._stuck = [f for f in self._stuck if not f.done()] + [future]
+        if len(self._stuck) >= self.workers:
+            self._replace_pool()
+
+    def _replace_pool(self) -> None:
+        old = self._pool
+        self._pool = self._new_pool()
+        self._stuck = []
+        self._kill(old)
+
+    def _kill(self, pool) -> None:
+        # shutdown() alone leaves a hung readability worker running for good
+        processes = list((getattr(pool, "_processes", None) or {}).values())
+        pool.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            if process.is_alive():
+                process.kill()
+                self.killed += 1
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._kill(self._pool)
+            self._pool = None
@@ -0,0 +1,129 @@
+"""Readability-style extraction inside the rendered page.
+
+Runs as a scrapy-playwright PageMethod, so Chromium's DOM (already
+built and laid out) does the work and only the title, text, links and
+image URLs travel back. Afterwards the document is replaced by a stub,
+which keeps the HTML that page.content() serializes for the response
+small. Any failure returns None and the spider falls back to
+extracting from the response HTML.
+"""
+
+from scrapy_playwright.page import PageMethod
+
+EXTRACT_JS = r"""
+(opts) => {
+  const SPA_RE = /__next_data__|id=["']?__next["'\s>]|data-reactroot|id=["']?root["'\s>]/i;
+  const html = document.documentElement.outerHTML;
+  const spa = SPA_RE.test(html.slice(0, opts.scanChars)) || SPA_RE.test(html.slice(-8192));
+
+  // Title: readability-like short title
+  let title = (document.title || '').trim();
+  const h1 = document.querySelector('h1');
+  const h1Text = h1 ? h1.innerText.trim() : '';
+  if (h1Text && title.includes(h1Text)) {
+    title = h1Text;
+  } else {
+    const parts = title.split(/\s+[|\-–—:»]+\s+/);
+    if (parts.length > 1 && parts[0].split(/\s+/).length >= 2) title = parts[0].trim();
+  }
+
+  // Links and images (raw attribute values, resolved on the Python side)
+  const links = Array.from(document.querySelectorAll('a[href]'), a => a.getAttribute('href'));
+  const images = [];
+  for (const img of document.querySelectorAll('img')) {
+    let src = img.getAttribute('src') || '';
+    const srcset = img.getAttribute('srcset');
+    if (!src && srcset) {
+      const cands = srcset.split(',').map(p => p.trim().split(' ')[0]).filter(Boolean);
+      if (cands.length) src = cands[cands.length - 1];
+    }
+    if (src) images.push({type: 'img', src, alt: img.getAttribute('alt')});
+  }
+  if (opts.cssBg) {
+    const rx = /url\((['"]?)(.*?)\1\)/gi;
+    const addBg = (bg) => {
+      if (!bg || bg === 'none') return;
+      let m;
+      while ((m = rx.exec(bg)) !== null) {
+        const u = (m[2] || '').trim();
+        if (u && !u.startsWith('data:')) images.push({type: 'css_bg', src: u, alt: null});
+      }
+    };
+    for (const el of document.querySelectorAll('[style]')) addBg(el.style.backgroundImage);
+    const scored = Array.from(document.querySelectorAll('div,section,a,span,main,header'), el => {
+      const r = el.getBoundingClientRect();
+      return {el, area: Math.max(0, r.width) * Math.max(0, r.height)};
+    }).filter(x => x.area > 2500);
+    scored.sort((a, b) => b.area - a.area);
+    for (const x of scored.slice(0, 400)) addBg(getComputedStyle(x.el).backgroundImage);
+  }
+
+  // Main content: score blocks by text length / commas, propagate to ancestors
+  document.querySelectorAll('script,style,noscript,template,nav,footer,aside,form,iframe,svg')
+    .forEach(e => e.remove());
+  const UNLIKELY = /comment|sidebar|menu|nav|footer|banner|breadcrumb|share|social|cookie|popup|sponsor|advert|related/i;
+  const LIKELY = /article|content|main|post|entry|text|doc|body/i;
+  const base = (el) => {
+    let s = {ARTICLE: 10, MAIN: 10, DIV: 5, SECTION: 3, PRE: 3, TD: 3, BLOCKQUOTE: 3,
+             UL: -3, OL: -3, FORM: -3, TH: -5, HEADER: -5}[el.tagName] || 0;
+    const cls = (el.className && el.className.baseVal === undefined ? el.className : '') + ' ' + el.id;
+    if (UNLIKELY.test(cls) && !LIKELY.test(cls)) s -= 25;
+    if (LIKELY.test(cls)) s += 25;
+    return s;
+  };
+  const scores = new Map();
+  for (const p of document.querySelectorAll('p,pre,td,li,blockquote,dd,dl')) {
+    const t = p.innerText.trim();
+    if (t.length < 25) continue;
+    const s = 1 + t.split(/[,，、]/).length + Math.min(3, Math.floor(t.length / 100));
+    let node = p.parentElement, level = 0;
+    while (node && node !== document.documentElement && level < 3) {
+      if (!scores.has(node)) scores.set(node, base(node));
+      scores.set(node, scores.get(node) + s / (level === 0 ? 1 : level === 1 ? 2 : level * 3));
+      node = node.parentElement;
+      level++;
+    }
+  }
+  let best = null, bestScore = -Infinity;
+  for (const [el, raw] of scores) {
+    const len = el.innerText.length || 1;
+    let linkLen = 0;
+    for (const a of el.querySelectorAll('a')) linkLen += a.innerText.length;
+    const score = raw * (1 - Math.min(1, linkLen / len));
+    scores.set(el, score);
+    if (score > bestScore) { best = el; bestScore = score; }
+  }
+  let blocks = [best || document.body];
+  if (best && best.parentElement) {
+    const threshold = Math.max(10, bestScore * 0.2);
+    blocks = Array.from(best.parentElement.children)
+      .filter(el => el === best || (scores.get(el) || 0) >= threshold);
+  }
+  const text = blocks.map(el => el.innerText).join('\n\n');
+
+  if (opts.stub) {
+    document.documentElement.innerHTML = '<head><title></title></head><body></body>';
+    document.title = title;
+  }
+  return {title, text, links, images, spa};
+}
+"""
+
+
+async def _extract_in_page(page, include_css_bg: bool, scan_chars: int, stub: bool):
+    try:
+        return await page.evaluate(EXTRACT_JS, {"cssBg": include_css_bg, "scanChars": scan_chars, "stub": stub})
+    except Exception:
+        return None
+
+
+def extraction_page_method(include_css_bg: bool, scan_chars: int = 65536, stub: bool = True) -> PageMethod:
+    return PageMethod(_extract_in_page, include_css_bg, scan_chars, stub)
+
+
+def extraction_result(meta) -> dict | None:
+    for pm in meta.get("playwright_page_methods") or ():
+        if getattr(pm, "method", None) is _extract_in_page:
+            result = getattr(pm, "result", None)
+            return result if isinstance(result, dict) else None
+    return None
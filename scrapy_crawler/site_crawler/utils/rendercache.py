@@ -0,0 +1,95 @@
+"""Learned render decisions per host and URL path template.
+
+After a few pages of the same shape (e.g. /docs/*.html on one host)
+have been seen, URLs matching that template are sent straight to the
+path they need instead of being fetched over HTTP first and then
+re-rendered.
+"""
+
+import os
+import re
+from collections import Counter
+from urllib.parse import urlsplit
+
+# SPA markers looked for in the page body
+SPA_MARKER_RE = re.compile(
+    rb'__next_data__|id=["\']?__next["\'\s>]|data-reactroot|id=["\']?root["\'\s>]',
+    re.IGNORECASE,
+)
+
+_NUM_RE = re.compile(r"\d+")
+_ID_RE = re.compile(r"^[0-9a-f]{8,}$|^[0-9a-f]{8}-[0-9a-f]{4}-", re.IGNORECASE)
+
+
+def has_spa_markers(body: bytes, scan_bytes: int = 65536) -> bool:
+    """Look for SPA markers in the first `scan_bytes` of `body`.
+
+    The last 8KB are checked too, since frameworks such as Next.js put
+    their data script at the end of <body>. No copy of the full body
+    is made.
+    """
+    if SPA_MARKER_RE.search(body, 0, scan_bytes):
+        return True
+    tail = max(scan_bytes, len(body) - 8192)
+    return tail < len(body) and SPA_MARKER_RE.search(body, tail) is not None
+
+
+def _segment(seg: str) -> str:
+    if _ID_RE.match(seg):
+        return "{id}"
+    return _NUM_RE.sub("{n}", seg)
+
+
+def path_template(url: str) -> tuple[str, str]:
+    """Return (host, template) for a URL.
+
+    Directories keep their names (digits and ids replaced), the file
+    name collapses to '*' plus its extension:
+    /docs/v2/guide/intro.html -> /docs/v{n}/guide/*.html
+    """
+    parts = urlsplit(url)
+    segments = parts.path.split("/")
+    dirs = [_segment(seg) for seg in segments[:-1]]
+    ext = os.path.splitext(segments[-1])[1]
+    return parts.netloc.lower(), "/".join(dirs) + "/*" + ext
+
+
+class RenderDecisionCache:
+    """Counts render / no-render observations per template and host.
+
+    decide() answers once `min_samples` observations agree at least
+    `agreement` of the time. A template with enough observations
+    decides on its own; otherwise the host as a whole is used.
+    None means "not learned yet" (or mixed).
+    """
+
+    def __init__(self, min_samples: int = 3, agreement: float = 0.8):
+        self.min_samples = min_samples
+        self.agreement = agreement
+        self._templates = {}  # (host, template) -> Counter
+        self._hosts = {}      # host -> Counter
+
+    def record(self, url: str, needs_render: bool) -> None:
+        host, template = path_template(url)
+        self._templates.setdefault((host, template), Counter())[needs_render] += 1
+        self._hosts.setdefault(host, Counter())[needs_render] += 1
+
+    def _verdict(self, counts: Counter | None) -> bool | None:
+        if not counts:
+            return None
+        total = counts[True] + counts[False]
+        if total < self.min_samples:
+            return None
+        if counts[True] >= total * self.agreement:
+            return True
+        if counts[False] >= total * self.agreement:
+            return False
+        return None
+
+    def decide(self, url: str) -> bool | None:
+        host, template = path_template(url)
+        counts = self._templates.get((host, template))
+        if counts and counts[True] + counts[False] >= self.min_samples:
+            # Enough data for this template; mixed results stay undecided
+            return self._verdict(counts)
+        return self._verdict(self._hosts.get(host))
@@ -0,0 +1,125 @@
+"""Near-duplicate page detection (64-bit SimHash with an LSH band index).
+
+Same algorithm as simple_crawler/utils/dedup_utils.py; keep the two in
+step so both crawlers give a page the same fingerprint.
+"""
+
+import hashlib
+import re
+import zlib
+from collections import Counter
+
+TOKEN_RE = re.compile(r"\w+")
+
+# Duplicate handling policies
+DUPLICATE_POLICIES = ("keep", "nofollow", "drop")
+
+# Shingles hashed into one fingerprint; longer texts use a sample
+MAX_FEATURES = 4096
+
+
+def _sample_starts(tokens: list[str], positions: int, max_features: int) -> list[int]:
+    """Start positions of the shingles that begin with an anchor word.
+
+    Anchors are the words with the smallest crc32, taken until they
+    start about `max_features` shingles. The choice depends only on the
+    vocabulary, so near-duplicate pages sample (almost) the same
+    shingles.
+    """
+    counts = Counter(tokens[:positions])
+    anchors = set()
+    taken = 0
+    for token in sorted(counts, key=lambda t: zlib.crc32(t.encode("utf-8"))):
+        if taken >= max_features:
+            break
+        if taken + counts[token] > 2 * max_features:
+            continue  # a very common word would swamp the sample
+        anchors.add(token)
+        taken += counts[token]
+    return [i for i in range(positions) if tokens[i] in anchors]
+
+
+def simhash(text: str, shingle: int = 3, min_tokens: int = 30, max_features: int | None = MAX_FEATURES) -> int | None:
+    """Return the 64-bit SimHash of `text` over word shingles.
+
+    Texts shorter than `min_tokens` words give None (too little
+    content to compare reliably). Texts with more than `max_features`
+    shingles are fingerprinted from a sample of them (_sample_starts),
+    so the cost per page stays bounded.
+    """
+    tokens = TOKEN_RE.findall(text.lower())
+    if len(tokens) < min_tokens:
+        return None
+
+    positions = len(tokens) - shingle + 1
+    if max_features and positions > max_features:
+        starts = _sample_starts(tokens, positions, max_features)
+    else:
+        starts = range(positions)
+    features = Counter(" ".join(tokens[i:i + shingle]) for i in starts)
+    hashed = [(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), count)
+              for feature, count in features.items()]
+
+    # A bit's weight is (count with the bit set) - (count without), so it is
+    # positive when set in more than half of the weighted hashes. Count set
+    # bits per byte position from byte histograms instead of looping over
+    # the 64 bits of every hash.
+    digests = b"".join(digest * count for digest, count in hashed)
+    total = len(digests) // 8
+    fingerprint = 0
+    for pos in range(8):
+        histogram = Counter(digests[pos::8])
+        shift = 8 * (7 - pos)  # big-endian digest: byte 0 holds the top bits
+        for bit in range(8):
+            ones = sum(n for value, n in histogram.items() if value >> bit & 1)
+            if 2 * ones > total:
+                fingerprint |= 1 << (shift + bit)
+    return fingerprint
+
+
+class NearDuplicateIndex:
+    """LSH index of SimHash fingerprints.
+
+    Fingerprints are split into `max_distance + 1` bands; two
+    fingerprints within `max_distance` bits share at least one band
+    exactly, so only pages in the same band buckets are compared.
+    """
+
+    def __init__(self, max_distance: int = 3, min_tokens: int = 30):
+        self.max_distance = max_distance
+        self.min_tokens = min_tokens
+        bands = max_distance + 1
+        width = 64 // bands
+        self._bands = [(i * width, 64 - i * width if i == bands - 1 else width) for i in range(bands)]
+        self._buckets = {}
+
+    def _keys(self, fingerprint: int):
+        for idx, (shift, width) in enumerate(self._bands):
+            yield idx, (fingerprint >> shift) & ((1 << width) - 1)
+
+    def find(self, fingerprint: int) -> str | None:
+        """Return the URL of an indexed near-duplicate, or None."""
+        for key in self._keys(fingerprint):
+            for other, url in self._buckets.get(key, ()):
+                if (fingerprint ^ other).bit_count() <= self.max_distance:
+                    return url
+        return None
+
+    def add(self, url: str, fingerprint: int) -> None:
+        for key in self._keys(fingerprint):
+            self._buckets.setdefault(key, []).append((fingerprint, url))
+
+    def check(self, url: str, text: str) -> tuple[int | None, str | None]:
+        """Fingerprint `text` and look it up.
+
+        Returns (fingerprint, duplicate_of). Pages that are not
+        duplicates are added to the index.
+        """
+        fingerprint = simhash(text, min_tokens=self.min_tokens)
+        if fingerprint is None:
+            return None, None
+
+        duplicate_of = self.find(fingerprint)
+        if duplicate_of is None:
+            self.add(url, fingerprint)
+        return fingerprint, duplicate_of
@@ -1,28 +1,122 @@
 import re
+
+import lxml.html
+from lxml.cssselect import CSSSelector
 from readability import Document
+from readability.htmls import TITLE_CSS_HEURISTICS, add_match, norm_title
 
 WS_RE = re.compile(r"[\t\r\f\v ]+")
 NL_RE = re.compile(r"\n{3,}")
 
+NOISE_TAGS = ("script", "style", "noscript", "template", "nav", "header", "footer", "aside", "form")
+BLOCK_TAGS = ("p", "div", "section", "article", "li", "pre", "table", "tr", "br",
+              "h1", "h2", "h3", "h4", "h5", "h6", "dd", "dt", "blockquote")
+
+
+UTF8_PARSER = lxml.html.HTMLParser(encoding="utf-8")
+
+# readability's shorten_title compiles these selectors on every call
+TITLE_CANDIDATES = CSSSelector(", ".join(["h1", "h2", "h3", *TITLE_CSS_HEURISTICS]))
+CJK_RE = re.compile("[\u4e00-\u9fff]+")
+
+
+def parse_html(html: str):
+    """Parse a page into an lxml tree (None for empty / unparsable input)."""
+    try:
+        # Bytes, so pages with an XML encoding declaration parse too
+        return lxml.html.document_fromstring(html.encode("utf-8", "replace"), parser=UTF8_PARSER)
+    except (ValueError, lxml.etree.ParserError):
+        return None
 
-def extract_main_text(html: str, *, url: str = "") -> tuple[str, str]:
-    """Return (title, text) from HTML.
 
-    readability-lxml is used for main-content extraction.
+def dom_text(el) -> str:
+    """Text of an element with line breaks after block elements.
+
+    Modifies tails in place, so only use it on trees that are done with.
     """
-    doc = Document(html)
-    title = (doc.short_title() or "").strip()
-    summary_html = doc.summary(html_partial=True)
+    for block in el.iter(*BLOCK_TAGS):
+        block.tail = "\n" + (block.tail or "")
+    return clean_text(el.text_content().replace("\xa0", " "))
+
+
+def _long_enough(part: str) -> bool:
+    return len(part.split()) >= 4 or (len(part) >= 4 and CJK_RE.search(part) is not None)
 
-    # crude text extraction
-    # (If you want more robust: use lxml.html to text_content)
-    text = re.sub(r"<[^>]+>", "\n", summary_html)
-    text = text.replace("&nbsp;", " ")
-    text = re.sub(r"&[a-zA-Z]+;", " ", text)
 
+def short_title(root) -> str:
+    """readability's shorten_title, with the candidate selector compiled once.
+
+    Prefers a heading that matches the <title>; otherwise strips site
+    names around " | ", " - ", ": " etc.
+    """
+    title_el = root.find(".//title")
+    if title_el is None or not title_el.text:
+        return ""
+    title = orig = norm_title(title_el.text)
+
+    candidates = set()
+    for e in TITLE_CANDIDATES(root):
+        if e.text:
+            add_match(candidates, e.text, orig)
+        if e.text_content():
+            add_match(candidates, e.text_content(), orig)
+
+    if candidates:
+        title = sorted(candidates, key=len)[-1]
+    else:
+        for delimiter in (" | ", " - ", " :: ", " / "):
+            if delimiter in title:
+                parts = orig.split(delimiter)
+                if _long_enough(parts[0]):
+                    title = parts[0]
+                    break
+                if _long_enough(parts[-1]):
+                    title = parts[-1]
+                    break
+        else:
+            if ": " in title:
+                last = orig.split(": ")[-1]
+                title = last if _long_enough(last) else orig.split(": ", 1)[1]
+
+    if CJK_RE.search(title):
+        return title if 4 <= len(title) < 100 else orig
+    return title if 15 < len(title) < 150 else orig
+
+
+def extract_main_text(html, *, url: str = "") -> tuple[str, str]:
+    """Return (title, text) from HTML (a string or a parsed lxml tree).
+
+    readability-lxml is used for main-content extraction; it copies the
+    tree (dropping hidden elements from it first), so collect anything
+    else from a shared tree before calling this.
+    """
+    root = parse_html(html) if isinstance(html, str) else html
+    if root is None:
+        return "", ""
+    title = short_title(root).strip()
+    summary_html = Document(root).summary(html_partial=True)
+    try:
+        article = lxml.html.fromstring(summary_html)
+    except (ValueError, lxml.etree.ParserError):
+        return title, ""
+    return title, dom_text(article)
+
+
+def clean_text(text: str) -> str:
+    """Collapse runs of spaces and blank lines."""
     text = text.strip()
     text = WS_RE.sub(" ", text)
     text = text.replace(" \n", "\n")
-    text = NL_RE.sub("\n\n", text)
+    return NL_RE.sub("\n\n", text)
+
 
-    return title, text
+def cheap_extract(html) -> tuple[str, str]:
+    """Fast fallback: <title> and the body text minus navigation / scripts."""
+    root = parse_html(html) if isinstance(html, str) else html
+    if root is None:
+        return "", ""
+    title = (root.findtext(".//title") or "").strip()
+    for el in list(root.iter(*NOISE_TAGS)):
+        el.drop_tree()
+    body = root.find(".//body")
+    return title, dom_text(body if body is not None else root)
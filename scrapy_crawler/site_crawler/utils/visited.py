@@ -0,0 +1,272 @@
+"""Memory-compact visited-URL sets.
+
+Both keep 64-bit / 128-bit hashes of the URL instead of the string,
+so a tracked URL costs a few bytes rather than the ~100+ of a str in a
+Python set:
+
+  exact  FingerprintSet: 64-bit fingerprints in an open-addressing
+         array('Q') table (12-23 bytes per URL). Two URLs share a
+         fingerprint with probability ~n^2 / 2^65, negligible for
+         millions of pages.
+  bloom  BloomFilter: scalable Bloom filter with an overall
+         false-positive rate of `fp_rate` (~2 bytes per URL at 0.1%).
+         A false positive makes a new URL look visited, so it is
+         skipped.
+
+With `path`, the set is loaded from that file if it exists and
+written back by save(). Both are safe to share between threads.
+
+Same implementation and file format as
+simple_crawler/utils/visited_utils.py.
+"""
+
+import hashlib
+import math
+import os
+import struct
+import threading
+from array import array
+
+VISITED_MODES = ("exact", "bloom")
+
+
+def fingerprint64(key: str | bytes) -> int:
+    """Non-zero 64-bit fingerprint of `key` (0 marks an empty slot)."""
+    if isinstance(key, str):
+        key = key.encode("utf-8", errors="surrogatepass")
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little") or 1
+
+
+def _write_atomic(path: str, chunks) -> None:
+    tmp = path + ".tmp"
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(tmp, "wb") as f:
+        for chunk in chunks:
+            f.write(chunk)
+    os.replace(tmp, path)
+
+
+class FingerprintSet:
+    """Exact visited set of 64-bit fingerprints (linear probing)."""
+
+    MAGIC = b"VSX1"
+    MAX_LOAD = 0.7
+
+    def __init__(self, capacity: int = 1024, path: str | None = None):
+        self.path = path
+        self._count = 0
+        self._lock = threading.Lock()
+        self._allocate(1 << max(10, (math.ceil(capacity / self.MAX_LOAD) - 1).bit_length()))
+        if path and os.path.exists(path):
+            self._load(path)
+
+    def _allocate(self, size: int) -> None:
+        # `size` slots, a power of two
+        self._table = array("Q", bytes(8 * size))
+        self._mask = size - 1
+        self._limit = int(size * self.MAX_LOAD)
+
+    def _insert(self, fp: int) -> bool:
+        table, mask = self._table, self._mask
+        i = fp & mask
+        while True:
+            slot = table[i]
+            if slot == 0:
+                table[i] = fp
+                self._count += 1
+                return True
+            if slot == fp:
+                return False
+            i = (i + 1) & mask
+
+    def _grow(self) -> None:
+        old = self._table
+        self._count = 0
+        self._allocate(2 * len(old))
+        for fp in old:
+            if fp:
+                self._insert(fp)
+
+    def add(self, key: str | bytes) -> bool:
+        """Add `key`; returns False if it was already in the set."""
+        fp = fingerprint64(key)
+        with self._lock:
+            if self._count >= self._limit:
+                self._grow()
+            return self._insert(fp)
+
+    def __contains__(self, key: str | bytes) -> bool:
+        fp = fingerprint64(key)
+        # _grow swaps table and mask; read them as a pair
+        with self._lock:
+            table, mask = self._table, self._mask
+        i = fp & mask
+        while True:
+            slot = table[i]
+            if slot == 0:
+                return False
+            if slot == fp:
+                return True
+            i = (i + 1) & mask
+
+    def __len__(self) -> int:
+        return self._count
+
+    def memory_bytes(self) -> int:
+        return len(self._table) * self._table.itemsize
+
+    def bytes_per_url(self) -> float:
+        return self.memory_bytes() / max(1, self._count)
+
+    def save(self, path: str | None = None) -> None:
+        path = path or self.path
+        if path:
+            with self._lock:
+                header = self.MAGIC + struct.pack("<QQ", self._count, len(self._table))
+                table = self._table.tobytes()
+            _write_atomic(path, (header, table))
+
+    def _load(self, path: str) -> None:
+        with open(path, "rb") as f:
+            if f.read(4) != self.MAGIC:
+                raise ValueError(f"{path} is not an exact visited-set file")
+            count, size = struct.unpack("<QQ", f.read(16))
+            table = array("Q")
+            table.frombytes(f.read(8 * size))
+        self._table = table
+        self._mask = size - 1
+        self._limit = int(size * self.MAX_LOAD)
+        self._count = count
+
+
+class _BloomSlice:
+    def __init__(self, capacity: int, fp_rate: float):
+        self.capacity = capacity
+        self.bits = max(64, math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.bits / capacity * math.log(2)))
+        self.array = bytearray((self.bits + 7) // 8)
+        self.count = 0
+
+    def __contains__(self, hashes) -> bool:
+        bits, array_ = self.bits, self.array
+        p, step = hashes[0] % bits, hashes[1] % bits
+        for _ in range(self.hashes):
+            if not array_[p >> 3] & (1 << (p & 7)):
+                return False
+            p += step
+            if p >= bits:
+                p -= bits
+        return True
+
+    def add(self, hashes) -> None:
+        bits, array_ = self.bits, self.array
+        p, step = hashes[0] % bits, hashes[1] % bits
+        for _ in range(self.hashes):
+            array_[p >> 3] |= 1 << (p & 7)
+            p += step
+            if p >= bits:
+                p -= bits
+        self.count += 1
+
+
+class BloomFilter:
+    """Probabilistic visited set with an overall false-positive rate of `fp_rate`.
+
+    Scalable: when a slice holds `capacity` URLs a new one twice as
+    large with half the error rate is added, so the total rate stays
+    below `fp_rate` however many URLs the crawl finds.
+    """
+
+    MAGIC = b"VSB1"
+
+    def __init__(self, capacity: int = 1_000_000, fp_rate: float = 0.001, path: str | None = None):
+        if not 0 < fp_rate < 1:
+            raise ValueError("fp_rate must be between 0 and 1")
+        self.capacity = max(1, capacity)
+        self.fp_rate = fp_rate
+        self.path = path
+        self._slices = []
+        self._count = 0
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            self._load(path)
+
+    @staticmethod
+    def _hashes(key: str | bytes) -> tuple[int, int]:
+        if isinstance(key, str):
+            key = key.encode("utf-8", errors="surrogatepass")
+        digest = hashlib.blake2b(key, digest_size=16).digest()
+        return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+
+    def _new_slice(self) -> _BloomSlice:
+        n = len(self._slices)
+        # Error rates fp/2, fp/4, ... sum to at most fp
+        return _BloomSlice(self.capacity << n, self.fp_rate / (2 << n))
+
+    def add(self, key: str | bytes) -> bool:
+        """Add `key`; returns False if it was (or looks) already in the set."""
+        hashes = self._hashes(key)
+        with self._lock:
+            if any(hashes in s for s in self._slices):
+                return False
+            if not self._slices or self._slices[-1].count >= self._slices[-1].capacity:
+                self._slices.append(self._new_slice())
+            self._slices[-1].add(hashes)
+            self._count += 1
+            return True
+
+    def __contains__(self, key: str | bytes) -> bool:
+        hashes = self._hashes(key)
+        return any(hashes in s for s in self._slices)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def memory_bytes(self) -> int:
+        return sum(len(s.array) for s in self._slices)
+
+    def bytes_per_url(self) -> float:
+        return self.memory_bytes() / max(1, self._count)
+
+    def save(self, path: str | None = None) -> None:
+        path = path or self.path
+        if not path:
+            return
+        with self._lock:
+            chunks = [self.MAGIC, struct.pack("<QdQI", self.capacity, self.fp_rate, self._count, len(self._slices))]
+            for s in self._slices:
+                chunks.append(struct.pack("<QQ", s.count, len(s.array)))
+                chunks.append(bytes(s.array))
+        _write_atomic(path, chunks)
+
+    def _load(self, path: str) -> None:
+        with open(path, "rb") as f:
+            if f.read(4) != self.MAGIC:
+                raise ValueError(f"{path} is not a Bloom visited-set file")
+            # The file's parameters win, so the slices line up with the saved bits
+            self.capacity, self.fp_rate, self._count, n = struct.unpack("<QdQI", f.read(28))
+            for _ in range(n):
+                s = self._new_slice()
+                s.count, size = struct.unpack("<QQ", f.read(16))
+                s.array = bytearray(f.read(size))
+                self._slices.append(s)
+
+
+def open_visited(mode: str = "exact", path: str | None = None, capacity: int = 1_000_000,
+                 fp_rate: float = 0.001):
+    """Return an empty (or loaded from `path`) visited set of the given mode.
+
+    `capacity` is the expected URL count for the Bloom filter; the
+    exact set grows on its own.
+    """
+    if mode == "exact":
+        return FingerprintSet(capacity=1024, path=path)
+    if mode == "bloom":
+        return BloomFilter(capacity=capacity, fp_rate=fp_rate, path=path)
+    raise ValueError(f"visited mode must be one of {VISITED_MODES}")
+
+
+def describe_memory(visited) -> str:
+    """One-line memory summary, e.g. '12,345개 URL, 256 KiB (21.2 B/URL)'."""
+    return (f"{len(visited):,}개 URL, {visited.memory_bytes() // 1024:,} KiB "
+            f"({visited.bytes_per_url():.1f} B/URL)")
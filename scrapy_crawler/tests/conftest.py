@@ -0,0 +1,36 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# The project imports its modules from the scrapy_crawler directory (site_crawler.*)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scrapy.http import HtmlResponse, Request
+from scrapy.utils.test import get_crawler
+
+from site_crawler.spiders.site_spider import SiteSpider
+
+
+@pytest.fixture
+def make_spider():
+    """SiteSpider built by from_crawler, extracting inline (no worker processes)."""
+    def make(settings=None, **kwargs):
+        crawler = get_crawler(SiteSpider, {"EXTRACT_WORKERS": 0, **(settings or {})})
+        kwargs.setdefault("seed", "http://example.com/")
+        kwargs.setdefault("allowed_domains", "example.com")
+        kwargs.setdefault("render", 0)
+        spider = SiteSpider.from_crawler(crawler, **kwargs)
+        crawler.spider = spider
+        return spider
+    return make
+
+
+@pytest.fixture
+def html_response():
+    """HtmlResponse for `url` whose request carries `meta` (depth 0 by default)."""
+    def make(url: str, body: str, meta=None) -> HtmlResponse:
+        request = Request(url, meta={"depth": 0, **(meta or {})})
+        return HtmlResponse(url, body=body.encode("utf-8"), encoding="utf-8",
+                            headers={"Content-Type": "text/html; charset=utf-8"}, request=request)
+    return make
@@ -0,0 +1,50 @@
+import asyncio
+
+
+class FakeContext:
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+        self.closed = False
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+    async def evaluate(self, js):
+        assert not self.context.closed, "page used after its context was closed"
+        return []
+
+
+def test_retiring_context_closes_after_the_callback(make_spider, html_response):
+    spider = make_spider(settings={"PLAYWRIGHT_CONTEXT_RECYCLE_PAGES": 1}, render=1)
+    pool = spider.context_pool
+    name = pool.acquire()  # recycle_after=1: this context retires with its first page
+    context = FakeContext()
+    pool.contexts[name] = {context}
+    page = FakePage(context)
+    response = html_response("http://example.com/", "<html><body><p>Hello</p></body></html>",
+                             meta={"playwright": True, "playwright_page": page, "_pool_context": name})
+
+    async def run():
+        results = spider.parse_page(response)
+        first = await results.__anext__()
+        # The callback is still running: the context must stay open
+        assert not context.closed
+        rest = [result async for result in results]
+        return [first, *rest]
+
+    results = asyncio.run(run())
+    assert results[0]["url"] == "http://example.com/"
+    assert page.closed and context.closed
+    assert name not in pool.inflight
+    assert spider.crawler.stats.get_value("playwright_pool/recycled") == 1
@@ -0,0 +1,38 @@
+import asyncio
+import time
+
+from site_crawler.utils.extract import PageExtractor
+
+
+def test_stuck_workers_are_killed_when_the_pool_is_replaced():
+    extractor = PageExtractor(workers=1, timeout=5)
+    try:
+        old = extractor._pool
+        old.submit(time.sleep, 3600)
+        time.sleep(0.5)
+        processes = list(old._processes.values())
+        assert processes and all(p.is_alive() for p in processes)
+
+        extractor._replace_pool()
+        for process in processes:
+            process.join(timeout=5)
+            assert not process.is_alive()
+        assert extractor.killed == len(processes)
+
+        # The new pool works
+        result = asyncio.run(extractor.extract("<html><body><a href='/a'>a</a></body></html>",
+                                               url="http://example.com/"))
+        assert result["links"] == ["http://example.com/a"] and not result.get("fallback")
+    finally:
+        extractor.shutdown()
+
+
+def test_shutdown_kills_workers():
+    extractor = PageExtractor(workers=1)
+    extractor._pool.submit(time.sleep, 3600)
+    time.sleep(0.5)
+    processes = list(extractor._pool._processes.values())
+    extractor.shutdown()
+    for process in processes:
+        process.join(timeout=5)
+        assert not process.is_alive()
@@ -0,0 +1,17 @@
+import random
+
+from site_crawler.utils.simhash import simhash
+from site_crawler.utils.visited import fingerprint64
+
+
+def test_fingerprints_match_the_simple_crawler():
+    # Values from simple_crawler/utils (dedup_utils, visited_utils): both
+    # crawlers must give a page and a URL the same fingerprint
+    rng = random.Random(7)
+    words = [f"w{i}" for i in range(500)]
+    short = " ".join(rng.choice(words) for _ in range(200))
+    long = " ".join(rng.choice(words) for _ in range(20000))  # sampled shingles
+
+    assert simhash(short) == 0x12419F5D128C1E2F
+    assert simhash(long) == 0xC57E490AE9DA09E9
+    assert fingerprint64("http://example.com/docs/a.html") == 0x9C33337B2FAAAAFE
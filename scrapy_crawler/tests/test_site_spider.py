@@ -0,0 +1,83 @@
+import asyncio
+from unittest import mock
+
+import scrapy
+
+from site_crawler.items import PageItem
+
+PAGE = """<html><head><title>Index</title></head><body>
+<p>Documentation index.</p>
+<a href="/docs/a.html">A</a>
+<a href="/docs/a.html#usage">A again (fragment)</a>
+<a href="/docs/b.html?utm_source=nav">B (tracking parameter)</a>
+<a href="http://example.com/docs/b.html">B again (absolute)</a>
+<a href="http://docs.example.com/c.html">C (subdomain)</a>
+<a href="http://other.org/d.html">Off-site</a>
+<a href="mailto:team@example.com">Mail</a>
+<a href="/">Self</a>
+</body></html>"""
+
+
+def parse(spider, response) -> list:
+    async def run():
+        return [result async for result in spider.parse_page(response)]
+    return asyncio.run(run())
+
+
+def test_parse_page_requests_each_in_scope_link_once(make_spider, html_response):
+    spider = make_spider()
+    # The seed request was scheduled and holds a reservation
+    list(spider.start_requests())
+    response = html_response("http://example.com/", PAGE, meta={"_budget": True})
+
+    results = parse(spider, response)
+    items = [r for r in results if isinstance(r, PageItem)]
+    requests = [r for r in results if isinstance(r, scrapy.Request)]
+
+    assert len(items) == 1
+    assert sorted(r.url for r in requests) == [
+        "http://docs.example.com/c.html",
+        "http://example.com/docs/a.html",
+        "http://example.com/docs/b.html",
+    ]
+    assert all(r.meta["depth"] == 1 and r.callback == spider.parse_page for r in requests)
+    assert spider.budget.committed == 1 and spider.budget.inflight == 3
+
+    # Links seen again on another page are not requested twice
+    again = html_response("http://example.com/docs/a.html", PAGE, meta={"_budget": True})
+    assert not [r for r in parse(spider, again) if isinstance(r, scrapy.Request)]
+
+
+def test_parse_page_respects_depth_and_budget(make_spider, html_response):
+    spider = make_spider(max_depth=0)
+    list(spider.start_requests())
+    results = parse(spider, html_response("http://example.com/", PAGE, meta={"_budget": True}))
+    assert not [r for r in results if isinstance(r, scrapy.Request)]
+
+    spider = make_spider(max_pages=2)
+    list(spider.start_requests())
+    results = parse(spider, html_response("http://example.com/", PAGE, meta={"_budget": True}))
+    # One page saved, one reservation left: the other links wait in the backlog
+    assert len([r for r in results if isinstance(r, scrapy.Request)]) == 1
+    assert len(spider.budget.backlog) == 2
+
+
+def test_resumed_crawl_keeps_budget_and_backlog(make_spider, html_response, tmp_path):
+    settings = {"JOBDIR": str(tmp_path)}
+    spider = make_spider(settings, max_pages=2)
+    list(spider.start_requests())
+    parse(spider, html_response("http://example.com/", PAGE, meta={"_budget": True}))
+    spider.closed("shutdown")
+
+    # The scheduler queue still holds the one request in flight
+    spider = make_spider(settings, max_pages=2)
+    assert (spider.budget.committed, spider.budget.inflight) == (1, 1)
+    assert len(spider.budget.backlog) == 2
+    assert not list(spider.start_requests())
+
+    # That request ends without a page: its slot goes to a backlogged URL
+    spider.crawler.engine = mock.Mock()
+    spider._settle({"_budget": True})
+    assert spider.crawler.engine.crawl.call_count == 1
+    assert (spider.budget.committed, spider.budget.inflight) == (1, 1)
+    assert len(spider.budget.backlog) == 1
@@ -13,6 +13,24 @@ DOXYGEN_SEED_PAGES = [
     'pages.html',
 ]
 
+# File extension blacklist for links (non-HTML/PDF resources)
+BLOCKED_EXTENSIONS = frozenset({
+    # Images
+    '.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg', '.ico', '.bmp',
+    # Styles & Scripts
+    '.css', '.js', '.json', '.xml', '.map',
+    # Archives
+    '.zip', '.tar', '.gz', '.rar', '.7z',
+    # Media
+    '.mp4', '.mp3', '.avi', '.mov', '.wmv', '.flv', '.wav',
+    # Fonts
+    '.woff', '.woff2', '.ttf', '.eot', '.otf',
+    # Documents (non-HTML/PDF)
+    '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx',
+    # Other
+    '.txt', '.csv', '.log',
+})
+
 # User agent for requests
 USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
 
@@ -22,3 +40,31 @@ DEFAULT_OUTPUT_DIR = 'doxygen_crawl'
 # Default crawling parameters
 DEFAULT_MAX_PAGES = 500
 DEFAULT_DELAY = 1.0
+DEFAULT_MAX_DEPTH = 3        # link hops from the seed pages
+
+# Concurrent fetching
+DEFAULT_CONCURRENCY = 4      # worker threads fetching pages in parallel
+DEFAULT_RATE_BURST = 1.0     # token bucket capacity per host
+DEFAULT_POOL_HOSTS = 10      # hosts kept in the keep-alive connection pool
+
+# Checkpoint journal: fsync after this many completed pages
+CHECKPOINT_SYNC_EVERY = 10
+
+# JSONL output: start a new pages_N.jsonl shard past this many characters
+JSONL_CHAR_LIMIT = 495000
+
+# PDF extraction (runs in separate processes)
+PDF_WORKERS = 2                      # extraction processes (0 = in the crawl thread)
+PDF_MAX_BYTES = 50 * 1024 * 1024     # larger PDFs are skipped without downloading
+PDF_MAX_PAGES = 500                  # pages extracted per document
+PDF_TIMEOUT = 120                    # seconds per document
+PDF_FINGERPRINT_CHARS = 1_000_000    # leading PDF text used for near-duplicate detection
+
+# Near-duplicate detection (SimHash)
+SIMHASH_MAX_DISTANCE = 3     # differing bits still counted as a duplicate
+SIMHASH_MIN_TOKENS = 30      # shorter pages are not fingerprinted
+
+# Visited-URL sets ('exact': 64-bit fingerprints, 'bloom': Bloom filter)
+VISITED_MODE = 'exact'
+VISITED_FP_RATE = 0.001      # Bloom false-positive rate (a new URL wrongly skipped)
+VISITED_CAPACITY = 100_000   # expected URL count; the Bloom filter grows past it
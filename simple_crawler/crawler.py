@@ -1,40 +1,121 @@
 """Main Doxygen crawler class."""
 
-import json
-import time
+import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
-from urllib.parse import urljoin, urlparse
 
-import requests
-from bs4 import BeautifulSoup
-
-from config.constants import DOXYGEN_SEED_PAGES, USER_AGENT
-from utils.url_utils import extract_domain, extract_base_path
-from utils.text_utils import extract_title, extract_headings, extract_code_blocks, extract_text
-from utils.pdf_utils import extract_pdf_text
-from utils.file_utils import clean_filename, get_timestamp, ensure_directory
+from config.constants import (
+    DOXYGEN_SEED_PAGES, USER_AGENT,
+    DEFAULT_CONCURRENCY, DEFAULT_RATE_BURST, DEFAULT_POOL_HOSTS, DEFAULT_MAX_DEPTH,
+    CHECKPOINT_SYNC_EVERY, JSONL_CHAR_LIMIT, BLOCKED_EXTENSIONS,
+    PDF_WORKERS, PDF_MAX_BYTES, PDF_MAX_PAGES, PDF_TIMEOUT, PDF_FINGERPRINT_CHARS,
+    SIMHASH_MAX_DISTANCE, SIMHASH_MIN_TOKENS,
+    VISITED_MODE, VISITED_FP_RATE, VISITED_CAPACITY,
+)
+from utils.http_utils import HostRateLimiter, HttpTransport
+from utils.frontier_utils import Frontier
+from utils.checkpoint_utils import CrawlJournal
+from utils.url_utils import extract_domain, extract_base_path, UrlScope
+from utils.text_utils import parse_html, iter_hrefs, extract_content
+from utils.pdf_utils import PdfExtractor
+from utils.dedup_utils import NearDuplicateIndex, DUPLICATE_POLICIES
+from utils.visited_utils import open_visited, describe_memory
+from utils.file_utils import get_timestamp, ensure_directory
+from utils.output_utils import (
+    JsonlShardWriter, TxtPageWriter, to_jsonl_item, summarize_page, read_text_prefix,
+)
+from utils.metrics_utils import CrawlMetrics, timed
 
 
 class DoxygenCrawler:
     """Crawler for Doxygen-generated API documentation."""
     
     def __init__(self, base_url: str, max_pages: int, delay: float, output_dir: str,
-                 log_func=None, should_continue=None):
+                 log_func=None, should_continue=None,
+                 concurrency: int = DEFAULT_CONCURRENCY, rate_limit: float | None = None,
+                 max_connections_per_host: int | None = None,
+                 max_depth: int = DEFAULT_MAX_DEPTH, resume: bool = False,
+                 stream_output: bool = False,
+                 include_patterns: list[str] | None = None,
+                 exclude_patterns: list[str] | None = None,
+                 pdf_workers: int = PDF_WORKERS,
+                 duplicates: str = 'keep',
+                 visited: str = VISITED_MODE):
         self.base_url = base_url
         self.max_pages = max_pages
         self.delay = delay
         self.output_dir = output_dir
         self.log = log_func or print
         self.should_continue = should_continue or (lambda: True)
-        
-        self.visited_urls = set()
+        self.concurrency = max(1, int(concurrency))
+        self.max_depth = max_depth
+        self.resume = resume
+        
+        # Streaming: write each page as soon as it is extracted and keep
+        # only a small summary per page in pages_data.
+        self.stream_output = stream_output
+        self._json_writer = None
+        self._txt_writer = None
+        self._page_index = 0
+        
+        # Per-host token bucket (requests/sec over all workers, seed discovery
+        # included). Defaults to one request per `delay`, the old fixed sleep.
+        if rate_limit is None:
+            rate_limit = 1.0 / delay if delay > 0 else 0
+        self.rate_limiter = HostRateLimiter(rate_limit, DEFAULT_RATE_BURST)
+        
+        # Shared keep-alive connection pool (one socket per worker by default)
+        self.transport = HttpTransport(
+            USER_AGENT,
+            pool_hosts=DEFAULT_POOL_HOSTS,
+            max_per_host=max_connections_per_host or self.concurrency,
+            rate_limiter=self.rate_limiter,
+        )
+        
+        # PDFs are extracted in worker processes so HTML crawling continues
+        self.pdf_extractor = PdfExtractor(
+            workers=pdf_workers,
+            max_bytes=PDF_MAX_BYTES,
+            max_pages=PDF_MAX_PAGES,
+            max_seconds=PDF_TIMEOUT,
+        )
+        
+        # Near-duplicates are always marked ('duplicate_of'); 'nofollow'
+        # also skips their links, 'drop' skips links and output.
+        if duplicates not in DUPLICATE_POLICIES:
+            raise ValueError(f"duplicates must be one of {DUPLICATE_POLICIES}")
+        self.duplicates = duplicates
+        self.dedup = NearDuplicateIndex(SIMHASH_MAX_DISTANCE, SIMHASH_MIN_TOKENS)
+        
+        # Per-stage wall time of every page completed in this run
+        self.metrics = CrawlMetrics()
+        
+        # Visited / queued URLs as fingerprints, not strings ('exact' or 'bloom').
+        # Not persisted: a resumed crawl rebuilds them from the journal.
+        self.visited_urls = open_visited(visited, capacity=VISITED_CAPACITY, fp_rate=VISITED_FP_RATE)
         self.pages_data = []
         
+        # Extracted seed pages awaiting phase 2 (url -> page record)
+        self._page_cache = {}
+        self.queued_urls = open_visited(visited, capacity=VISITED_CAPACITY, fp_rate=VISITED_FP_RATE)
+        self.frontier = Frontier(max_depth, seen=self.queued_urls)
+        self.journal = CrawlJournal(
+            Path(output_dir, "simple_checkpoint", "journal.jsonl"),
+            sync_every=CHECKPOINT_SYNC_EVERY,
+        )
+        
         # Parse base URL
-        parsed = urlparse(base_url)
         self.domain = extract_domain(base_url)
         self.base_path = extract_base_path(base_url)
         
+        # Link filter compiled once for the whole crawl
+        self.scope = UrlScope(
+            f"{self.domain}{self.base_path}",
+            BLOCKED_EXTENSIONS,
+            include=include_patterns,
+            exclude=exclude_patterns,
+        )
+        
         # Create output directories
         self._create_directories()
     
@@ -47,7 +128,8 @@ class DoxygenCrawler:
         seed_urls = []
         for page_name in DOXYGEN_SEED_PAGES:
             url = f"{self.domain}{self.base_path}{page_name}"
-            seed_urls.append(url)
+            if self.scope.allows(url):
+                seed_urls.append(url)
         
         # Add base URL if not already in list
         if self.base_url not in seed_urls:
@@ -55,198 +137,204 @@ class DoxygenCrawler:
         
         return seed_urls
     
-    def _is_valid_url(self, url: str) -> bool:
-        """Check if URL should be crawled.
+    def _find_links(self, doc, current_url: str) -> list[str]:
+        """Find all in-scope, not yet visited links in the page."""
+        links = self.scope.filter_links(iter_hrefs(doc), current_url)
+        return [link for link in links if link not in self.visited_urls]
+    
+    def _crawl_page(self, url: str, collect_links: bool = False) -> dict:
+        """Crawl a single page.
         
-        Uses a blacklist approach to block known non-HTML files
-        while allowing modern URLs without extensions.
+        Pages already fetched during seed discovery are served from
+        the in-run cache without another request or parse.
         """
-        if not url or url in self.visited_urls:
-            return False
+        cached = self._page_cache.pop(url, None)
+        if cached is not None:
+            self.log(f"  처리 (캐시): {url}")
+            return cached
         
-        if url.startswith('#') or url.startswith('javascript:') or url.startswith('mailto:'):
-            return False
-        
-        parsed = urlparse(url)
-        if parsed.netloc and parsed.netloc != urlparse(self.domain).netloc:
-            return False
+        self.log(f"  처리: {url}")
         
-        full_url = urljoin(self.domain, url)
-        if not full_url.startswith(f"{self.domain}{self.base_path}"):
-            return False
+        response = None
+        try:
+            # Headers first; the body is read only for content we keep
+            response = self.transport.get(url, timeout=30, stream=True)
+            response.raise_for_status()
+            return self._process_response(url, response, collect_links)
         
-        # File extension blacklist (block these types)
-        BLOCKED_EXTENSIONS = {
-            # Images
-            '.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg', '.ico', '.bmp',
-            # Styles & Scripts
-            '.css', '.js', '.json', '.xml', '.map',
-            # Archives
-            '.zip', '.tar', '.gz', '.rar', '.7z',
-            # Media
-            '.mp4', '.mp3', '.avi', '.mov', '.wmv', '.flv', '.wav',
-            # Fonts
-            '.woff', '.woff2', '.ttf', '.eot', '.otf',
-            # Documents (non-HTML/PDF)
-            '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx',
-            # Other
-            '.txt', '.csv', '.log',
-        }
+        except Exception as e:
+            # An unread streamed response keeps its pooled connection
+            if response is not None:
+                response.close()
+            self.log(f"    ❌ {str(e)}")
+            return {
+                'url': url,
+                'status': 'error',
+                'error': str(e),
+                'soup': None
+            }
+    
+    def _process_response(self, url: str, response, collect_links: bool = False) -> dict:
+        """Turn a fetched response into a page record.
         
-        # Get filename from URL path
-        path = urlparse(full_url).path
-        if not path or path == '/':
-            return True
+        With collect_links=True, HTML pages also carry a 'links' list
+        of valid out-links found before content extraction.
         
-        filename = path.split('/')[-1]
+        PDFs come back with status 'pending' and a 'pdf_future'; pass
+        them to _finish_pdf() for the final record.
         
-        # If filename has extension
-        if '.' in filename:
-            # Get extension (lowercase)
-            ext = '.' + filename.split('.')[-1].lower()
-            
-            # Block if in blacklist
-            if ext in BLOCKED_EXTENSIONS:
-                return False
-            
-            # Explicitly allow HTML and PDF
-            if ext in {'.html', '.htm', '.pdf'}:
-                return True
+        Every record carries a 'timings' dict of stage durations.
+        """
+        timings = dict(getattr(response, 'timings', {}))
+        
+        # Check Content-Type
+        content_type = response.headers.get('Content-Type', '').lower()
+        
+        # Handle PDF
+        if 'application/pdf' in content_type or url.endswith('.pdf'):
+            self.log(f"    📄 PDF 파일 감지")
+            size = response.headers.get('Content-Length')
+            if self.pdf_extractor.too_large(int(size) if size and size.isdigit() else None):
+                response.close()
+                self.log(f"    ⊘ PDF 크기 제한 초과: {int(size) // (1024 * 1024)}MB")
+                return {
+                    'url': url,
+                    'status': 'skipped',
+                    'error': f'PDF too large: {size} bytes',
+                    'file_type': 'pdf',
+                    'timings': timings
+                }
             
-            # Unknown extensions: allow (could be query params like ?v=1.0)
-            return True
+            with timed(timings, 'transfer'):
+                pdf_content = self.pdf_extractor.read_capped(response)
+            if pdf_content is None:
+                limit = self.pdf_extractor.max_bytes
+                self.log(f"    ⊘ PDF 크기 제한 초과: {limit // (1024 * 1024)}MB 이상")
+                return {
+                    'url': url,
+                    'status': 'skipped',
+                    'error': f'PDF too large: over {limit} bytes',
+                    'file_type': 'pdf',
+                    'timings': timings
+                }
+            return {
+                'url': url,
+                'status': 'pending',
+                'file_type': 'pdf',
+                'pdf_future': self.pdf_extractor.submit(pdf_content),
+                'timings': timings,
+            }
         
-        # No extension: allow (modern URLs like /docs/guide/)
-        return True
-
-    
-    def _find_links(self, soup: BeautifulSoup, current_url: str) -> list[str]:
-        """Find all valid HTML links in the page."""
-        links = set()
+        # Skip non-HTML content types
+        if content_type and not any(t in content_type for t in ['text/html', 'application/xhtml', 'text/plain']):
+            response.close()
+            self.log(f"    ⊘ HTML 아님: {content_type}")
+            return {
+                'url': url,
+                'status': 'skipped',
+                'error': f'Non-HTML content: {content_type}',
+                'file_type': content_type.split(';')[0],
+                'timings': timings
+            }
         
-        for link in soup.find_all('a', href=True):
-            href = link['href']
+        with timed(timings, 'transfer'):
+            body = response.content
+        
+        # HTML processing (lxml when available)
+        with timed(timings, 'parse'):
+            soup = parse_html(body)
+        
+        # Collect links before extraction (the BeautifulSoup fallback
+        # strips nav/header/footer from the tree)
+        links = None
+        if collect_links:
+            with timed(timings, 'links'):
+                links = self._find_links(soup, url)
+        
+        with timed(timings, 'extract'):
+            content = extract_content(soup)
+        
+        # Use filename from URL if title is generic or empty
+        title = content.get('title', '')
+        if not title or title == 'NVIDIA DRIVE OS Linux SDK API Reference':
+            # Try to get meaningful name from URL
+            path_parts = url.rstrip('/').split('/')
+            filename = path_parts[-1] if path_parts else ''
             
-            if href.startswith('#'):
-                continue
-            
-            full_url = urljoin(current_url, href)
+            if filename.endswith('.html'):
+                title = filename.replace('.html', '').replace('_', ' ')
+            elif filename:
+                title = filename.replace('_', ' ').replace('-', ' ')
+            else:
+                # Use second-to-last part (like 'java' from /docs/vertx-core/java/)
+                title = path_parts[-2] if len(path_parts) > 1 else 'Untitled'
             
-            if self._is_valid_url(full_url):
-                links.add(full_url)
+            content['title'] = title
         
-        return list(links)
-    
-    def _extract_content(self, soup: BeautifulSoup) -> dict:
-        """Extract content from HTML soup."""
-        # Find main content area
-        main_selectors = ['.contents', '#doc-content', 'main', 'article', '.textblock', 'body']
-        main = None
-        for selector in main_selectors:
-            main = soup.select_one(selector)
-            if main:
-                break
-        
-        if not main:
-            main = soup.find('body')
+        self.log(f"    ✓ {content.get('title', 'Untitled')}")
         
-        content = {
-            'title': extract_title(soup),
-            'headings': extract_headings(main) if main else [],
-            'code_blocks': extract_code_blocks(main) if main else [],
-            'text': extract_text(main) if main else ''
+        page_data = {
+            'url': url,
+            'status': 'success',
+            'soup': soup,
+            'file_type': 'html',
+            'timings': timings,
+            **content
         }
+        if links is not None:
+            page_data['links'] = links
         
-        return content
+        return page_data
     
-    def _crawl_page(self, url: str) -> dict:
-        """Crawl a single page."""
-        self.log(f"  처리: {url}")
+    def _finish_pdf(self, page_data: dict) -> dict:
+        """Wait for a pending PDF extraction and build its page record.
         
-        try:
-            headers = {'User-Agent': USER_AGENT}
-            response = requests.get(url, timeout=30, headers=headers)
-            response.raise_for_status()
-            
-            # Check Content-Type
-            content_type = response.headers.get('Content-Type', '').lower()
-            
-            # Handle PDF
-            if 'application/pdf' in content_type or url.endswith('.pdf'):
-                self.log(f"    📄 PDF 파일 감지")
-                pdf_text = extract_pdf_text(response.content)
-                
-                if pdf_text:
-                    title = url.split('/')[-1].replace('.pdf', '') or 'PDF Document'
-                    self.log(f"    ✓ PDF 변환 완료: {title}")
-                    
-                    return {
-                        'url': url,
-                        'status': 'success',
-                        'title': title,
-                        'headings': [],
-                        'text': pdf_text,
-                        'code_blocks': [],
-                        'file_type': 'pdf'
-                    }
-                else:
-                    return {
-                        'url': url,
-                        'status': 'error',
-                        'error': 'PDF 텍스트 추출 실패',
-                        'file_type': 'pdf'
-                    }
-            
-            # Skip non-HTML content types
-            if content_type and not any(t in content_type for t in ['text/html', 'application/xhtml', 'text/plain']):
-                self.log(f"    ⊘ HTML 아님: {content_type}")
-                return {
-                    'url': url,
-                    'status': 'skipped',
-                    'error': f'Non-HTML content: {content_type}',
-                    'file_type': content_type.split(';')[0]
-                }
-            
-            # HTML processing
-            soup = BeautifulSoup(response.content, 'html.parser')
-            content = self._extract_content(soup)
-            
-            # Use filename from URL if title is generic or empty
-            title = content.get('title', '')
-            if not title or title == 'NVIDIA DRIVE OS Linux SDK API Reference':
-                # Try to get meaningful name from URL
-                path_parts = url.rstrip('/').split('/')
-                filename = path_parts[-1] if path_parts else ''
-                
-                if filename.endswith('.html'):
-                    title = filename.replace('.html', '').replace('_', ' ')
-                elif filename:
-                    title = filename.replace('_', ' ').replace('-', ' ')
-                else:
-                    # Use second-to-last part (like 'java' from /docs/vertx-core/java/)
-                    title = path_parts[-2] if len(path_parts) > 1 else 'Untitled'
-                
-                content['title'] = title
-            
-            self.log(f"    ✓ {content.get('title', 'Untitled')}")
+        In streaming mode the text stays in the extractor's temp file
+        ('text_file'), which the writers copy in chunks; _complete_page()
+        removes it.
+        """
+        url = page_data['url']
+        text_path, info = self.pdf_extractor.collect(url, page_data.pop('pdf_future'))
+        timings = page_data.get('timings', {})
+        timings['pdf'] = info.get('seconds', 0.0)
+        
+        if text_path and not os.path.getsize(text_path):
+            os.remove(text_path)
+            text_path = None
+        
+        if text_path:
+            title = url.split('/')[-1].replace('.pdf', '') or 'PDF Document'
+            note = ", 제한으로 일부만 변환" if info.get('truncated') else ""
+            self.log(f"    ✓ PDF 변환 완료: {title} ({info['pages']}페이지, {info['seconds']:.1f}초{note})")
             
-            return {
+            page = {
                 'url': url,
                 'status': 'success',
-                'soup': soup,
-                'file_type': 'html',
-                **content
+                'title': title,
+                'headings': [],
+                'code_blocks': [],
+                'file_type': 'pdf',
+                'timings': timings
             }
-        
-        except Exception as e:
-            self.log(f"    ❌ {str(e)}")
+            if self.stream_output:
+                page['text_file'] = text_path
+            else:
+                # Every page's text is kept in pages_data anyway
+                try:
+                    with open(text_path, 'r', encoding='utf-8') as f:
+                        page['text'] = f.read()
+                finally:
+                    os.remove(text_path)
+            return page
+        else:
+            self.log(f"    ❌ PDF 텍스트 추출 실패: {url} {info.get('error', '')}")
             return {
                 'url': url,
                 'status': 'error',
-                'error': str(e),
-                'soup': None
+                'error': 'PDF 텍스트 추출 실패',
+                'file_type': 'pdf',
+                'timings': timings
             }
-
     
     def crawl(self) -> list[dict]:
         """Main crawl method."""
@@ -254,191 +342,302 @@ class DoxygenCrawler:
         self.log("1단계: 시작 페이지 및 공통 Doxygen 페이지 확인")
         self.log(f"{'='*60}\n")
         
+        resumed = self.resume and self._restore_checkpoint()
+        if resumed:
+            self.journal.open()
+        else:
+            self.journal.open(meta={'base_url': self.base_url, 'max_depth': self.max_depth,
+                                    'stream_output': self.stream_output})
+        
+        if self.stream_output:
+            self._json_writer = JsonlShardWriter(Path(self.output_dir, "simple_json"),
+                                                 JSONL_CHAR_LIMIT, append=resumed)
+            self._txt_writer = TxtPageWriter(Path(self.output_dir, "simple_crawler"), get_timestamp())
+        
+        if not resumed:
+            self._discover_seeds()
+        
+        self.log(f"\n발견된 HTML 페이지: {len(self.frontier)}개")
+        
+        if self.frontier:
+            self.log("\n우선순위 상위 페이지:")
+            for idx, link in enumerate(self.frontier.peek(10), 1):
+                filename = link.split('/')[-1]
+                self.log(f"  {idx}. {filename}")
+            if len(self.frontier) > 10:
+                self.log(f"  ... 외 {len(self.frontier) - 10}개")
+        
+        self.log(f"\n{'='*60}")
+        self.log(f"2단계: 각 페이지 크롤링 (최대 {self.max_pages}개, 깊이 {self.max_depth})")
+        self.log(f"{'='*60}\n")
+        
+        self.log(f"동시 요청: {self.concurrency}개 워커\n")
+        self._crawl_concurrently()
+        
+        for page_data in self._page_cache.values():
+            if page_data.get('text_file'):
+                os.remove(page_data['text_file'])
+        self._page_cache.clear()
+        self.journal.close()
+        if self._json_writer:
+            self._json_writer.close()
+        
+        stats = self.transport.stats()
+        self.log(f"연결 재사용: {stats['reused']}/{stats['requests']} 요청 "
+                 f"(새 연결 {stats['connections']}개)")
+        self.transport.close()
+        
+        dup_count = sum(1 for page in self.pages_data if page.get('duplicate_of'))
+        if dup_count:
+            action = {'keep': '표시만', 'nofollow': '링크 미추적', 'drop': '제외됨'}[self.duplicates]
+            self.log(f"근접 중복 페이지: {dup_count}개 ({action})")
+        
+        timings = self.pdf_extractor.timings
+        if timings:
+            slowest = max(timings, key=lambda t: t[1])
+            self.log(f"PDF 변환: {len(timings)}개, 총 {sum(t[1] for t in timings):.1f}초 "
+                     f"(최장 {slowest[1]:.1f}초: {slowest[0].split('/')[-1]})")
+        self.pdf_extractor.shutdown()
+        
+        self.log(f"방문 URL 집합: {describe_memory(self.visited_urls)}, "
+                 f"대기열 URL 집합: {describe_memory(self.queued_urls)}")
+        
+        self._report_metrics()
+        
+        return self.pages_data
+    
+    def _report_metrics(self) -> None:
+        """Log stage timings and write them to simple_metrics.json."""
+        if not self.metrics.pages:
+            return
+        
+        summary = self.metrics.summary()
+        metrics_path = Path(self.output_dir, "simple_metrics.json")
+        self.metrics.save(metrics_path, summary)
+        
+        self.log(f"\n{'='*60}")
+        self.log(f"단계별 소요 시간 ({self.metrics.pages}개 페이지)")
+        self.log(f"{'='*60}")
+        for line in self.metrics.report_lines(summary):
+            self.log(line)
+        self.log(f"\n측정 결과 저장: {metrics_path}")
+    
+    def _discover_seeds(self) -> None:
+        """Phase 1: fetch seed pages and queue the links found on them."""
         seed_urls = self._get_seed_urls()
         self.log(f"시드 URL {len(seed_urls)}개 확인 중...")
         
-        all_links = set()
-        
         # Check seed URLs and collect links
         for url in seed_urls:
             if not self.should_continue():
                 break
             
+            response = None
             try:
-                headers = {'User-Agent': USER_AGENT}
-                response = requests.get(url, timeout=10, headers=headers)
+                response = self.transport.get(url, timeout=10, stream=True)
                 
-                if response.status_code == 200:
+                if response.status_code != 200:
+                    response.close()
+                else:
                     self.log(f"  ✓ 발견: {url.split('/')[-1]}")
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    links = self._find_links(soup, url)
-                    all_links.update(links)
-                    all_links.add(url)
-                    time.sleep(0.5)
+                    page_data = self._process_response(url, response, collect_links=True)
+                    if page_data['status'] == 'pending':
+                        page_data = self._finish_pdf(page_data)
+                    page_data.pop('soup', None)
+                    links = page_data.pop('links', [])
+                    
+                    # Start URL always goes first
+                    score = float('-inf') if url == self.base_url else None
+                    self.frontier.push(url, 0, score=score)
+                    for link in links:
+                        self.frontier.push(link, 1)
+                    
+                    # Keep the extracted page so phase 2 does not download it again
+                    self._page_cache[url] = page_data
+                    self.journal.record_seed(url, links)
             except:
-                pass
+                if response is not None:
+                    response.close()
+    
+    def _restore_checkpoint(self) -> bool:
+        """Rebuild visited set, pages and frontier from the journal.
         
-        self.log(f"\n발견된 HTML 페이지: {len(all_links)}개")
+        Returns False when there is no usable journal for this URL.
+        """
+        records = self.journal.load()
+        if not records or records[0].get('type') != 'meta':
+            self.log("체크포인트 없음 - 처음부터 시작합니다")
+            return False
+        if records[0].get('base_url') != self.base_url:
+            self.log("⚠️  체크포인트의 시작 URL이 다릅니다 - 처음부터 시작합니다")
+            return False
+        if records[0].get('stream_output', False) != self.stream_output:
+            self.log("⚠️  체크포인트의 출력 방식(스트리밍)이 다릅니다 - 처음부터 시작합니다")
+            return False
         
-        if all_links:
-            self.log("\n발견된 페이지 예시:")
-            for idx, link in enumerate(sorted(all_links)[:10], 1):
-                filename = link.split('/')[-1]
-                self.log(f"  {idx}. {filename}")
-            if len(all_links) > 10:
-                self.log(f"  ... 외 {len(all_links) - 10}개")
+        # Completed pages first, so replayed links never re-queue them.
+        # Failed pages are left out and retried.
+        pages = [r for r in records if r['type'] == 'page' and r['page'].get('status') != 'error']
+        for record in pages:
+            self.visited_urls.add(record['page']['url'])
+            self.frontier.mark_seen(record['page']['url'])
+            self.pages_data.append(record['page'])
+            if 'simhash' in record['page'] and not record['page'].get('duplicate_of'):
+                self.dedup.add(record['page']['url'], record['page']['simhash'])
+            self._page_index = max(self._page_index, record['page'].get('index', 0))
+        
+        for record in records:
+            if record['type'] == 'seed':
+                score = float('-inf') if record['url'] == self.base_url else None
+                self.frontier.push(record['url'], 0, score=score)
+                for link in record['links']:
+                    self.frontier.push(link, 1)
+            elif record['type'] == 'page':
+                for link in record['links']:
+                    self.frontier.push(link, record['depth'] + 1)
+        
+        self.log(f"체크포인트에서 재개: 완료 {len(self.pages_data)}개, 대기열 {len(self.frontier)}개")
+        return True
+    
+    def _crawl_concurrently(self) -> None:
+        """Crawl the frontier with a worker pool, appending results to pages_data.
         
-        self.log(f"\n{'='*60}")
-        self.log(f"2단계: 각 페이지 크롤링 (최대 {min(len(all_links), self.max_pages)}개)")
-        self.log(f"{'='*60}\n")
+        At most `concurrency` pages are in flight and at most `max_pages`
+        are fetched, best-scored first. Links found on a page are pushed
+        back one level deeper. When should_continue() turns False no new
+        pages are submitted; in-flight ones finish.
         
-        # Crawl each page - prioritize base URL first
-        sorted_links = sorted(all_links)
+        PDFs being extracted do not hold a fetch slot; they are completed
+        whenever their worker process finishes.
+        """
+        in_flight = {}    # future -> depth
+        pdf_pending = {}  # extraction future -> (page record, depth)
+        submitted = len(self.pages_data)
+        
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            while True:
+                # Top up the pool
+                while (len(in_flight) < self.concurrency and submitted < self.max_pages
+                       and self.should_continue()):
+                    entry = self.frontier.pop()
+                    if entry is None:
+                        break
+                    url, depth = entry
+                    if url in self.visited_urls:
+                        continue
+                    self.visited_urls.add(url)
+                    collect_links = depth < self.max_depth
+                    in_flight[pool.submit(self._crawl_page, url, collect_links)] = depth
+                    submitted += 1
+                
+                if not in_flight and not pdf_pending:
+                    break
+                
+                if not in_flight:
+                    # Only extractions left; collect() bounds each wait
+                    for page_data, depth in pdf_pending.values():
+                        self._complete_page(self._finish_pdf(page_data), depth)
+                    pdf_pending.clear()
+                    continue
+                
+                finished, _ = wait([*in_flight, *pdf_pending], return_when=FIRST_COMPLETED)
+                for future in finished:
+                    if future in pdf_pending:
+                        page_data, depth = pdf_pending.pop(future)
+                        self._complete_page(self._finish_pdf(page_data), depth)
+                        continue
+                    
+                    depth = in_flight.pop(future)
+                    page_data = future.result()
+                    if page_data['status'] == 'pending':
+                        pdf_pending[page_data['pdf_future']] = (page_data, depth)
+                        continue
+                    self._complete_page(page_data, depth)
+    
+    def _complete_page(self, page_data: dict, depth: int) -> None:
+        """Queue a finished page's links, write its output and journal it."""
+        # Remove soup from stored data
+        page_data.pop('soup', None)
+        timings = page_data.pop('timings', {})
         
-        # Move base URL to front if it exists
-        if self.base_url in sorted_links:
-            sorted_links.remove(self.base_url)
-            sorted_links.insert(0, self.base_url)
+        links = page_data.pop('links', [])
         
-        for idx, url in enumerate(sorted_links[:self.max_pages], 1):
-            if not self.should_continue():
-                break
-            
-            if url in self.visited_urls:
-                continue
-            
-            self.visited_urls.add(url)
-            page_data = self._crawl_page(url)
-            
-            # Remove soup from stored data
-            if 'soup' in page_data:
-                del page_data['soup']
-            
-            self.pages_data.append(page_data)
-            
-            self.log(f"  진행: {idx}/{min(len(all_links), self.max_pages)}\n")
-            
-            if idx < len(sorted_links):
-                time.sleep(self.delay)
+        text_file = page_data.pop('text_file', None)
         
-        return self.pages_data
+        if page_data['status'] == 'success':
+            if text_file:
+                text = read_text_prefix(text_file, PDF_FINGERPRINT_CHARS)
+            else:
+                text = page_data.get('text', '')
+            fingerprint, duplicate_of = self.dedup.check(page_data['url'], text)
+            if fingerprint is not None:
+                page_data['simhash'] = fingerprint
+            if duplicate_of:
+                page_data['duplicate_of'] = duplicate_of
+                self.log(f"    ≈ 근접 중복: {duplicate_of.split('/')[-1]}")
+                if self.duplicates != 'keep':
+                    links = []
+                if self.duplicates == 'drop':
+                    page_data['status'] = 'duplicate'
+        
+        for link in links:
+            self.frontier.push(link, depth + 1)
+        
+        self._page_index += 1
+        page_data['depth'] = depth
+        page_data['index'] = self._page_index
+        
+        url = page_data['url']
+        with timed(timings, 'output'):
+            try:
+                if self.stream_output:
+                    if page_data['status'] == 'success':
+                        self._json_writer.write(to_jsonl_item(page_data), text_file=text_file)
+                        self._txt_writer.write({**page_data, 'text_file': text_file}, self._page_index)
+                        # Output must be on disk before the journal says the page is done
+                        self._json_writer.flush()
+                    page_data = summarize_page(page_data)
+            finally:
+                if text_file:
+                    os.remove(text_file)
+            
+            self.journal.record_page(page_data, depth, links)
+        self.metrics.add_page(url, timings)
+        self.pages_data.append(page_data)
+        self.log(f"  진행: {len(self.pages_data)}/{self.max_pages} (대기열 {len(self.frontier)}개)\n")
     
     def save_json(self) -> str:
         """Save results as JSONL (JSON Lines) format - one JSON per line.
         Splits into multiple files if character count exceeds 495,000.
-        """
-        # New path: crawl_output/simple_json/pages.jsonl
-        json_dir = Path(self.output_dir, "simple_json")
-        json_dir.mkdir(parents=True, exist_ok=True)
-        
-        limit = 495000
-        current_file_idx = 1
-        current_char_count = 0
-        
-        def get_file_path(idx):
-            if idx == 1:
-                return json_dir / "pages.jsonl"
-            else:
-                return json_dir / f"pages_{idx}.jsonl"
         
-        saved_files = []
-        current_file_path = get_file_path(current_file_idx)
-        f = open(current_file_path, 'w', encoding='utf-8')
-        saved_files.append(str(current_file_path))
+        In streaming mode pages were already written during crawl();
+        this only reports the files.
+        """
+        if self.stream_output:
+            return self._json_writer.summary() if self._json_writer else ''
         
+        # New path: crawl_output/simple_json/pages.jsonl
+        writer = JsonlShardWriter(Path(self.output_dir, "simple_json"), JSONL_CHAR_LIMIT)
         try:
             for page in self.pages_data:
                 if page['status'] != 'success':
                     continue
-                
-                # Convert to Scrapy-like format
-                jsonl_item = {
-                    'url': page['url'],
-                    'title': page.get('title', ''),
-                    'text': page.get('text', ''),
-                    'headings': page.get('headings', []),
-                    'code_blocks': page.get('code_blocks', []),
-                    'file_type': page.get('file_type', 'html'),
-                    'rendered': False,  # Simple crawler doesn't render
-                    'depth': 0,
-                    'out_links': [],  # Simple crawler doesn't track outlinks
-                    'images': []  # Simple crawler doesn't collect images
-                }
-                
-                item_str = json.dumps(jsonl_item, ensure_ascii=False) + '\n'
-                item_len = len(item_str)
-                
-                # Check if we need to switch to a new file (limit: 495,000 chars)
-                if current_char_count + item_len > limit and current_char_count > 0:
-                    f.close()
-                    current_file_idx += 1
-                    current_file_path = get_file_path(current_file_idx)
-                    f = open(current_file_path, 'w', encoding='utf-8')
-                    saved_files.append(str(current_file_path))
-                    current_char_count = 0
-                
-                f.write(item_str)
-                current_char_count += item_len
+                writer.write(to_jsonl_item(page))
         finally:
-            f.close()
-            
-        if len(saved_files) == 1:
-            return str(get_file_path(1))
-        else:
-            return f"{json_dir}\\pages*.jsonl ({len(saved_files)}개 파일)"
+            writer.close()
+        
+        return writer.summary()
     
     def save_txt(self) -> str:
         """Save results as individual TXT files."""
-        # New path: crawl_output/simple_crawler/
-        txt_dir = Path(self.output_dir, "simple_crawler")
-        txt_dir.mkdir(parents=True, exist_ok=True)
-        timestamp = get_timestamp()
+        if self.stream_output:
+            return self._txt_writer.summary() if self._txt_writer else ''
         
-        saved_files = []
+        # New path: crawl_output/simple_crawler/
+        writer = TxtPageWriter(Path(self.output_dir, "simple_crawler"), get_timestamp())
         for idx, page in enumerate(self.pages_data, 1):
             if page['status'] != 'success':
                 continue
-            
-            # Clean title for filename
-            title = page.get('title', 'Untitled')
-            clean_title = clean_filename(title)
-            
-            # Check if PDF
-            file_type = page.get('file_type', 'html')
-            type_marker = '[PDF]_' if file_type == 'pdf' else ''
-            
-            # Create filename
-            filename = f"{idx:03d}_{type_marker}{clean_title}_{timestamp}.txt"
-            filepath = txt_dir / filename
-            
-            # Write file
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write("="*80 + "\n")
-                f.write(f"페이지 {idx}: {title}\n")
-                if file_type == 'pdf':
-                    f.write("[PDF 파일에서 변환됨]\n")
-                f.write("="*80 + "\n")
-                f.write(f"URL: {page['url']}\n")
-                f.write(f"크롤링 시간: {timestamp}\n")
-                f.write(f"파일 형식: {file_type.upper()}\n")
-                f.write("="*80 + "\n\n")
-                
-                if page.get('headings'):
-                    f.write("목차:\n" + "-"*80 + "\n")
-                    for heading in page['headings']:
-                        indent = "  " * (int(heading['level'][1]) - 1)
-                        f.write(f"{indent}• {heading['text']}\n")
-                    f.write("\n")
-                
-                if page.get('text'):
-                    f.write("내용:\n" + "-"*80 + "\n")
-                    f.write(page['text'] + "\n\n")
-                
-                if page.get('code_blocks'):
-                    f.write(f"코드 블록 ({len(page['code_blocks'])}개):\n" + "-"*80 + "\n")
-                    for code_idx, code in enumerate(page['code_blocks'], 1):
-                        f.write(f"\n[코드 {code_idx}]\n{code}\n")
-            
-            saved_files.append(str(filepath))
+            writer.write(page, page.get('index', idx))
         
-        return f"{len(saved_files)}개 파일 저장됨"
+        return writer.summary()
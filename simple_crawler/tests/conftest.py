@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The crawler imports its modules as top-level packages (config, utils)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,40 @@
+from utils.checkpoint_utils import CrawlJournal
+
+
+def _page(url):
+    return {'url': url, 'status': 'success'}
+
+
+def _urls(records):
+    return [r.get('page', {}).get('url') for r in records]
+
+
+def test_resume_after_torn_line_keeps_later_records(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    journal = CrawlJournal(path)
+    journal.open(meta={'base_url': 'http://x/'})
+    journal.record_page(_page('a'), 0, [])
+    journal.close()
+    # Crash in the middle of the next record
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"type": "page", "depth": 0, "links": [], "page": {"url": "tor')
+
+    first = CrawlJournal(path)
+    assert _urls(first.load()) == [None, 'a']
+    first.open()
+    first.record_page(_page('b'), 0, [])
+    first.close()
+
+    second = CrawlJournal(path)
+    assert _urls(second.load()) == [None, 'a', 'b']
+
+
+def test_valid_record_without_newline_is_treated_as_torn(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    path.write_text('{"type": "meta"}\n{"type": "seed", "url": "s", "links": []}', encoding='utf-8')
+    journal = CrawlJournal(path)
+    assert len(journal.load()) == 1
+    journal.open()
+    journal.record_seed('t', [])
+    journal.close()
+    assert [r.get('url') for r in CrawlJournal(path).load()] == [None, 't']
@@ -0,0 +1,84 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from urllib3.exceptions import EmptyPoolError
+
+from crawler import DoxygenCrawler
+from utils import http_utils
+
+
+class _Handler(BaseHTTPRequestHandler):
+    requests = []  # (monotonic time, path)
+
+    def do_GET(self):
+        _Handler.requests.append((time.monotonic(), self.path))
+        if self.path.startswith('/docs/missing'):
+            body = b'<html><body>not found</body></html>' * 200
+            self.send_response(404)
+        else:
+            body = b'<html><head><title>Page</title></head><body><p>Hello</p></body></html>'
+            self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{httpd.server_address[1]}'
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _crawler(base, tmp_path, **kwargs):
+    return DoxygenCrawler(f'{base}/docs/index.html', 10, 0, str(tmp_path),
+                          log_func=lambda *args: None, concurrency=2, pdf_workers=0, **kwargs)
+
+
+def test_error_responses_free_their_connection(server, tmp_path, monkeypatch):
+    # Fail fast instead of hanging if a connection leaks
+    monkeypatch.setattr(http_utils, 'POOL_TIMEOUT', 2.0)
+    crawler = _crawler(server, tmp_path)
+    try:
+        for i in range(4):
+            assert crawler._crawl_page(f'{server}/docs/missing{i}.html')['status'] == 'error'
+        assert crawler._crawl_page(f'{server}/docs/page.html')['status'] == 'success'
+    finally:
+        crawler.transport.close()
+
+
+def test_exhausted_pool_times_out(server, tmp_path, monkeypatch):
+    monkeypatch.setattr(http_utils, 'POOL_TIMEOUT', 0.5)
+    crawler = _crawler(server, tmp_path)
+    try:
+        held = [crawler.transport.get(f'{server}/docs/page.html', stream=True) for _ in range(2)]
+        with pytest.raises(EmptyPoolError):
+            crawler.transport.get(f'{server}/docs/page.html', stream=True)
+        for response in held:
+            response.close()
+    finally:
+        crawler.transport.close()
+
+
+def test_all_requests_to_a_host_share_one_rate(server, tmp_path):
+    _Handler.requests.clear()
+    delay = 0.2
+    crawler = DoxygenCrawler(f'{server}/docs/index.html', 6, delay, str(tmp_path),
+                             log_func=lambda *args: None, concurrency=4, pdf_workers=0)
+    crawler.crawl()
+
+    times = sorted(t for t, _ in _Handler.requests)
+    # Seed discovery and the worker pool both go through the host bucket
+    assert any(path.startswith('/docs/annotated') for _, path in _Handler.requests)
+    assert len(times) > 6
+    gaps = [b - a for a, b in zip(times, times[1:])]
+    assert min(gaps) > delay * 0.8
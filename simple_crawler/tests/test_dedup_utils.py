@@ -0,0 +1,40 @@
+import hashlib
+import random
+from collections import Counter
+
+from utils.dedup_utils import TOKEN_RE, NearDuplicateIndex, simhash
+
+
+def _reference_simhash(text: str, shingle: int = 3) -> int:
+    # Textbook SimHash: +count / -count per bit of every shingle hash
+    tokens = TOKEN_RE.findall(text.lower())
+    features = Counter(' '.join(tokens[i:i + shingle]) for i in range(len(tokens) - shingle + 1))
+    weights = [0] * 64
+    for feature, count in features.items():
+        h = int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'big')
+        for bit in range(64):
+            weights[bit] += count if h >> bit & 1 else -count
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def _words(n: int, seed: int, vocabulary: int = 50_000) -> list[str]:
+    rng = random.Random(seed)
+    return [f'w{rng.randrange(vocabulary)}' for _ in range(n)]
+
+
+def test_matches_reference_below_the_feature_cap():
+    for text in (' '.join(_words(500, 1)), ' '.join(['alpha beta gamma'] * 50 + _words(100, 2))):
+        assert simhash(text) == _reference_simhash(text)
+    assert simhash('too short') is None
+
+
+def test_sampled_fingerprint_keeps_near_duplicates_together():
+    words = _words(100_000, 3)
+    edited = list(words)
+    for i in range(0, len(edited), 500):
+        edited[i] = 'changed'
+
+    index = NearDuplicateIndex()
+    assert index.check('a', ' '.join(words))[1] is None
+    assert index.check('b', ' '.join(edited))[1] == 'a'
+    assert index.check('c', ' '.join(_words(100_000, 4)))[1] is None
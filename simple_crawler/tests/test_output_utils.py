@@ -0,0 +1,42 @@
+import json
+
+from utils.output_utils import JsonlShardWriter, TxtPageWriter
+
+
+def test_text_file_is_streamed_into_the_same_jsonl_record(tmp_path):
+    text = 'Quote " backslash \\ tab \t 한글 \x01\n' * 5000
+    text_file = tmp_path / 'page.txt'
+    text_file.write_text(text, encoding='utf-8')
+    record = {'url': 'http://x/a.pdf', 'title': 'a', 'text': '', 'file_type': 'pdf'}
+
+    streamed = JsonlShardWriter(tmp_path / 'streamed', limit=10**9)
+    streamed.write(record, text_file=text_file)
+    streamed.write({'url': 'http://x/b.html', 'text': 'small'})
+    streamed.close()
+    plain = JsonlShardWriter(tmp_path / 'plain', limit=10**9)
+    plain.write({**record, 'text': text})
+    plain.write({'url': 'http://x/b.html', 'text': 'small'})
+    plain.close()
+
+    data = (tmp_path / 'streamed' / 'pages.jsonl').read_text(encoding='utf-8')
+    assert data == (tmp_path / 'plain' / 'pages.jsonl').read_text(encoding='utf-8')
+    assert json.loads(data.splitlines()[0])['text'] == text
+
+
+def test_streamed_record_counts_towards_shard_rotation(tmp_path):
+    text_file = tmp_path / 'page.txt'
+    text_file.write_text('x' * 1000, encoding='utf-8')
+    writer = JsonlShardWriter(tmp_path / 'out', limit=1500)
+    writer.write({'url': 'a', 'text': ''}, text_file=text_file)
+    writer.write({'url': 'b', 'text': ''}, text_file=text_file)
+    writer.close()
+    assert len(writer.files) == 2
+
+
+def test_txt_writer_copies_text_file(tmp_path):
+    text_file = tmp_path / 'page.txt'
+    text_file.write_text('[페이지 1]\nhello\n', encoding='utf-8')
+    writer = TxtPageWriter(tmp_path / 'txt', '20260101_000000')
+    path = writer.write({'url': 'http://x/a.pdf', 'title': 'a', 'file_type': 'pdf',
+                         'text_file': str(text_file)}, 1)
+    assert '[페이지 1]\nhello\n' in path.read_text(encoding='utf-8')
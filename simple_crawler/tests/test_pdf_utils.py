@@ -0,0 +1,106 @@
+import os
+import time
+
+from utils import pdf_utils
+from utils.pdf_utils import PdfExtractor
+
+
+def _hang(pdf_content, max_pages, max_seconds):
+    # A single page that never returns to the between-pages time check
+    time.sleep(3600)
+
+
+def _quick(pdf_content, max_pages, max_seconds):
+    return {'error': 'not a pdf', 'seconds': 0.0}
+
+
+def _crash(pdf_content, max_pages, max_seconds):
+    # Like a segfault or the OOM killer: the worker vanishes
+    os._exit(1)
+
+
+class _ChunkedResponse:
+    """Streamed response without Content-Length."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.read = 0
+        self.closed = False
+
+    def iter_content(self, chunk_size):
+        for chunk in self.chunks:
+            self.read += 1
+            yield chunk
+
+    def close(self):
+        self.closed = True
+
+
+def test_worker_past_deadline_is_killed(monkeypatch):
+    monkeypatch.setattr(pdf_utils, '_extract_pdf_to_file', _hang)
+    monkeypatch.setattr(PdfExtractor, 'KILL_GRACE', 0.2)
+    extractor = PdfExtractor(workers=1, max_seconds=0.5)
+    try:
+        stuck = extractor.submit(b'%PDF')
+        queued = extractor.submit(b'%PDF')
+        started = time.monotonic()
+        text, info = extractor.collect('http://x/a.pdf', stuck)
+        assert text is None
+        assert 'killed' in info['error']
+        assert time.monotonic() - started < 5
+        assert extractor.killed == 1
+
+        # The queued document only starts once the slot is free and gets its own deadline
+        monkeypatch.setattr(pdf_utils, '_extract_pdf_to_file', _quick)
+        text, info = extractor.collect('http://x/b.pdf', queued)
+        assert 'killed' in info['error']
+        assert extractor.killed == 2
+
+        _, info = extractor.collect('http://x/c.pdf', extractor.submit(b'%PDF'))
+        assert info['error'] == 'not a pdf'
+    finally:
+        extractor.shutdown()
+
+
+def test_dead_worker_fails_its_document_and_the_pool_recovers(monkeypatch):
+    monkeypatch.setattr(pdf_utils, '_extract_pdf_to_file', _crash)
+    extractor = PdfExtractor(workers=1, max_seconds=60)
+    try:
+        crashing = extractor.submit(b'%PDF')
+        # Forked when it starts, after the patch below: it runs normally
+        queued = extractor.submit(b'%PDF')
+        path, info = extractor.collect('http://x/a.pdf', crashing)
+        assert path is None and info['error'] == 'PDF worker process died'
+
+        monkeypatch.setattr(pdf_utils, '_extract_pdf_to_file', _quick)
+        started = time.monotonic()
+        _, info = extractor.collect('http://x/b.pdf', queued)
+        assert info['error'] in ('not a pdf', 'PDF worker process died')
+        _, info = extractor.collect('http://x/c.pdf', extractor.submit(b'%PDF'))
+        assert info['error'] == 'not a pdf'
+        assert time.monotonic() - started < 10
+    finally:
+        extractor.shutdown()
+
+
+def test_shutdown_kills_running_worker(monkeypatch):
+    monkeypatch.setattr(pdf_utils, '_extract_pdf_to_file', _hang)
+    extractor = PdfExtractor(workers=1, max_seconds=60)
+    future = extractor.submit(b'%PDF')
+    time.sleep(0.3)
+    processes = list(extractor._pool._processes.values())
+    extractor.shutdown()
+    assert 'cancelled' in future.result(timeout=1)['error']
+    for process in processes:
+        process.join(timeout=2)
+        assert not process.is_alive()
+
+
+def test_byte_cap_applies_while_streaming():
+    extractor = PdfExtractor(workers=0, max_bytes=10)
+    response = _ChunkedResponse([b'12345', b'67890', b'x', b'never read'])
+    assert extractor.read_capped(response) is None
+    assert response.closed
+    assert response.read == 3
+
+    assert extractor.read_capped(_ChunkedResponse([b'12345', b'67890'])) == b'1234567890'
@@ -0,0 +1,44 @@
+import pytest
+from bs4 import BeautifulSoup
+
+from utils.text_utils import HAS_LXML, parse_html, extract_content, _extract_content_soup
+
+# Doxygen output is full of comment markers, inside headings and code too
+DOXYGEN_PAGE = b'''<!DOCTYPE html>
+<html><head><title>MyLib: Foo Class Reference</title></head>
+<body>
+<!-- Generated by Doxygen 1.9.1 -->
+<div id="top"><!-- do not remove this div, it is closed by doxygen! -->
+<div id="titlearea">MyLib</div></div>
+<div class="header"><div class="headertitle"><div class="title">Foo<!-- x --> Class Reference</div></div></div>
+<div class="contents">
+<h1>Foo<!-- inline -->Class</h1>
+<p>Before<!-- comment -->after<?php echo 1; ?>end of paragraph.</p>
+<h2 class="groupheader">Member<!-- m --> Functions</h2>
+<div class="fragment"><pre class="fragment">int <!-- c -->value() const; <!-- trailing -->// returns value</pre></div>
+<table class="memberdecls"><tr><td>void<!-- a --> reset()</td></tr></table>
+<!-- start footer part -->
+<script>var x = "<!-- not text -->";</script>
+<nav>Skipped<!-- n -->nav</nav>
+Trailing<!-- t -->text
+</div>
+<hr class="footer"/><address class="footer">Generated by doxygen</address>
+</body></html>
+'''
+
+
+@pytest.mark.skipif(not HAS_LXML, reason="lxml engine not available")
+def test_lxml_engine_matches_soup_extractor_with_comments():
+    new = extract_content(parse_html(DOXYGEN_PAGE))
+    old = _extract_content_soup(BeautifulSoup(DOXYGEN_PAGE, 'html.parser'))
+
+    assert new == old
+    assert 'Before\nafter\nend of paragraph.' in new['text']
+    assert new['headings'][0] == {'level': 'h1', 'text': 'FooClass'}
+    assert new['code_blocks'] == ['intvalue() const;// returns value']
+
+
+@pytest.mark.skipif(not HAS_LXML, reason="lxml engine not available")
+def test_comment_tail_inside_skipped_tags_is_dropped():
+    page = b'<html><body><div class="contents"><p>kept</p><nav>a<!-- x -->b</nav></div></body></html>'
+    assert extract_content(parse_html(page))['text'] == 'kept'
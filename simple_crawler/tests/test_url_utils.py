@@ -0,0 +1,20 @@
+from utils.url_utils import UrlScope, compile_patterns
+
+PREFIX = 'https://docs.example.com/sdk/'
+
+
+def test_regex_alternation_stays_inside_its_pattern():
+    scope = UrlScope(PREFIX, exclude=[r're:_source\.html$|/v1/', '*/old/*'])
+    assert not scope.allows(PREFIX + 'v1/index.html')
+    assert not scope.allows(PREFIX + 'foo_8h_source.html')
+    assert not scope.allows(PREFIX + 'old/index.html')
+    assert scope.allows(PREFIX + 'v2/index.html')
+
+
+def test_include_patterns_mix_glob_and_regex():
+    pattern = compile_patterns(['*/v2/*', r're:class\w+\.html|struct'])
+    assert pattern.match(PREFIX + 'v2/a.html')
+    assert pattern.match(PREFIX + 'classFoo.html')
+    assert pattern.match(PREFIX + 'structBar.html')
+    assert not pattern.match(PREFIX + 'files.html')
+    assert compile_patterns(['', '  ']) is None
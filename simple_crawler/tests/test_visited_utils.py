@@ -0,0 +1,71 @@
+import threading
+
+import pytest
+
+from utils.visited_utils import open_visited
+
+
+@pytest.mark.parametrize('mode', ['exact', 'bloom'])
+def test_concurrent_adds_and_lookups(mode):
+    # Small start so the exact table grows many times while readers probe it
+    visited = open_visited(mode, capacity=1000)
+    per_thread = 20_000
+    errors = []
+    added = [0] * 4
+
+    def writer(n):
+        try:
+            for i in range(per_thread):
+                # A Bloom filter may report a new key as present, never the reverse
+                added[n] += visited.add(f'http://example.com/{n}/{i}')
+                assert f'http://example.com/{n}/{i}' in visited
+        except Exception as e:
+            errors.append(e)
+
+    def reader():
+        try:
+            for i in range(per_thread):
+                f'http://example.com/missing/{i}' in visited
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+    threads += [threading.Thread(target=reader) for _ in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not errors
+    assert len(visited) == sum(added)
+    if mode == 'exact':
+        assert sum(added) == 4 * per_thread
+    assert all(f'http://example.com/{n}/{i}' in visited for n in range(4) for i in range(0, per_thread, 97))
+
+
+@pytest.mark.parametrize('mode', ['exact', 'bloom'])
+def test_save_and_reload(tmp_path, mode):
+    path = str(tmp_path / 'visited.bin')
+    visited = open_visited(mode, path=path)
+    for i in range(5000):
+        visited.add(f'u{i}')
+    visited.save()
+
+    loaded = open_visited(mode, path=path)
+    assert len(loaded) == 5000
+    assert 'u1234' in loaded and not loaded.add('u4999') and loaded.add('new')
+
+
+def test_exact_set_doubles_on_grow_and_stays_compact():
+    visited = open_visited('exact')
+    sizes = []
+    for i in range(200_000):
+        visited.add(f'u{i}')
+        if not sizes or visited.memory_bytes() != sizes[-1][0]:
+            sizes.append((visited.memory_bytes(), len(visited)))
+
+    assert all(b == 2 * a for (a, _), (b, _) in zip(sizes, sizes[1:]))
+    # Right after a grow (load 0.35) and just before the next (load 0.7)
+    for memory, count in sizes[1:]:
+        assert memory / count <= 23
+    assert 11 <= visited.bytes_per_url() <= 23
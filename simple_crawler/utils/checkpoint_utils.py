@@ -0,0 +1,90 @@
+"""Append-only crawl journal for checkpoint and resume."""
+
+import json
+import os
+from pathlib import Path
+
+
+class CrawlJournal:
+    """JSONL journal of crawl progress.
+
+    One record per line:
+      {"type": "meta", ...}                      run parameters
+      {"type": "seed", "url", "links"}           seed page checked in phase 1
+      {"type": "page", "depth", "links", "page"} completed page
+
+    Lines are flushed as they are written and fsync'ed every
+    `sync_every` pages, so a crash loses at most the last few pages.
+    A torn last line is ignored on load and cut off before the
+    resumed run appends, so later records stay readable.
+    """
+
+    def __init__(self, path: Path, sync_every: int = 10):
+        self.path = Path(path)
+        self.sync_every = sync_every
+        self._fh = None
+        self._unsynced = 0
+        self._good_bytes = None  # end of the last complete record, set by load()
+
+    def load(self) -> list[dict]:
+        """Read all complete records from an existing journal."""
+        if not self.path.exists():
+            return []
+
+        records = []
+        good = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                # A line without its newline was cut short too
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    records.append(json.loads(line))
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    # Torn write from a crash; everything after it is unusable
+                    break
+                good += len(line)
+        self._good_bytes = good
+        return records
+
+    def open(self, meta: dict | None = None) -> None:
+        """Open for appending. A `meta` record starts a fresh journal."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if meta is not None:
+            self._fh = open(self.path, 'w', encoding='utf-8')
+            self._write({'type': 'meta', **meta})
+        else:
+            if self._good_bytes is not None and self.path.exists():
+                # Drop what load() could not read, or appended records would
+                # sit behind it where the next load() stops
+                with open(self.path, 'r+b') as f:
+                    f.truncate(self._good_bytes)
+            self._fh = open(self.path, 'a', encoding='utf-8')
+
+    def record_seed(self, url: str, links: list[str]) -> None:
+        self._write({'type': 'seed', 'url': url, 'links': links})
+
+    def record_page(self, page_data: dict, depth: int, links: list[str]) -> None:
+        self._write({'type': 'page', 'depth': depth, 'links': links, 'page': page_data})
+        self._unsynced += 1
+        if self._unsynced >= self.sync_every:
+            self.sync()
+
+    def sync(self) -> None:
+        """Force journal contents to disk."""
+        if self._fh:
+            self._fh.flush()
+            os.fsync(self._fh.fileno())
+            self._unsynced = 0
+
+    def close(self) -> None:
+        if self._fh:
+            self.sync()
+            self._fh.close()
+            self._fh = None
+
+    def _write(self, record: dict) -> None:
+        if not self._fh:
+            return
+        self._fh.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._fh.flush()
@@ -0,0 +1,85 @@
+"""Crawl frontier: deduplicated priority queue with depth tracking."""
+
+import heapq
+import itertools
+import re
+from collections import Counter
+from urllib.parse import urlparse
+
+# Doxygen member-list / index style pages (mostly link tables, little prose)
+MEMBER_LIST_RE = re.compile(
+    r'(-members\.html$|^functions_|^globals_|^namespacemembers|^dir_.*\.html$|_source\.html$)'
+)
+
+
+def url_directory(url: str) -> str:
+    """Return the directory part of a URL path."""
+    path = urlparse(url).path
+    return path.rsplit('/', 1)[0] + '/'
+
+
+def default_score(url: str, depth: int, frontier: 'Frontier') -> float:
+    """Score a URL for crawl order (lower is crawled first).
+
+    Prefers shallow pages, content pages over member-list pages and
+    directories that have not been queued much yet.
+    """
+    score = depth * 10.0
+
+    filename = urlparse(url).path.rsplit('/', 1)[-1]
+    if MEMBER_LIST_RE.search(filename):
+        score += 5.0
+
+    score += min(frontier.dir_counts[url_directory(url)], 10) * 0.3
+    return score
+
+
+class Frontier:
+    """Priority queue of URLs to crawl.
+
+    Each URL is accepted once; URLs deeper than `max_depth` are dropped.
+    `score_func(url, depth, frontier)` decides the order (lower first,
+    ties in insertion order). `seen` is any set-like object with add()
+    and `in` (e.g. a visited_utils set); a plain set by default.
+    """
+
+    def __init__(self, max_depth: int, score_func=None, seen=None):
+        self.max_depth = max_depth
+        self.score_func = score_func or default_score
+        self.dir_counts = Counter()
+        self._heap = []
+        self._seen = seen if seen is not None else set()
+        self._seq = itertools.count()
+
+    def push(self, url: str, depth: int, score: float | None = None) -> bool:
+        """Queue `url` at `depth`. Returns False if dropped or already seen."""
+        if depth > self.max_depth or url in self._seen:
+            return False
+
+        self._seen.add(url)
+        if score is None:
+            score = self.score_func(url, depth, self)
+        self.dir_counts[url_directory(url)] += 1
+        heapq.heappush(self._heap, (score, next(self._seq), url, depth))
+        return True
+
+    def mark_seen(self, url: str) -> None:
+        """Record `url` as already handled so it is never queued."""
+        self._seen.add(url)
+
+    def pop(self) -> tuple[str, int] | None:
+        """Return the best (url, depth), or None when empty."""
+        if not self._heap:
+            return None
+        _, _, url, depth = heapq.heappop(self._heap)
+        return url, depth
+
+    def peek(self, n: int) -> list[str]:
+        """Return the next `n` URLs without removing them."""
+        return [entry[2] for entry in heapq.nsmallest(n, self._heap)]
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._seen
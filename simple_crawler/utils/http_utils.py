@@ -0,0 +1,188 @@
+"""HTTP fetch utilities: per-host rate limiting and pooled transport."""
+
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+# Seconds spent opening connections (DNS + TCP + TLS) by the current thread
+_connect_time = threading.local()
+
+
+def _timed_connect(connect):
+    def wrapper(self):
+        start = time.perf_counter()
+        try:
+            connect(self)
+        finally:
+            _connect_time.seconds = getattr(_connect_time, 'seconds', 0.0) + time.perf_counter() - start
+    return wrapper
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    connect = _timed_connect(HTTPConnection.connect)
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    connect = _timed_connect(HTTPSConnection.connect)
+
+
+# Seconds a request waits for a free connection to its host. The pools
+# block when full, so a leaked connection fails requests instead of
+# hanging the crawl.
+POOL_TIMEOUT = 60.0
+
+
+class _PoolTimeoutMixin:
+    def _get_conn(self, timeout=None):
+        return super()._get_conn(timeout if timeout is not None else POOL_TIMEOUT)
+
+
+class _TimedHTTPConnectionPool(_PoolTimeoutMixin, HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(_PoolTimeoutMixin, HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TokenBucket:
+    """Thread-safe token bucket.
+
+    Tokens refill at `rate` per second up to `capacity`. Each acquire()
+    takes one token, blocking until one is available.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, sleeping if needed. Returns seconds waited."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+
+            # Reserve the token now; a negative balance makes later callers
+            # queue up behind this one instead of all waking at once.
+            self._tokens -= 1.0
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class HostRateLimiter:
+    """Keeps one token bucket per host.
+
+    A rate of 0 or less disables limiting.
+    """
+
+    def __init__(self, rate: float, burst: float = 1.0):
+        self.rate = rate
+        self.burst = burst
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, url: str) -> float:
+        """Wait for the host of `url` to allow another request."""
+        if self.rate <= 0:
+            return 0.0
+
+        host = urlparse(url).netloc
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, self.burst)
+                self._buckets[host] = bucket
+
+        return bucket.acquire()
+
+
+class HttpTransport:
+    """Shared HTTP transport backed by one pooled requests.Session.
+
+    Connections are kept alive and reused per host; at most
+    `max_per_host` sockets are opened to a single host (extra callers
+    wait up to POOL_TIMEOUT seconds for a free one). Every request
+    passes through the optional rate limiter first.
+    """
+
+    def __init__(self, user_agent: str, pool_hosts: int = 10, max_per_host: int = 10,
+                 rate_limiter: HostRateLimiter | None = None):
+        self.rate_limiter = rate_limiter
+        self._adapter = HTTPAdapter(
+            pool_connections=pool_hosts,
+            pool_maxsize=max_per_host,
+            pool_block=True,
+        )
+        # Time new connections so callers can split connect from transfer
+        self._adapter.poolmanager.pool_classes_by_scheme = {
+            'http': _TimedHTTPConnectionPool,
+            'https': _TimedHTTPSConnectionPool,
+        }
+        self.session = requests.Session()
+        self.session.mount('http://', self._adapter)
+        self.session.mount('https://', self._adapter)
+        self.session.headers.update({
+            'User-Agent': user_agent,
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+        })
+
+    def get(self, url: str, timeout: float = 30, stream: bool = False) -> requests.Response:
+        """GET `url` over a pooled connection.
+
+        With stream=True only the headers are read; the caller must
+        consume `.content` or call `.close()` to free the connection.
+        
+        The response carries a `timings` dict (seconds): 'rate_wait'
+        for the rate limiter, 'connect' for opening a new connection
+        (DNS included; absent when one was reused) and 'wait' until the
+        headers arrived.
+        """
+        rate_wait = self.rate_limiter.acquire(url) if self.rate_limiter else 0.0
+        
+        _connect_time.seconds = 0.0
+        start = time.perf_counter()
+        response = self.session.get(url, timeout=timeout, stream=stream)
+        elapsed = time.perf_counter() - start
+        connect = _connect_time.seconds
+        
+        response.timings = {
+            'rate_wait': rate_wait,
+            'wait': max(0.0, elapsed - connect),
+        }
+        if connect:
+            response.timings['connect'] = connect
+        return response
+
+    def stats(self) -> dict:
+        """Return request / new-connection counts across all host pools."""
+        requests_count = 0
+        connections = 0
+        pools = self._adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            requests_count += pool.num_requests
+            connections += pool.num_connections
+        return {
+            'requests': requests_count,
+            'connections': connections,
+            'reused': max(0, requests_count - connections),
+        }
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self.session.close()
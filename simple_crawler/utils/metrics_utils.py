@@ -0,0 +1,151 @@
+"""Per-stage crawl timing: histograms, percentiles and slowest pages."""
+
+import heapq
+import json
+import time
+from array import array
+from contextlib import contextmanager
+from pathlib import Path
+
+# Stages in pipeline order. rate_wait is self-imposed politeness, so the
+# network-vs-CPU share is computed without it.
+STAGES = ('rate_wait', 'connect', 'wait', 'transfer', 'parse', 'links', 'extract', 'pdf', 'output')
+NETWORK_STAGES = ('connect', 'wait', 'transfer')
+
+STAGE_LABELS = {
+    'rate_wait': '속도 제한 대기',
+    'connect': '연결 (DNS 포함)',
+    'wait': '응답 대기',
+    'transfer': '본문 전송',
+    'parse': 'HTML 파싱',
+    'links': '링크 탐색',
+    'extract': '본문 추출',
+    'pdf': 'PDF 변환',
+    'output': '출력 쓰기',
+}
+
+# Histogram bucket upper bounds in milliseconds (last bucket is open)
+BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+
+@contextmanager
+def timed(timings: dict, stage: str):
+    """Add the duration of the with-block to timings[stage]."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - start
+
+
+def _percentile(ordered, pct: float) -> float:
+    k = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[k]
+
+
+class CrawlMetrics:
+    """Collects stage durations (seconds) for every page.
+
+    add_page() is called from the thread that completes pages; it is
+    not locked. Durations are kept in compact float arrays, and only
+    the `top_n` slowest pages keep their per-stage breakdown.
+    """
+
+    def __init__(self, top_n: int = 10):
+        self.top_n = top_n
+        self.pages = 0
+        self._durations = {stage: array('d') for stage in STAGES}
+        self._slowest = []  # min-heap of (total, seq, url, stages)
+
+    def add_page(self, url: str, timings: dict) -> None:
+        self.pages += 1
+        for stage, seconds in timings.items():
+            if stage in self._durations:
+                self._durations[stage].append(seconds)
+
+        total = sum(timings.values())
+        entry = (total, self.pages, url, timings)
+        if len(self._slowest) < self.top_n:
+            heapq.heappush(self._slowest, entry)
+        elif total > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, entry)
+
+    def stage_summary(self, stage: str) -> dict | None:
+        values = self._durations[stage]
+        if not values:
+            return None
+
+        ordered = sorted(values)
+        histogram = [0] * (len(BUCKETS_MS) + 1)
+        for seconds in values:
+            ms = seconds * 1000
+            idx = next((i for i, bound in enumerate(BUCKETS_MS) if ms < bound), len(BUCKETS_MS))
+            histogram[idx] += 1
+
+        return {
+            'count': len(values),
+            'total_sec': round(sum(values), 3),
+            'mean_ms': round(sum(values) / len(values) * 1000, 2),
+            'p50_ms': round(_percentile(ordered, 50) * 1000, 2),
+            'p95_ms': round(_percentile(ordered, 95) * 1000, 2),
+            'max_ms': round(ordered[-1] * 1000, 2),
+            'histogram': histogram,
+        }
+
+    def summary(self) -> dict:
+        stages = {}
+        for stage in STAGES:
+            data = self.stage_summary(stage)
+            if data:
+                stages[stage] = data
+
+        network = sum(stages[s]['total_sec'] for s in NETWORK_STAGES if s in stages)
+        total = sum(data['total_sec'] for stage, data in stages.items() if stage != 'rate_wait')
+
+        return {
+            'pages': self.pages,
+            'histogram_buckets_ms': [f"<{b}" for b in BUCKETS_MS] + [f">={BUCKETS_MS[-1]}"],
+            'network_share': round(network / total, 3) if total else None,
+            'stages': stages,
+            'slowest': [
+                {'url': url, 'total_ms': round(total * 1000, 2),
+                 'stages_ms': {stage: round(sec * 1000, 2) for stage, sec in timings.items()}}
+                for total, _, url, timings in sorted(self._slowest, reverse=True)
+            ],
+        }
+
+    def report_lines(self, summary: dict | None = None) -> list[str]:
+        """Human-readable report for the crawl log."""
+        summary = summary or self.summary()
+        if not summary['stages']:
+            return []
+
+        lines = [f"{'단계':<16}{'횟수':>7}{'합계(s)':>10}{'평균ms':>9}{'p50ms':>9}{'p95ms':>9}{'최대ms':>10}"]
+        for stage, data in summary['stages'].items():
+            lines.append(f"{STAGE_LABELS[stage]:<16}{data['count']:>7}{data['total_sec']:>10.2f}"
+                         f"{data['mean_ms']:>9.1f}{data['p50_ms']:>9.1f}{data['p95_ms']:>9.1f}{data['max_ms']:>10.1f}")
+
+        lines.append("")
+        lines.append("분포 (ms): " + "  ".join(summary['histogram_buckets_ms']))
+        for stage, data in summary['stages'].items():
+            lines.append(f"  {STAGE_LABELS[stage]:<16}" + " ".join(f"{n:>5}" for n in data['histogram']))
+
+        if summary['network_share'] is not None:
+            share = summary['network_share']
+            verdict = "네트워크 병목" if share >= 0.5 else "CPU/디스크 병목"
+            lines.append("")
+            lines.append(f"네트워크 비중: {share * 100:.0f}% → {verdict}")
+
+        if summary['slowest']:
+            lines.append("")
+            lines.append(f"가장 느린 페이지 {len(summary['slowest'])}개:")
+            for idx, page in enumerate(summary['slowest'], 1):
+                top = max(page['stages_ms'], key=page['stages_ms'].get)
+                lines.append(f"  {idx}. {page['total_ms']:.0f}ms ({STAGE_LABELS[top]} {page['stages_ms'][top]:.0f}ms) "
+                             f"{page['url']}")
+        return lines
+
+    def save(self, path: Path, summary: dict | None = None) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(summary or self.summary(), ensure_ascii=False, indent=2), encoding='utf-8')
@@ -0,0 +1,203 @@
+"""Output writers for crawl results (JSONL shards and per-page TXT)."""
+
+import json
+from pathlib import Path
+
+from utils.file_utils import clean_filename
+
+TEXT_CHUNK = 1 << 16  # characters per read when streaming a text file
+_TEXT_SLOT = '\x00text\x00'
+
+
+def iter_text_file(path, chunk_size: int = TEXT_CHUNK):
+    """Yield the contents of a UTF-8 text file in chunks."""
+    with open(path, 'r', encoding='utf-8') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def read_text_prefix(path, limit: int) -> str:
+    """Return at most the first `limit` characters of a UTF-8 text file."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read(limit)
+
+
+def to_jsonl_item(page: dict) -> dict:
+    """Convert a page record to the Scrapy-like JSONL format."""
+    return {
+        'url': page['url'],
+        'title': page.get('title', ''),
+        'text': page.get('text', ''),
+        'headings': page.get('headings', []),
+        'code_blocks': page.get('code_blocks', []),
+        'file_type': page.get('file_type', 'html'),
+        'rendered': False,  # Simple crawler doesn't render
+        'depth': page.get('depth', 0),
+        'out_links': [],  # Simple crawler doesn't track outlinks
+        'images': [],  # Simple crawler doesn't collect images
+        'duplicate_of': page.get('duplicate_of'),
+    }
+
+
+def summarize_page(page: dict) -> dict:
+    """Keep only the small fields of a page record (no body text)."""
+    summary = {key: page[key] for key in ('url', 'status', 'title', 'file_type', 'depth', 'index',
+                                          'simhash', 'duplicate_of')
+               if key in page}
+    if 'error' in page:
+        summary['error'] = page['error']
+    return summary
+
+
+class JsonlShardWriter:
+    """Write JSONL records, rotating to pages_N.jsonl past `limit` chars.
+
+    With append=True the last existing shard is continued instead of
+    overwriting pages.jsonl (used when resuming a crawl).
+    """
+
+    def __init__(self, json_dir: Path, limit: int = 495000, append: bool = False):
+        self.json_dir = Path(json_dir)
+        self.json_dir.mkdir(parents=True, exist_ok=True)
+        self.limit = limit
+        self.files = []
+        self._idx = 1
+        self._char_count = 0
+
+        mode = 'w'
+        if append:
+            while self._get_file_path(self._idx + 1).exists():
+                self.files.append(str(self._get_file_path(self._idx)))
+                self._idx += 1
+            path = self._get_file_path(self._idx)
+            if path.exists():
+                self._char_count = len(path.read_text(encoding='utf-8'))
+                mode = 'a'
+
+        self._open(mode)
+
+    def _get_file_path(self, idx: int) -> Path:
+        if idx == 1:
+            return self.json_dir / "pages.jsonl"
+        else:
+            return self.json_dir / f"pages_{idx}.jsonl"
+
+    def _open(self, mode: str) -> None:
+        path = self._get_file_path(self._idx)
+        self._fh = open(path, mode, encoding='utf-8')
+        self.files.append(str(path))
+
+    def write(self, record: dict, text_file=None) -> None:
+        """Write one record; with `text_file`, its 'text' is streamed from that file."""
+        if text_file is None:
+            item_str = json.dumps(record, ensure_ascii=False) + '\n'
+            self._rotate(len(item_str))
+            self._fh.write(item_str)
+            self._char_count += len(item_str)
+            return
+
+        # Split the record around its text, then copy the escaped text in
+        # chunks: two passes over the file (length, then write) keep
+        # memory bounded however long the text is
+        head, tail = (json.dumps({**record, 'text': _TEXT_SLOT}, ensure_ascii=False) + '\n').split(
+            json.dumps(_TEXT_SLOT)[1:-1], 1)
+        item_len = len(head) + len(tail) + sum(len(json.dumps(chunk, ensure_ascii=False)) - 2
+                                               for chunk in iter_text_file(text_file))
+        self._rotate(item_len)
+        self._fh.write(head)
+        for chunk in iter_text_file(text_file):
+            self._fh.write(json.dumps(chunk, ensure_ascii=False)[1:-1])
+        self._fh.write(tail)
+        self._char_count += item_len
+
+    def _rotate(self, item_len: int) -> None:
+        # Check if we need to switch to a new file
+        if self._char_count + item_len > self.limit and self._char_count > 0:
+            self._fh.close()
+            self._idx += 1
+            self._open('w')
+            self._char_count = 0
+
+    def flush(self) -> None:
+        if self._fh:
+            self._fh.flush()
+
+    def close(self) -> None:
+        if self._fh:
+            self._fh.close()
+            self._fh = None
+
+    def summary(self) -> str:
+        """Describe the written files for the launcher log."""
+        if len(self.files) == 1:
+            return self.files[0]
+        else:
+            return f"{self.json_dir}\\pages*.jsonl ({len(self.files)}개 파일)"
+
+
+class TxtPageWriter:
+    """Write one human-readable TXT file per page."""
+
+    def __init__(self, txt_dir: Path, timestamp: str):
+        self.txt_dir = Path(txt_dir)
+        self.txt_dir.mkdir(parents=True, exist_ok=True)
+        self.timestamp = timestamp
+        self.count = 0
+
+    def write(self, page: dict, idx: int) -> Path:
+        # Clean title for filename
+        title = page.get('title', 'Untitled')
+        clean_title = clean_filename(title)
+
+        # Check if PDF
+        file_type = page.get('file_type', 'html')
+        type_marker = '[PDF]_' if file_type == 'pdf' else ''
+
+        # Create filename
+        filename = f"{idx:03d}_{type_marker}{clean_title}_{self.timestamp}.txt"
+        filepath = self.txt_dir / filename
+
+        # Write file
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write("="*80 + "\n")
+            f.write(f"페이지 {idx}: {title}\n")
+            if file_type == 'pdf':
+                f.write("[PDF 파일에서 변환됨]\n")
+            f.write("="*80 + "\n")
+            f.write(f"URL: {page['url']}\n")
+            f.write(f"크롤링 시간: {self.timestamp}\n")
+            f.write(f"파일 형식: {file_type.upper()}\n")
+            if page.get('duplicate_of'):
+                f.write(f"근접 중복: {page['duplicate_of']}\n")
+            f.write("="*80 + "\n\n")
+
+            if page.get('headings'):
+                f.write("목차:\n" + "-"*80 + "\n")
+                for heading in page['headings']:
+                    indent = "  " * (int(heading['level'][1]) - 1)
+                    f.write(f"{indent}• {heading['text']}\n")
+                f.write("\n")
+
+            if page.get('text_file'):
+                # Long extracted text (PDF) kept on disk, copied in chunks
+                f.write("내용:\n" + "-"*80 + "\n")
+                for chunk in iter_text_file(page['text_file']):
+                    f.write(chunk)
+                f.write("\n\n")
+            elif page.get('text'):
+                f.write("내용:\n" + "-"*80 + "\n")
+                f.write(page['text'] + "\n\n")
+
+            if page.get('code_blocks'):
+                f.write(f"코드 블록 ({len(page['code_blocks'])}개):\n" + "-"*80 + "\n")
+                for code_idx, code in enumerate(page['code_blocks'], 1):
+                    f.write(f"\n[코드 {code_idx}]\n{code}\n")
+
+        self.count += 1
+        return filepath
+
+    def summary(self) -> str:
+        return f"{self.count}개 파일 저장됨"
@@ -1,38 +1,325 @@
 """PDF extraction utilities."""
 
 import io
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
 
 
-def extract_pdf_text(pdf_content: bytes) -> str | None:
+def _load_reader():
+    """Return the PdfReader class from pypdf (or PyPDF2), or None."""
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        try:
+            from PyPDF2 import PdfReader
+        except ImportError:
+            print("⚠️  PDF library not found. Install: pip install pypdf")
+            return None
+    return PdfReader
+
+
+def iter_pdf_pages(pdf_content: bytes, max_pages: int | None = None,
+                   deadline: float | None = None):
+    """Yield formatted page texts one at a time.
+
+    Stops after `max_pages` pages or once time.monotonic() passes
+    `deadline`. Raises on unreadable PDFs.
+    """
+    PdfReader = _load_reader()
+    if PdfReader is None:
+        return
+
+    reader = PdfReader(io.BytesIO(pdf_content))
+    for page_num, page in enumerate(reader.pages, 1):
+        if max_pages and page_num > max_pages:
+            return
+        if deadline and time.monotonic() > deadline:
+            return
+        page_text = page.extract_text()
+        if page_text:
+            yield f"[페이지 {page_num}]\n{page_text}\n"
+
+
+def extract_pdf_text(pdf_content: bytes, max_pages: int | None = None) -> str | None:
     """Extract text from PDF content.
-    
+
     Args:
         pdf_content: Raw PDF file content
-        
+        max_pages: Stop after this many pages (None for all)
+
     Returns:
         Extracted text or None if extraction fails
     """
     try:
-        try:
-            from pypdf import PdfReader
-        except ImportError:
-            try:
-                from PyPDF2 import PdfReader
-            except ImportError:
-                print("⚠️  PDF library not found. Install: pip install pypdf")
-                return None
-        
-        pdf_file = io.BytesIO(pdf_content)
-        reader = PdfReader(pdf_file)
-        
-        text_parts = []
-        for page_num, page in enumerate(reader.pages, 1):
-            page_text = page.extract_text()
-            if page_text:
-                text_parts.append(f"[페이지 {page_num}]\n{page_text}\n")
-        
-        return '\n'.join(text_parts)
-    
+        return '\n'.join(iter_pdf_pages(pdf_content, max_pages))
+
     except Exception as e:
         print(f"❌ PDF 추출 오류: {str(e)}")
         return None
+
+
+def _extract_pdf_to_file(pdf_content: bytes, max_pages: int | None, max_seconds: float | None) -> dict:
+    """Process-pool worker: stream page texts into a temp file.
+
+    Returns a dict with the file path, page count, elapsed seconds and
+    whether a limit cut the document short (or an error message).
+    """
+    start = time.monotonic()
+    deadline = start + max_seconds if max_seconds else None
+    fd, path = tempfile.mkstemp(prefix='pdf_', suffix='.txt')
+    pages = 0
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            for page_text in iter_pdf_pages(pdf_content, max_pages, deadline):
+                if pages:
+                    f.write('\n')
+                f.write(page_text)
+                pages += 1
+            del pdf_content
+    except Exception as e:
+        os.remove(path)
+        return {'error': str(e), 'seconds': time.monotonic() - start}
+
+    elapsed = time.monotonic() - start
+    return {
+        'path': path,
+        'pages': pages,
+        'seconds': elapsed,
+        'truncated': bool((max_pages and pages >= max_pages) or (deadline and time.monotonic() > deadline)),
+    }
+
+
+class PdfExtractor:
+    """Runs PDF text extraction in a process pool.
+
+    Enforces a byte limit while the body is read (read_capped) and page
+    / time limits inside the worker. The worker only checks the time
+    between pages, so a document still running `KILL_GRACE` seconds
+    past max_seconds has its worker process killed; the pool is then
+    recreated and the other running documents start over. A worker
+    that dies on its own (out of memory, crash in the PDF library)
+    fails the documents running in that pool. At most `workers`
+    documents are in the pool at once (the rest wait here), so the
+    deadline starts when a document actually starts.
+
+    Page texts are streamed into a temp file; collect() hands back its
+    path. workers=0 extracts in the calling thread (time checked
+    between pages only). Per-document timings are kept in `timings`.
+    """
+
+    KILL_GRACE = 5.0
+    READ_CHUNK = 64 * 1024
+
+    def __init__(self, workers: int = 2, max_bytes: int | None = None,
+                 max_pages: int | None = None, max_seconds: float | None = None):
+        self.max_bytes = max_bytes
+        self.max_pages = max_pages
+        self.max_seconds = max_seconds
+        self.workers = workers
+        self.timings = []  # (url, seconds, pages, truncated)
+        self.killed = 0    # documents whose worker was killed at the deadline
+        self._pool = ProcessPoolExecutor(max_workers=workers) if workers > 0 else None
+        self._lock = threading.Lock()
+        self._waiting = deque()  # futures not yet in the pool
+        self._content = {}       # future -> PDF bytes, until it finishes
+        self._running = {}       # future -> (start time, watchdog timer)
+
+    def too_large(self, size: int | None) -> bool:
+        return bool(self.max_bytes and size and size > self.max_bytes)
+
+    def read_capped(self, response) -> bytes | None:
+        """Read the body, or return None (and close) once it passes max_bytes.
+
+        Counts while streaming, so chunked responses without a
+        Content-Length are capped too.
+        """
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=self.READ_CHUNK):
+            size += len(chunk)
+            if self.too_large(size):
+                response.close()
+                return None
+            chunks.append(chunk)
+        return b''.join(chunks)
+
+    def submit(self, pdf_content: bytes):
+        """Start extraction; returns a Future resolving to the worker dict."""
+        future = Future()
+        if self._pool is None:
+            future.set_result(_extract_pdf_to_file(pdf_content, self.max_pages, self.max_seconds))
+            return future
+        with self._lock:
+            self._content[future] = pdf_content
+            self._waiting.append(future)
+            failed = self._fill()
+        self._fail(failed, 'PDF worker pool unavailable')
+        return future
+
+    def _fill(self) -> list:
+        """Start waiting documents; returns (future, start) pairs that failed.
+
+        Caller holds the lock and resolves the failures after releasing it.
+        """
+        failed = []
+        while self._pool is not None and self._waiting and len(self._running) < self.workers:
+            future = self._waiting.popleft()
+            try:
+                self._start(future)
+            except BrokenProcessPool:
+                # Broken before any running document reported it
+                failed.extend(self._reset_pool())
+                self._waiting.appendleft(future)
+            except Exception:
+                del self._content[future]
+                failed.append((future, time.monotonic()))
+        return failed
+
+    def _start(self, future) -> None:
+        # Caller holds the lock
+        pool = self._pool
+        inner = pool.submit(_extract_pdf_to_file, self._content[future], self.max_pages, self.max_seconds)
+        timer = None
+        if self.max_seconds:
+            timer = threading.Timer(self.max_seconds + self.KILL_GRACE, self._expire, (future,))
+            timer.daemon = True
+            timer.start()
+        self._running[future] = (time.monotonic(), timer)
+        inner.add_done_callback(lambda done: self._finished(future, pool, done))
+
+    def _stop(self, future) -> float:
+        # Caller holds the lock; returns the start time
+        started, timer = self._running.pop(future)
+        if timer is not None:
+            timer.cancel()
+        return started
+
+    def _reset_pool(self) -> list:
+        """Replace the pool, killing its workers; returns the running (future, start) pairs.
+
+        Caller holds the lock and decides what happens to those documents.
+        """
+        old_pool = self._pool
+        self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        self._kill(old_pool)
+        return [(future, self._stop(future)) for future in list(self._running)]
+
+    @staticmethod
+    def _fail(failed, error: str) -> None:
+        now = time.monotonic()
+        for future, started in failed:
+            if not future.done():
+                future.set_result({'error': error, 'seconds': now - started})
+
+    def _finished(self, future, pool, inner) -> None:
+        try:
+            info = inner.result()
+        except BrokenProcessPool:
+            info = None
+        except Exception as e:
+            info = {'error': str(e) or type(e).__name__, 'seconds': 0.0}
+
+        with self._lock:
+            # A result from a pool that was replaced meanwhile is stale: the
+            # document was restarted, expired or already failed
+            if pool is not self._pool or future not in self._running:
+                return
+            if info is None:
+                # A worker died; which document caused it is unknown, so every
+                # document running in that pool fails rather than retrying it
+                crashed = self._reset_pool()
+                for other, _ in crashed:
+                    del self._content[other]
+            else:
+                crashed = []
+                self._stop(future)
+                del self._content[future]
+
+        # Resolve before refilling, so a failing refill cannot strand the caller
+        if info is None:
+            self._fail(crashed, 'PDF worker process died')
+        else:
+            future.set_result(info)
+        with self._lock:
+            failed = self._fill()
+        self._fail(failed, 'PDF worker pool unavailable')
+
+    def _expire(self, future) -> None:
+        with self._lock:
+            if future not in self._running:
+                return
+            started = self._stop(future)
+            del self._content[future]
+            self.killed += 1
+
+            # Start the documents that shared the killed pool over
+            restart = [other for other, _ in self._reset_pool()]
+            self._waiting.extendleft(reversed(restart))
+        future.set_result({'error': f'PDF extraction exceeded {self.max_seconds}s, worker killed',
+                           'seconds': time.monotonic() - started})
+        with self._lock:
+            failed = self._fill()
+        self._fail(failed, 'PDF worker pool unavailable')
+
+    @staticmethod
+    def _kill(pool) -> None:
+        processes = list((getattr(pool, '_processes', None) or {}).values())
+        for process in processes:
+            if process.is_alive():
+                process.kill()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _wait(self, future) -> dict:
+        """future.result(), in slices: never blocks on a document that is not being worked on."""
+        while True:
+            try:
+                return future.result(timeout=self.KILL_GRACE)
+            except FutureTimeoutError:
+                pass
+            with self._lock:
+                entry = self._running.get(future)
+                known = entry is not None or future in self._waiting
+            if entry is not None and self.max_seconds and \
+                    time.monotonic() - entry[0] > self.max_seconds + 2 * self.KILL_GRACE:
+                self._expire(future)  # the watchdog timer did not fire
+            elif not known:
+                # Neither queued nor running: resolved just now, or lost
+                try:
+                    return future.result(timeout=self.KILL_GRACE)
+                except FutureTimeoutError:
+                    return {'error': 'PDF extraction lost', 'seconds': 0.0}
+
+    def collect(self, url: str, future) -> tuple[str | None, dict]:
+        """Wait for `future` and return (text file path, info).
+
+        The caller owns the file and removes it. Never blocks much past
+        max_seconds + KILL_GRACE once the document has started: a
+        document that overruns is killed and reported as an error.
+        """
+        info = self._wait(future)
+        self.timings.append((url, info.get('seconds', 0.0), info.get('pages', 0), info.get('truncated', False)))
+        return info.get('path'), info
+
+    def shutdown(self) -> None:
+        if self._pool is None:
+            return
+        with self._lock:
+            pending = list(self._running) + list(self._waiting)
+            for _, timer in self._running.values():
+                if timer is not None:
+                    timer.cancel()
+            self._running.clear()
+            self._waiting.clear()
+            self._content.clear()
+            pool, self._pool = self._pool, None
+        # Kill rather than wait, so no stuck worker keeps a CPU busy
+        self._kill(pool)
+        for future in pending:
+            if not future.done():
+                future.set_result({'error': 'PDF extraction cancelled at shutdown', 'seconds': 0.0})
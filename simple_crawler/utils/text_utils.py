@@ -2,6 +2,13 @@
 
 from bs4 import BeautifulSoup
 
+try:
+    import lxml.html
+    from lxml import etree
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
 
 def extract_title(soup: BeautifulSoup) -> str:
     """Extract title from HTML.
@@ -49,3 +56,184 @@ def extract_text(soup: BeautifulSoup) -> str:
         element.decompose()
     
     return soup.get_text(separator='\n', strip=True)
+
+
+# --- Single-pass engine -----------------------------------------------------
+
+# Content area candidates, highest priority first
+MAIN_SELECTORS = ['.contents', '#doc-content', 'main', 'article', '.textblock', 'body']
+
+HEADING_TAGS = {'h1', 'h2', 'h3', 'h4'}
+CODE_TAGS = {'code', 'pre'}
+# Removed from the clean text (their headings/code still count)
+TEXT_SKIP_TAGS = {'script', 'style', 'nav', 'header', 'footer'}
+# Never contribute strings (matches BeautifulSoup.get_text)
+STRING_SKIP_TAGS = {'script', 'style', 'template'}
+
+
+def _selector_xpath(selector: str) -> str:
+    """Translate a simple '.class' / '#id' / 'tag' selector to XPath."""
+    if selector.startswith('.'):
+        return f"(//*[contains(concat(' ', normalize-space(@class), ' '), ' {selector[1:]} ')])[1]"
+    if selector.startswith('#'):
+        return f"(//*[@id='{selector[1:]}'])[1]"
+    return f"(//{selector})[1]"
+
+
+if HAS_LXML:
+    _MAIN_XPATHS = [etree.XPath(_selector_xpath(sel)) for sel in MAIN_SELECTORS]
+    _FIRST_H1 = etree.XPath('(//h1)[1]')
+    _FIRST_TITLE = etree.XPath('(//title)[1]')
+
+
+def parse_html(content: bytes):
+    """Parse HTML with lxml when available, else BeautifulSoup.
+
+    The returned document is only meant for iter_hrefs() and
+    extract_content().
+    """
+    if HAS_LXML:
+        try:
+            try:
+                return lxml.html.document_fromstring(content.decode('utf-8'))
+            except (UnicodeDecodeError, ValueError):
+                # Non-UTF-8 (or XML-declared) page: let libxml2 read the charset
+                return lxml.html.document_fromstring(content)
+        except etree.ParserError:
+            pass
+    return BeautifulSoup(content, 'html.parser')
+
+
+def iter_hrefs(doc):
+    """Yield the href of every <a href> in the document."""
+    if isinstance(doc, BeautifulSoup):
+        for link in doc.find_all('a', href=True):
+            yield link['href']
+        return
+
+    for link in doc.iter('a'):
+        href = link.get('href')
+        if href is not None:
+            yield href
+
+
+def _strip_join(el) -> str:
+    """Concatenate stripped strings under `el` (get_text(strip=True))."""
+    parts = []
+
+    def walk(node):
+        if not isinstance(node.tag, str) or node.tag in STRING_SKIP_TAGS:
+            return
+        if node.text:
+            parts.append(node.text.strip())
+        for child in node:
+            walk(child)
+            if child.tail:
+                parts.append(child.tail.strip())
+
+    walk(el)
+    return ''.join(parts)
+
+
+def extract_content(doc) -> dict:
+    """Extract title, headings, code blocks and clean text.
+
+    On an lxml document the content area is walked once, collecting
+    all four fields together without modifying the tree. A
+    BeautifulSoup document (no lxml) uses the per-field functions above.
+    """
+    if isinstance(doc, BeautifulSoup):
+        return _extract_content_soup(doc)
+
+    main = None
+    for xpath in _MAIN_XPATHS:
+        found = xpath(doc)
+        if found:
+            main = found[0]
+            break
+
+    h1 = _FIRST_H1(doc) or _FIRST_TITLE(doc)
+    title = _strip_join(h1[0]) if h1 else 'Untitled'
+
+    if main is None:
+        return {'title': title, 'headings': [], 'code_blocks': [], 'text': ''}
+
+    headings = []
+    code_blocks = []
+    text_parts = []
+    captures = []      # open heading/code buffers: [parts, kind, slot, tag]
+    skip_text = 0      # depth inside nav/header/footer/script/style
+    skip_strings = 0   # depth inside script/style/template
+
+    def add(s: str) -> None:
+        s = s.strip()
+        if not s:
+            return
+        if not skip_text:
+            text_parts.append(s)
+        for capture in captures:
+            capture[0].append(s)
+
+    for event, el in etree.iterwalk(main, events=('start', 'end', 'comment', 'pi')):
+        if event in ('comment', 'pi'):
+            # No text of their own, but the text after them belongs to the parent
+            if el.tail and not skip_strings:
+                add(el.tail)
+            continue
+
+        tag = el.tag
+
+        if event == 'start':
+            if tag in TEXT_SKIP_TAGS:
+                skip_text += 1
+            if tag in STRING_SKIP_TAGS:
+                skip_strings += 1
+            if tag in HEADING_TAGS:
+                headings.append(None)
+                captures.append([[], 'heading', len(headings) - 1, tag])
+            elif tag in CODE_TAGS:
+                code_blocks.append(None)
+                captures.append([[], 'code', len(code_blocks) - 1, tag])
+            if el.text and not skip_strings:
+                add(el.text)
+            continue
+
+        # end event
+        if tag in HEADING_TAGS or tag in CODE_TAGS:
+            parts, kind, slot, name = captures.pop()
+            if kind == 'heading':
+                headings[slot] = {'level': name, 'text': ''.join(parts)}
+            else:
+                code_blocks[slot] = ''.join(parts)
+        if tag in STRING_SKIP_TAGS:
+            skip_strings -= 1
+        if tag in TEXT_SKIP_TAGS:
+            skip_text -= 1
+        if el is not main and el.tail and not skip_strings:
+            add(el.tail)
+
+    return {
+        'title': title,
+        'headings': headings,
+        'code_blocks': [code for code in code_blocks if len(code) > 10],
+        'text': '\n'.join(text_parts),
+    }
+
+
+def _extract_content_soup(soup: BeautifulSoup) -> dict:
+    """BeautifulSoup fallback for extract_content()."""
+    main = None
+    for selector in MAIN_SELECTORS:
+        main = soup.select_one(selector)
+        if main:
+            break
+
+    if not main:
+        main = soup.find('body')
+
+    return {
+        'title': extract_title(soup),
+        'headings': extract_headings(main) if main else [],
+        'code_blocks': extract_code_blocks(main) if main else [],
+        'text': extract_text(main) if main else ''
+    }
@@ -1,5 +1,7 @@
 """URL normalization and validation utilities."""
 
+import fnmatch
+import re
 from urllib.parse import urljoin, urlparse
 
 
@@ -30,3 +32,85 @@ def extract_base_path(url: str) -> str:
     """Extract base path from URL (excluding filename)."""
     parsed = urlparse(url)
     return '/'.join(parsed.path.split('/')[:-1]) + '/'
+
+
+def compile_patterns(patterns: list[str] | None) -> re.Pattern | None:
+    """Merge glob / regex patterns into one compiled regex.
+    
+    Patterns prefixed with 're:' are regular expressions (searched
+    anywhere in the URL); all others are globs matched against the
+    whole URL, e.g. '*/v1.0/*'.
+    """
+    parts = []
+    for pattern in patterns or []:
+        pattern = pattern.strip()
+        if not pattern:
+            continue
+        if pattern.startswith('re:'):
+            # Own group, so a top-level '|' stays inside this pattern
+            parts.append(f"(?:.*?(?:{pattern[3:]}))")
+        else:
+            parts.append(f"(?:{fnmatch.translate(pattern)})")
+    
+    if not parts:
+        return None
+    return re.compile('|'.join(parts))
+
+
+class UrlScope:
+    """Precompiled crawl scope, built once per crawl.
+    
+    A URL is in scope when it lives under `prefix` (domain + base path),
+    does not have a blocked file extension, matches an include pattern
+    (if any are given) and matches no exclude pattern.
+    """
+    
+    SKIP_SCHEMES = ('#', 'javascript:', 'mailto:')
+    
+    def __init__(self, prefix: str, blocked_extensions=frozenset(),
+                 include: list[str] | None = None, exclude: list[str] | None = None):
+        self.prefix = prefix
+        self.blocked_extensions = frozenset(blocked_extensions)
+        self._include = compile_patterns(include)
+        self._exclude = compile_patterns(exclude)
+    
+    def allows(self, url: str) -> bool:
+        """Check a single absolute URL."""
+        if not url.startswith(self.prefix):
+            return False
+        
+        # Extension of the last path segment (query/fragment removed)
+        path = url.split('#', 1)[0].split('?', 1)[0]
+        filename = path[len(self.prefix):].rsplit('/', 1)[-1]
+        if '.' in filename:
+            ext = '.' + filename.rsplit('.', 1)[-1].lower()
+            if ext in self.blocked_extensions:
+                return False
+        
+        if self._include and not self._include.match(url):
+            return False
+        if self._exclude and self._exclude.match(url):
+            return False
+        return True
+    
+    def filter_links(self, hrefs, base_url: str) -> list[str]:
+        """Resolve a batch of hrefs against `base_url` and keep in-scope ones.
+        
+        The result is de-duplicated and keeps first-seen order.
+        """
+        seen_hrefs = set()
+        seen_urls = set()
+        links = []
+        for href in hrefs:
+            if not href or href.startswith(self.SKIP_SCHEMES) or href in seen_hrefs:
+                continue
+            seen_hrefs.add(href)
+            
+            full_url = urljoin(base_url, href)
+            if full_url in seen_urls:
+                continue
+            seen_urls.add(full_url)
+            
+            if self.allows(full_url):
+                links.append(full_url)
+        return links